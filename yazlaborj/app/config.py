@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     # DATABASE_URL alanını geri ekleyelim, ancak ASCII karakterlerle sınırlayalım
@@ -19,6 +19,129 @@ class Settings(BaseSettings):
     # Uygulama ayarları
     DEBUG: bool = True
     
+    # Veritabanı erişim modu: True ise AsyncEngine/AsyncSession ve async router'lar kullanılır
+    DB_ASYNC: bool = False
+    
+    # Bağlantı havuzu (QueuePool) ayarları
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # saniye
+    DB_POOL_RECYCLE: int = 1800  # saniye, -1 ise kapalı
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_LOG_INTERVAL: int = 60  # havuz durumu log aralığı (saniye), 0 ise kapalı
+    
+    # Başlangıçta bağlantı denemeleri (üstel geri çekilme ile)
+    DB_CONNECT_RETRIES: int = 5
+    DB_CONNECT_BACKOFF: float = 0.5  # ilk bekleme (saniye)
+    DB_CONNECT_BACKOFF_MAX: float = 8.0  # en uzun bekleme (saniye)
+    # Veritabanına ulaşılamazsa sqlite:///./test.db kullan (sadece geliştirme için)
+    DB_SQLITE_FALLBACK: bool = False
+    # Başlangıçta bekleyen migration'ları uygula; kapalıysa sadece uyarı verilir.
+    # Migration'lar worker'lar açılmadan önce `python manage.py migrate` ile uygulanır;
+    # sadece geliştirme ortamında (docker-compose.yml) açılır
+    DB_AUTO_MIGRATE: bool = False
+    
+    # İstek başına SQL sayacı: X-DB-Query-Count / X-DB-Time-Ms başlıkları
+    DB_QUERY_STATS_HEADERS: bool = True
+    # N+1 dedektörü: aynı SQL bir istekte eşikten fazla çalışırsa
+    # "warn" log yazar, "raise" hata fırlatır (testlerde), "off" kapatır
+    N_PLUS_ONE_MODE: str = "warn"
+    N_PLUS_ONE_THRESHOLD: int = 10
+    
+    # Yavaş sorgu logu: eşiği aşan SQL, parametreleri gizlenmiş halde ve
+    # EXPLAIN planıyla dosyaya ve /api/admin/db/slow-queries'e yazılır
+    SLOW_QUERY_MS: int = 500  # milisaniye, 0 ise kapalı
+    SLOW_QUERY_EXPLAIN: bool = True  # tahmini plan (EXPLAIN), sorguyu tekrar çalıştırmaz
+    # PostgreSQL'de en fazla bu aralıkla bir SELECT için EXPLAIN ANALYZE alınır (sorguyu
+    # istek içinde ikinci kez çalıştırır), saniye; 0 ise hiç
+    SLOW_QUERY_ANALYZE_INTERVAL: int = 0
+    SLOW_QUERY_BUFFER: int = 100  # bellekte tutulan son kayıt sayısı
+    SLOW_QUERY_LOG_FILE: str = "logs/slow_queries.log"  # boş ise dosyaya yazılmaz
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS: int = 5
+    
+    # Kimlik doğrulamada kullanıcı önbelleği (id, role, is_active)
+    # Her worker kendi önbelleğini tutar; değişiklikler en geç TTL sonunda görünür
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL: int = 60  # saniye, 0 ise kapalı
+    
+    # Yetkilendirme modu: "db" her istekte kullanıcıyı (önbellek/veritabanı) kontrol eder,
+    # "claims" kısa ömürlü token'daki role/active bilgisine güvenir ve
+    # token_revocations tablosundan beslenen iptal listesine bakar
+    AUTH_MODE: str = "db"
+    CLAIMS_TOKEN_EXPIRE_MINUTES: int = 15
+    REVOCATION_REFRESH_SECONDS: int = 5  # iptal listesinin yenilenme aralığı
+    
+    # bcrypt ayrı süreç havuzunda çalışır; kuyruk doluysa login/register 503 döner.
+    # Kuyruk boyutu sync modda beklemede kalabilecek istek thread'i sayısıdır,
+    # thread havuzunun (40) küçük bir kısmı olmalı ki diğer istekler beklemesin
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 8
+    # bcrypt maliyeti (2^rounds); makineye göre `python manage.py calibrate-bcrypt` ile seçin.
+    # Farklı maliyetle saklanmış hash'ler başarılı girişte yeniden hesaplanır
+    BCRYPT_ROUNDS: int = 12
+    
+    # Giriş denemesi sınırlama (token bucket): IP başına ve kullanıcı adı başına.
+    # Her deneme iki kovadan da bir jeton harcar; boşsa 429 döner
+    LOGIN_RATE_LIMIT: bool = True
+    LOGIN_IP_BUCKET_SIZE: int = 20
+    LOGIN_IP_REFILL_PER_MINUTE: float = 10
+    LOGIN_ID_BUCKET_SIZE: int = 5
+    LOGIN_ID_REFILL_PER_MINUTE: float = 2
+    # "memory": her worker kendi kovalarını tutar, "redis": worker'lar arası ortak (redis paketi gerekir)
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    
+    # Belgelerin saklandığı yer: "local" (UPLOAD_DIR dizini) veya "s3" (S3 uyumlu bucket, boto3 gerekir)
+    # Birden fazla API sunucusu belgeleri ancak "s3" ile paylaşabilir
+    STORAGE_BACKEND: str = "local"
+    UPLOAD_DIR: str = "uploads"
+    S3_BUCKET: str = "documents"
+    S3_PREFIX: str = ""  # anahtarların önüne eklenir (ör. "prod")
+    S3_ENDPOINT_URL: str = ""  # MinIO vb. için, boş ise AWS
+    S3_PUBLIC_ENDPOINT_URL: str = ""  # presigned URL'lerde tarayıcının ulaşacağı adres, boş ise S3_ENDPOINT_URL
+    S3_REGION: str = ""
+    S3_ACCESS_KEY_ID: str = ""  # boş ise boto3'ün varsayılan kimlik zinciri
+    S3_SECRET_ACCESS_KEY: str = ""
+    S3_PART_SIZE_MB: int = 8  # multipart parça boyutu (en az 5)
+    S3_UPLOAD_CONCURRENCY: int = 4  # bir dosya için aynı anda yüklenen parça sayısı
+    S3_UPLOAD_WORKERS: int = 8  # tüm yüklemelerin paylaştığı iş parçacığı sayısı
+    S3_PRESIGN_SECONDS: int = 300  # indirme bağlantılarının geçerlilik süresi
+    
+    # Belge türüne göre yükleme sınırı (MB); aşılırsa yükleme hemen kesilir (413)
+    UPLOAD_LIMIT_MB: Dict[str, int] = {
+        "cv": 10,
+        "diploma": 10,
+        "publications": 100,
+        "citations": 20,
+        "conferences": 50,
+    }
+    
+    # Yetim belge toplayıcı (python manage.py collect-documents)
+    DOCUMENT_GC_GRACE_MINUTES: int = 60  # bu süreden yeni dosyalara dokunulmaz (süren yüklemeler)
+    DOCUMENT_GC_BATCH_SIZE: int = 100  # bir seferde silinen dosya sayısı
+    DOCUMENT_GC_BATCH_PAUSE: float = 1.0  # iki silme grubu arası bekleme (saniye)
+    DOCUMENT_GC_INTERVAL_HOURS: float = 0  # uygulama içinde çalışma aralığı, 0 ise kapalı
+    
+    # Soğuk katman (python manage.py tier-documents): süresi dolmuş ve tüm başvuruları
+    # sonuçlanmış ilanların belgeleri zstd ile sıkıştırılıp buraya taşınır (zstandard paketi gerekir)
+    COLD_UPLOAD_DIR: str = "uploads-cold"  # STORAGE_BACKEND=local için
+    S3_COLD_BUCKET: str = ""  # boş ise S3_BUCKET
+    S3_COLD_PREFIX: str = "cold"
+    S3_COLD_STORAGE_CLASS: str = ""  # ör. "STANDARD_IA", boş ise bucket varsayılanı
+    DOCUMENT_TIERING_ZSTD_LEVEL: int = 9
+    DOCUMENT_TIERING_BATCH_SIZE: int = 50  # bir seferde taşınan belge sayısı
+    DOCUMENT_TIERING_BATCH_PAUSE: float = 1.0  # iki grup arası bekleme (saniye)
+    DOCUMENT_TIERING_INTERVAL_HOURS: float = 0  # uygulama içinde çalışma aralığı, 0 ise kapalı
+    
+    # PDF'lerden metin çıkarma: yükleme kaydedildikten sonra süreç havuzunda çalışır (pypdf paketi gerekir)
+    DOCUMENT_TEXT_EXTRACTION: bool = True
+    DOCUMENT_TEXT_KINDS: List[str] = ["cv", "publications", "citations", "conferences"]
+    DOCUMENT_TEXT_WORKERS: int = 1
+    DOCUMENT_TEXT_QUEUE_SIZE: int = 32  # bekleyen belge sınırı; aşanlar `manage.py extract-documents` ile işlenir
+    DOCUMENT_TEXT_MAX_CHARS: int = 500000  # belge başına saklanan metin (PostgreSQL tsvector sınırı 1 MB)
+    
     class Config:
         env_file = ".env"
 
@@ -1,33 +1,122 @@
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+import logging
 import os
+import time
 
 from app.config import settings
+from app.models.base import Base
+from app.utils.db_instrumentation import instrument_engine
+from app.utils.db_pool import pool_options
+
+logger = logging.getLogger(__name__)
 
 # Veritabanı bağlantı URL'sini oluştur
 # Eğer DATABASE_URL çevre değişkeni varsa onu kullan, yoksa ayarlardan al
 DATABASE_URL = os.getenv("DATABASE_URL", f"postgresql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}")
+SQLITE_FALLBACK_URL = "sqlite:///./test.db"
+
+# Motorlar import sırasında değil, init_db() ile (uygulama lifespan'inde) oluşturulur
+engine = None
+async_engine = None
+# Advisory kilitler için havuzsuz motor (sadece PostgreSQL), bkz. create_lock_engine
+lock_engine = None
+
+# Session fabrikaları, init_db() motoru oluşturunca bağlanır
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+# expire_on_commit=False: commit sonrası nesne alanları tekrar lazy-load edilmez
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+# Async sürücü eşlemeleri (senkron sürücü -> async sürücü)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_url(url):
+    """Senkron bağlantı URL'sini async sürücü kullanan URL'ye çevir"""
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+def create_db_engine(url):
+    """Havuz ayarlarıyla senkron motor oluştur"""
+    connect_args = {"check_same_thread": False} if make_url(url).drivername == "sqlite" else {}
+    return create_engine(url, connect_args=connect_args, **pool_options())
+
+def create_lock_engine(url):
+    """Advisory kilitler (app/utils/advisory_locks.py) için motor; PostgreSQL dışında None.
+    
+    Her kilit kendi bağlantısını açıp kapatır: bağlantılarını tutan istekler
+    ana havuzu doldurduğunda kilit almak için o havuzu beklemek kilitlenmeye yol açar
+    """
+    if make_url(url).get_backend_name() != "postgresql":
+        return None
+    return create_engine(url, poolclass=NullPool)
+
+def connect_with_retry(url):
+    """Bağlantıyı sınırlı sayıda, artan bekleme süreleriyle dene"""
+    delay = settings.DB_CONNECT_BACKOFF
+    for attempt in range(1, settings.DB_CONNECT_RETRIES + 1):
+        candidate = create_db_engine(url)
+        try:
+            with candidate.connect():
+                pass
+            return candidate
+        except OperationalError as e:
+            candidate.dispose()
+            logger.warning(f"Veritabanı bağlantı hatası (deneme {attempt}/{settings.DB_CONNECT_RETRIES}): {e}")
+            if attempt == settings.DB_CONNECT_RETRIES:
+                raise
+            time.sleep(delay)
+            delay = min(delay * 2, settings.DB_CONNECT_BACKOFF_MAX)
 
-# Bağlantı hatası durumunda SQLite'a geri dön
-try:
-    # PostgreSQL bağlantısını dene
-    engine = create_engine(DATABASE_URL)
-    # Test bağlantısı yap
-    with engine.connect() as conn:
-        pass
-    print(f"PostgreSQL veritabanına başarıyla bağlandı: {settings.DB_NAME}")
-except Exception as e:
-    print(f"PostgreSQL bağlantı hatası: {e}")
-    print("SQLite veritabanı kullanılıyor...")
-    # SQLite kullan (bellek içi)
-    engine = create_engine("sqlite:///./test.db", connect_args={"check_same_thread": False})
-
-# SessionLocal sınıfını oluştur
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Base sınıfını oluştur
-Base = declarative_base()
+def init_db():
+    """Motorları oluştur ve session fabrikalarına bağla (idempotent)"""
+    global engine, async_engine, lock_engine
+    if engine is not None:
+        return engine
+
+    try:
+        engine = connect_with_retry(DATABASE_URL)
+        logger.info(f"Veritabanına başarıyla bağlandı: {engine.url.render_as_string(hide_password=True)}")
+    except OperationalError:
+        # SQLite'a geri dönüş sadece açıkça istenirse yapılır
+        if not settings.DB_SQLITE_FALLBACK:
+            raise
+        logger.warning("DB_SQLITE_FALLBACK açık, SQLite veritabanı kullanılıyor...")
+        engine = create_db_engine(SQLITE_FALLBACK_URL)
+    instrument_engine(engine)
+    SessionLocal.configure(bind=engine)
+    lock_engine = create_lock_engine(engine.url)
+
+    # Async mod sadece DB_ASYNC açıksa kurulur; asyncpg/aiosqlite ancak o zaman gerekir
+    if settings.DB_ASYNC:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        # Senkron motorun seçtiği veritabanını (PostgreSQL veya SQLite) kullan
+        async_engine = create_async_engine(get_async_url(engine.url), **pool_options(is_async=True))
+        instrument_engine(async_engine.sync_engine)
+        AsyncSessionLocal.configure(bind=async_engine)
+
+    return engine
+
+async def dispose_db():
+    """Kapanışta havuzlardaki tüm bağlantıları kapat"""
+    global engine, async_engine, lock_engine
+    if async_engine is not None:
+        await async_engine.dispose()
+        async_engine = None
+    if engine is not None:
+        engine.dispose()
+        engine = None
+    if lock_engine is not None:
+        lock_engine.dispose()
+        lock_engine = None
 
 # DB oturumu almak için dependency
 def get_db():
@@ -36,3 +125,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Async DB oturumu almak için dependency
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1 @@
+# Versioned schema migrations, applied with `python manage.py migrate`
@@ -0,0 +1,86 @@
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+
+logger = logging.getLogger(__name__)
+
+
+class Operations:
+    """DDL helpers handed to upgrade()/downgrade() of each migration.
+
+    Every statement runs on an AUTOCOMMIT connection so that PostgreSQL can
+    build indexes CONCURRENTLY (not allowed inside a transaction block).
+    Operations are idempotent, which makes a failed migration safe to re-run.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    @property
+    def dialect(self) -> str:
+        return self.connection.dialect.name
+
+    @property
+    def is_postgresql(self) -> bool:
+        return self.dialect == "postgresql"
+
+    def execute(self, sql: str, **params):
+        logger.info(f"SQL: {sql}")
+        return self.connection.execute(text(sql), params)
+
+    def has_table(self, table_name: str) -> bool:
+        return inspect(self.connection).has_table(table_name)
+
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        columns = inspect(self.connection).get_columns(table_name)
+        return any(column["name"] == column_name for column in columns)
+
+    def create_table(self, table):
+        table.create(self.connection, checkfirst=True)
+
+    def drop_table(self, table_name: str):
+        self.execute(f"DROP TABLE IF EXISTS {table_name}")
+
+    def add_column(self, table_name: str, column):
+        if self.has_column(table_name, column.name):
+            return
+        ddl = CreateColumn(column).compile(dialect=self.connection.dialect)
+        self.execute(f"ALTER TABLE {table_name} ADD COLUMN {ddl}")
+
+    def drop_column(self, table_name: str, column_name: str):
+        if not self.has_column(table_name, column_name):
+            return
+        self.execute(f"ALTER TABLE {table_name} DROP COLUMN {column_name}")
+
+    def create_index(self, name: str, table_name: str, columns, unique: bool = False, where: str = None,
+                     using: str = None):
+        """CREATE INDEX CONCURRENTLY on PostgreSQL, plain CREATE INDEX elsewhere"""
+        unique_sql = "UNIQUE " if unique else ""
+        column_sql = ", ".join(columns)
+        if self.is_postgresql:
+            # A failed concurrent build leaves an INVALID index behind that
+            # IF NOT EXISTS would silently keep, so drop it first
+            self._drop_invalid_index(name)
+            using_sql = f" USING {using}" if using else ""
+            sql = f"CREATE {unique_sql}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table_name}{using_sql} ({column_sql})"
+        else:
+            sql = f"CREATE {unique_sql}INDEX IF NOT EXISTS {name} ON {table_name} ({column_sql})"
+        if where:
+            sql += f" WHERE {where}"
+        self.execute(sql)
+
+    def drop_index(self, name: str):
+        if self.is_postgresql:
+            self.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        else:
+            self.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def _drop_invalid_index(self, name: str):
+        invalid = self.connection.execute(text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ), {"name": name}).first()
+        if invalid:
+            logger.warning(f"Dropping invalid index {name} left by an interrupted build")
+            self.drop_index(name)
@@ -0,0 +1,122 @@
+import importlib
+import logging
+import pkgutil
+from contextlib import contextmanager
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select, text
+
+from app.migrations import versions
+from app.migrations.operations import Operations
+
+logger = logging.getLogger(__name__)
+
+# Ledger of applied migrations; kept out of the models' metadata on purpose
+ledger_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    ledger_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+# pg_advisory_lock key so that only one process migrates at a time
+ADVISORY_LOCK_KEY = 74021
+
+
+class Migration:
+    def __init__(self, version: int, name: str, module):
+        self.version = version
+        self.name = name
+        self.module = module
+
+    @property
+    def description(self) -> str:
+        return getattr(self.module, "description", self.name)
+
+    def __repr__(self):
+        return f"<Migration {self.version:04d} {self.name}>"
+
+
+def discover_migrations():
+    """Load app/migrations/versions/NNNN_name.py modules ordered by version"""
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        prefix, _, name = module_info.name.partition("_")
+        if not prefix.isdigit():
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(Migration(int(prefix), name, module))
+    migrations.sort(key=lambda migration: migration.version)
+    return migrations
+
+
+class MigrationRunner:
+    def __init__(self, engine):
+        self.engine = engine
+        self.migrations = discover_migrations()
+
+    @contextmanager
+    def connect(self):
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            yield connection
+
+    @contextmanager
+    def lock(self, connection):
+        if connection.dialect.name != "postgresql":
+            yield
+            return
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+
+    def applied_versions(self, connection=None) -> set:
+        if connection is None:
+            with self.connect() as connection:
+                return self.applied_versions(connection)
+        ledger_metadata.create_all(connection)
+        return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+    def pending(self):
+        applied = self.applied_versions()
+        return [migration for migration in self.migrations if migration.version not in applied]
+
+    def upgrade(self, target: int = None):
+        """Apply pending migrations up to and including target (default: latest)"""
+        applied_now = []
+        with self.connect() as connection, self.lock(connection):
+            applied = self.applied_versions(connection)
+            for migration in self.migrations:
+                if migration.version in applied:
+                    continue
+                if target is not None and migration.version > target:
+                    break
+                logger.info(f"Applying migration {migration.version:04d} {migration.name}")
+                migration.module.upgrade(Operations(connection))
+                connection.execute(schema_migrations.insert().values(
+                    version=migration.version, name=migration.name
+                ))
+                applied_now.append(migration)
+        return applied_now
+
+    def downgrade(self, target: int):
+        """Revert applied migrations newer than target (target=0 reverts everything)"""
+        reverted = []
+        with self.connect() as connection, self.lock(connection):
+            applied = self.applied_versions(connection)
+            for migration in reversed(self.migrations):
+                if migration.version <= target or migration.version not in applied:
+                    continue
+                logger.info(f"Reverting migration {migration.version:04d} {migration.name}")
+                migration.module.downgrade(Operations(connection))
+                connection.execute(schema_migrations.delete().where(
+                    schema_migrations.c.version == migration.version
+                ))
+                reverted.append(migration)
+        return reverted
+
+    def status(self):
+        applied = self.applied_versions()
+        return [(migration, migration.version in applied) for migration in self.migrations]
@@ -0,0 +1,14 @@
+from app.models.base import Base
+from app import models  # registers every model on Base.metadata
+
+description = "Create missing model tables"
+
+# Tables are created from the current models with checkfirst, so databases
+# that were bootstrapped by the old create_all call at startup are adopted
+# as-is. Later migrations are idempotent and skip what this step created.
+
+def upgrade(op):
+    Base.metadata.create_all(op.connection)
+
+def downgrade(op):
+    Base.metadata.drop_all(op.connection)
@@ -0,0 +1,36 @@
+description = "Composite/unique indexes for duplicate checks, jury work lists and listing status"
+
+# Unique indexes cannot be built while duplicates exist; those rows have to
+# be resolved by hand because picking a winner is a business decision.
+DUPLICATE_CHECKS = {
+    "applications": ("candidate_id", "listing_id"),
+    "evaluations": ("application_id", "jury_member_id"),
+}
+
+def check_duplicates(op):
+    for table_name, columns in DUPLICATE_CHECKS.items():
+        column_sql = ", ".join(columns)
+        duplicates = op.execute(
+            f"SELECT {column_sql}, COUNT(*) FROM {table_name} "
+            f"GROUP BY {column_sql} HAVING COUNT(*) > 1 LIMIT 10"
+        ).all()
+        if duplicates:
+            raise RuntimeError(
+                f"{table_name} has duplicate ({column_sql}) rows, e.g. {duplicates}; "
+                "remove them before applying this migration"
+            )
+
+def upgrade(op):
+    check_duplicates(op)
+    op.create_index("uq_applications_candidate_listing", "applications", ["candidate_id", "listing_id"], unique=True)
+    op.create_index("ix_applications_listing_id", "applications", ["listing_id"])
+    op.create_index("uq_evaluations_application_jury", "evaluations", ["application_id", "jury_member_id"], unique=True)
+    op.create_index("ix_evaluations_jury_completed", "evaluations", ["jury_member_id", "is_completed"])
+    op.create_index("ix_listings_status", "listings", ["status"])
+
+def downgrade(op):
+    op.drop_index("ix_listings_status")
+    op.drop_index("ix_evaluations_jury_completed")
+    op.drop_index("uq_evaluations_application_jury")
+    op.drop_index("ix_applications_listing_id")
+    op.drop_index("uq_applications_candidate_listing")
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer
+
+description = "Denormalized listings.applications_count"
+
+def upgrade(op):
+    op.add_column("listings", Column("applications_count", Integer, nullable=False, server_default="0"))
+    op.execute(
+        "UPDATE listings SET applications_count = "
+        "(SELECT COUNT(*) FROM applications WHERE applications.listing_id = listings.id)"
+    )
+
+def downgrade(op):
+    op.drop_column("listings", "applications_count")
@@ -0,0 +1,17 @@
+description = "(timestamp, id) indexes backing keyset pagination of the list endpoints"
+
+INDEXES = [
+    ("ix_listings_created_at_id", "listings", ["created_at", "id"]),
+    ("ix_applications_apply_date_id", "applications", ["apply_date", "id"]),
+    ("ix_evaluations_assigned_date_id", "evaluations", ["assigned_date", "id"]),
+    ("ix_users_created_at_id", "users", ["created_at", "id"]),
+    ("ix_users_role_created_at_id", "users", ["role", "created_at", "id"]),
+]
+
+def upgrade(op):
+    for name, table_name, columns in INDEXES:
+        op.create_index(name, table_name, columns)
+
+def downgrade(op):
+    for name, _, _ in reversed(INDEXES):
+        op.drop_index(name)
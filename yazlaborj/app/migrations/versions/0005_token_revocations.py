@@ -0,0 +1,9 @@
+from app.models.token_revocation import TokenRevocation
+
+description = "token_revocations table for AUTH_MODE=claims"
+
+def upgrade(op):
+    op.create_table(TokenRevocation.__table__)
+
+def downgrade(op):
+    op.drop_table("token_revocations")
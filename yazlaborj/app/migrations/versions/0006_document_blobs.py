@@ -0,0 +1,9 @@
+from app.models.document_blob import DocumentBlob
+
+description = "document_blobs table of the content-addressed upload store"
+
+def upgrade(op):
+    op.create_table(DocumentBlob.__table__)
+
+def downgrade(op):
+    op.drop_table("document_blobs")
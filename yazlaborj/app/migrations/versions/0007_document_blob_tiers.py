@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, Column, Enum
+
+from app.models.document_blob import StorageTier
+
+description = "Storage tier of document_blobs (hot / zstd-compressed cold)"
+
+def upgrade(op):
+    op.add_column(
+        "document_blobs",
+        Column("tier", Enum(StorageTier, native_enum=False, length=8), nullable=False,
+               server_default=StorageTier.HOT.name),
+    )
+    op.add_column("document_blobs", Column("compressed_size", BigInteger, nullable=True))
+
+def downgrade(op):
+    op.drop_column("document_blobs", "compressed_size")
+    op.drop_column("document_blobs", "tier")
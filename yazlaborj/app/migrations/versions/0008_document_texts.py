@@ -0,0 +1,9 @@
+from app.models.document_text import DocumentText
+
+description = "document_texts table of text extracted from uploaded PDFs, with a full-text index"
+
+def upgrade(op):
+    op.create_table(DocumentText.__table__)
+
+def downgrade(op):
+    op.drop_table("document_texts")
@@ -0,0 +1 @@
+# Migration modules are named NNNN_description.py and define upgrade(op) / downgrade(op)
@@ -7,5 +7,8 @@ try:
     from app.models.evaluation import Evaluation, EvaluationResult
     from app.models.criteria import Criteria
     from app.models.jury_assignment import JuryAssignment
+    from app.models.token_revocation import TokenRevocation
+    from app.models.document_blob import DocumentBlob, StorageTier
+    from app.models.document_text import DocumentText
 except ImportError as e:
     print(f"Model import hatası: {e}")
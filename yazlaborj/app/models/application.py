@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, func, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, func, Text, Index, event, update, inspect, case
+from sqlalchemy.orm import column_property, relationship
+from collections import Counter
 import enum
 
 from app.models.base import Base
+from app.models.document_blob import DocumentBlob
+from app.models.listing import Listing
 
 class ApplicationStatus(str, enum.Enum):
     PENDING = "pending"
@@ -20,12 +23,13 @@ class Application(Base):
     apply_date = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    # Document paths
-    cv_path = Column(String, nullable=True)
-    diploma_path = Column(String, nullable=True)
-    publications_path = Column(String, nullable=True)
-    citations_path = Column(String, nullable=True)
-    conferences_path = Column(String, nullable=True)
+    # Document paths; active_history loads the old value of an expired row
+    # on assignment, so the blob reference events see what was replaced
+    cv_path = column_property(Column(String, nullable=True), active_history=True)
+    diploma_path = column_property(Column(String, nullable=True), active_history=True)
+    publications_path = column_property(Column(String, nullable=True), active_history=True)
+    citations_path = column_property(Column(String, nullable=True), active_history=True)
+    conferences_path = column_property(Column(String, nullable=True), active_history=True)
     
     # Relationships
     candidate = relationship("User", back_populates="applications")
@@ -34,3 +38,64 @@ class Application(Base):
     
     # Notes from manager
     manager_notes = Column(Text, nullable=True)
+    
+    __table_args__ = (
+        # One application per candidate and listing; also serves the candidate's own list
+        Index("uq_applications_candidate_listing", "candidate_id", "listing_id", unique=True),
+        Index("ix_applications_listing_id", "listing_id"),
+        # Keyset pagination order
+        Index("ix_applications_apply_date_id", "apply_date", "id"),
+    )
+
+def _bump_applications_count(connection, listing_id, delta):
+    # Runs on the flushing connection, so the counter commits or rolls back
+    # together with the application row itself
+    connection.execute(
+        update(Listing.__table__)
+        .where(Listing.__table__.c.id == listing_id)
+        .values(applications_count=Listing.__table__.c.applications_count + delta)
+    )
+
+@event.listens_for(Application, "after_insert")
+def _application_inserted(mapper, connection, target):
+    _bump_applications_count(connection, target.listing_id, 1)
+
+@event.listens_for(Application, "after_delete")
+def _application_deleted(mapper, connection, target):
+    _bump_applications_count(connection, target.listing_id, -1)
+
+# Columns that may point at a shared DocumentBlob
+DOCUMENT_PATH_COLUMNS = ("cv_path", "diploma_path", "publications_path", "citations_path", "conferences_path")
+
+def _bump_blob_refs(connection, deltas):
+    # One UPDATE for every document of the row: {path: delta}. Paths of files
+    # stored before the blob store match no row and are skipped
+    deltas = {path: delta for path, delta in deltas.items() if path and delta}
+    if not deltas:
+        return
+    blobs = DocumentBlob.__table__
+    connection.execute(
+        update(blobs)
+        .where(blobs.c.path.in_(list(deltas)))
+        .values(ref_count=blobs.c.ref_count + case(deltas, value=blobs.c.path), updated_at=func.now())
+    )
+
+@event.listens_for(Application, "after_insert")
+def _application_documents_inserted(mapper, connection, target):
+    _bump_blob_refs(connection, Counter(getattr(target, column) for column in DOCUMENT_PATH_COLUMNS))
+
+@event.listens_for(Application, "after_update")
+def _application_documents_updated(mapper, connection, target):
+    state = inspect(target)
+    deltas = Counter()
+    for column in DOCUMENT_PATH_COLUMNS:
+        history = state.attrs[column].history
+        deltas.subtract(history.deleted)
+        deltas.update(history.added)
+    _bump_blob_refs(connection, deltas)
+
+@event.listens_for(Application, "after_delete")
+def _application_documents_deleted(mapper, connection, target):
+    deltas = Counter()
+    deltas.subtract(getattr(target, column) for column in DOCUMENT_PATH_COLUMNS)
+    _bump_blob_refs(connection, deltas)
@@ -0,0 +1,31 @@
+import enum
+
+from sqlalchemy import Column, Enum, Integer, BigInteger, String, DateTime, func
+
+from app.models.base import Base
+
+class StorageTier(str, enum.Enum):
+    HOT = "hot"
+    # zstd-compressed in the cold storage (documents of closed listings)
+    COLD = "cold"
+
+class DocumentBlob(Base):
+    __tablename__ = "document_blobs"
+    
+    # Content-addressed file under uploads/blobs/, shared by every application
+    # column (cv_path, diploma_path, ...) that points at the same path
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String, nullable=False, unique=True)
+    size = Column(BigInteger, nullable=False)
+    content_type = Column(String, nullable=True)
+    # Maintained by the Application mapper events; 0 means the file can be collected
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Set by the tiering job; an upload of the same content moves it back to HOT
+    tier = Column(
+        Enum(StorageTier, native_enum=False, length=8),
+        nullable=False, default=StorageTier.HOT, server_default=StorageTier.HOT.name,
+    )
+    # Size of the compressed copy while the blob is COLD
+    compressed_size = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
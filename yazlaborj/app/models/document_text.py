@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, func, literal_column
+# Registers the typed to_tsvector()/ts_headline() constructs used below
+from sqlalchemy.dialects import postgresql  # noqa: F401
+
+from app.models.base import Base
+
+# Text search configuration of the full-text index: no stemming, since the
+# documents mix Turkish and English
+SEARCH_CONFIG = "simple"
+
+def search_config():
+    # A literal, not a bind parameter: the query has to repeat the indexed expression
+    return literal_column(f"'{SEARCH_CONFIG}'")
+
+def search_vector(column):
+    return func.to_tsvector(search_config(), column)
+
+class DocumentText(Base):
+    __tablename__ = "document_texts"
+    
+    # Text extracted from one document of an application (cv, publications, ...)
+    application_id = Column(Integer, ForeignKey("applications.id", ondelete="CASCADE"), primary_key=True)
+    kind = Column(String(16), primary_key=True)
+    # Blob the text was extracted from; a re-upload of the same content is not extracted again
+    sha256 = Column(String(64), nullable=False, index=True)
+    page_count = Column(Integer, nullable=True)
+    text = Column(Text, nullable=False, default="", server_default="")
+    # Why nothing could be extracted (not a PDF, encrypted, ...)
+    error = Column(String, nullable=True)
+    extracted_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Full-text search (PostgreSQL only)
+        Index("ix_document_texts_search", search_vector(text), postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, func, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, func, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -24,3 +24,12 @@ class Evaluation(Base):
     # Relationships
     application = relationship("Application", back_populates="evaluations")
     jury_member = relationship("User", back_populates="evaluations")
+    
+    __table_args__ = (
+        # One evaluation per application and jury member
+        Index("uq_evaluations_application_jury", "application_id", "jury_member_id", unique=True),
+        # Jury work list: own evaluations filtered by completion
+        Index("ix_evaluations_jury_completed", "jury_member_id", "is_completed"),
+        # Keyset pagination order
+        Index("ix_evaluations_assigned_date_id", "assigned_date", "id"),
+    )
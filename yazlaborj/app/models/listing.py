@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, func, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, func, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -27,9 +27,17 @@ class Listing(Base):
     status = Column(Enum(ListingStatus), default=ListingStatus.ACTIVE)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Maintained by the Application insert/delete hooks in app.models.application
+    applications_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     applications = relationship("Application", back_populates="listing")
     
     # Admin who created the listing
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    
+    __table_args__ = (
+        Index("ix_listings_status", "status"),
+        # Keyset pagination order
+        Index("ix_listings_created_at_id", "created_at", "id"),
+    )
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, DateTime, event, delete, insert, inspect
+from sqlalchemy.orm import object_session
+
+from app.models.base import Base
+from app.models.user import User
+
+class TokenRevocation(Base):
+    __tablename__ = "token_revocations"
+    
+    # One row per user: access tokens issued to the user before revoked_at are
+    # rejected in AUTH_MODE=claims. No foreign key, deleted users stay revoked.
+    user_id = Column(Integer, primary_key=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=False)
+
+# Changes that make the claims of already issued tokens wrong
+REVOKING_FIELDS = ("role", "is_active", "password")
+
+def revoke_user_tokens(connection, user_id: int) -> datetime:
+    revoked_at = datetime.now(timezone.utc)
+    table = TokenRevocation.__table__
+    connection.execute(delete(table).where(table.c.user_id == user_id))
+    connection.execute(insert(table).values(user_id=user_id, revoked_at=revoked_at))
+    return revoked_at
+
+def _revoke_on_flush(connection, target):
+    revoked_at = revoke_user_tokens(connection, target.id)
+    # Picked up by the after_commit hook in app.utils.revocation so this
+    # worker doesn't wait for the next refresh
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("revoked_users", {})[target.id] = revoked_at
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in REVOKING_FIELDS):
+        _revoke_on_flush(connection, target)
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    _revoke_on_flush(connection, target)
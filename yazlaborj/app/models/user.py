@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Enum, DateTime, func
+from sqlalchemy import Column, Integer, String, Boolean, Enum, DateTime, func, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -31,3 +31,9 @@ class User(Base):
     phone = Column(String, nullable=True)
     address = Column(String, nullable=True)
     birth_date = Column(String, nullable=True)
+    
+    __table_args__ = (
+        # Keyset pagination order, overall and per role (jury member list)
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_role_created_at_id", "role", "created_at", "id"),
+    )
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from app import database
+from app.schemas.user import CurrentUser
+from app.utils.auth import get_admin_user
+from app.utils.db_instrumentation import slow_queries
+from app.utils.db_pool import pool_status
+from app.utils.passwords import password_hasher
+
+router = APIRouter()
+
+def get_pool_metrics():
+    metrics = {"sync": pool_status(database.engine.pool)}
+    if database.async_engine is not None:
+        metrics["async"] = pool_status(database.async_engine.sync_engine.pool)
+    return metrics
+
+@router.get("/db/pool")
+def get_db_pool(current_user: CurrentUser = Depends(get_admin_user)):
+    return get_pool_metrics()
+
+@router.get("/db/slow-queries")
+def get_slow_queries(limit: Optional[int] = None, current_user: CurrentUser = Depends(get_admin_user)):
+    return slow_queries.recent(limit)
+
+@router.delete("/db/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries(current_user: CurrentUser = Depends(get_admin_user)):
+    slow_queries.clear()
+    return None
+
+@router.get("/auth/hash-pool")
+def get_hash_pool(current_user: CurrentUser = Depends(get_admin_user)):
+    return password_hasher.status()
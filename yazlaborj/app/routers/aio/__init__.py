@@ -0,0 +1 @@
+# Async variants of the routers, mounted instead of app.routers when DB_ASYNC=True
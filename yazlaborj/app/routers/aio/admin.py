@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from app.routers.admin import get_pool_metrics
+from app.schemas.user import CurrentUser
+from app.utils.auth import get_admin_user_async
+from app.utils.db_instrumentation import slow_queries
+from app.utils.passwords import password_hasher
+
+router = APIRouter()
+
+@router.get("/db/pool")
+async def get_db_pool(current_user: CurrentUser = Depends(get_admin_user_async)):
+    return get_pool_metrics()
+
+@router.get("/db/slow-queries")
+async def get_slow_queries(limit: Optional[int] = None, current_user: CurrentUser = Depends(get_admin_user_async)):
+    return slow_queries.recent(limit)
+
+@router.delete("/db/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(current_user: CurrentUser = Depends(get_admin_user_async)):
+    slow_queries.clear()
+    return None
+
+@router.get("/auth/hash-pool")
+async def get_hash_pool(current_user: CurrentUser = Depends(get_admin_user_async)):
+    return password_hasher.status()
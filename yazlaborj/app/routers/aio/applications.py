@@ -0,0 +1,283 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime, timezone
+
+from app.database import get_async_db
+from app.services.document_text import text_extractor
+from app.models.application import Application, ApplicationStatus
+from app.models.listing import Listing
+from app.models.user import User, UserRole
+from app.schemas.application import (
+    ApplicationCreate, ApplicationResponse, ApplicationUpdate,
+    ApplicationDetailResponse, ApplicationDocumentUpdate, DocumentSearchResult
+)
+from app.schemas.user import CurrentUser
+from app.utils.auth import get_current_active_user_async, get_admin_or_manager_user_async
+from app.routers.applications import (
+    document_query, check_document_access, bundle_query, check_application_access, document_search_query,
+    document_search_result, DOCUMENT_RESPONSES, BUNDLE_RESPONSES
+)
+from app.utils.db_errors import is_unique_violation
+from app.utils.document_bundle import bundle_response
+from app.utils.file_download import document_response
+from app.utils.file_upload import receive_documents, insert_blobs_statement, DOCUMENTS_OPENAPI
+from app.utils.pagination import paginate, next_page
+
+router = APIRouter()
+
+@router.post("/", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
+async def create_application(
+    application: ApplicationCreate,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Check if listing exists
+    listing = await db.scalar(select(Listing).where(Listing.id == application.listing_id))
+    if not listing:
+        raise HTTPException(status_code=404, detail="Listing not found")
+
+    # Check if listing is active
+    if listing.status != "active":
+        raise HTTPException(status_code=400, detail="Listing is not active")
+
+    # Check if deadline has passed
+    # Use timezone-aware datetime for comparison
+    now_utc = datetime.now(timezone.utc)
+    if listing.deadline < now_utc:
+        raise HTTPException(status_code=400, detail="Application deadline has passed")
+
+    # Create new application; uq_applications_candidate_listing rejects a second
+    # application of the same candidate to the same listing
+    db_application = Application(
+        candidate_id=current_user.id,
+        listing_id=application.listing_id
+    )
+    db.add(db_application)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if is_unique_violation(e, "uq_applications_candidate_listing", "applications.candidate_id"):
+            raise HTTPException(status_code=400, detail="You have already applied to this listing")
+        raise
+    await db.refresh(db_application)
+
+    return db_application
+
+@router.get("/", response_model=List[ApplicationDetailResponse])
+async def get_applications(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    status: ApplicationStatus = None,
+    cursor: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    query = select(
+        Application,
+        Listing.position.label("listing_position"),
+        Listing.department.label("listing_department"),
+        Listing.faculty.label("listing_faculty"),
+        User.name.label("candidate_name")
+    ).join(
+        Listing, Application.listing_id == Listing.id
+    ).join(
+        User, Application.candidate_id == User.id
+    )
+
+    # Filter by status if provided
+    if status:
+        query = query.where(Application.status == status)
+
+    # Filter based on user role
+    if current_user.role == UserRole.CANDIDATE:
+        # Candidates can only see their own applications
+        query = query.where(Application.candidate_id == current_user.id)
+
+    # Get applications
+    query = paginate(query, Application.apply_date, Application.id, skip, limit, cursor)
+    results = next_page((await db.execute(query)).all(), limit, lambda result: (result[0].apply_date, result[0].id), response)
+
+    # Convert to response model
+    applications = []
+    for result in results:
+        app_dict = result[0].__dict__
+        app_dict["listing_position"] = result.listing_position
+        app_dict["listing_department"] = result.listing_department
+        app_dict["listing_faculty"] = result.listing_faculty
+        app_dict["candidate_name"] = result.candidate_name
+        applications.append(app_dict)
+
+    return applications
+
+@router.get("/search", response_model=List[DocumentSearchResult])
+async def search_application_documents(
+    q: str,
+    kind: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    query = document_search_query(db.get_bind().dialect.name, q, kind, current_user)
+    return [document_search_result(row) for row in (await db.execute(query.offset(skip).limit(limit))).all()]
+
+@router.get("/{application_id}", response_model=ApplicationDetailResponse)
+async def get_application(
+    application_id: int,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Query application with join
+    result = (await db.execute(select(
+        Application,
+        Listing.position.label("listing_position"),
+        Listing.department.label("listing_department"),
+        Listing.faculty.label("listing_faculty"),
+        User.name.label("candidate_name")
+    ).join(
+        Listing, Application.listing_id == Listing.id
+    ).join(
+        User, Application.candidate_id == User.id
+    ).where(
+        Application.id == application_id
+    ))).first()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Application not found")
+
+    # Check if user has permission to view this application
+    application = result[0]
+    if current_user.role == UserRole.CANDIDATE and application.candidate_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this application")
+
+    # Convert to response model
+    app_dict = application.__dict__
+    app_dict["listing_position"] = result.listing_position
+    app_dict["listing_department"] = result.listing_department
+    app_dict["listing_faculty"] = result.listing_faculty
+    app_dict["candidate_name"] = result.candidate_name
+
+    return app_dict
+
+@router.put("/{application_id}", response_model=ApplicationResponse)
+async def update_application(
+    application_id: int,
+    application_update: ApplicationUpdate,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    application = await db.scalar(select(Application).where(Application.id == application_id))
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+
+    # Check permissions
+    if current_user.role == UserRole.CANDIDATE:
+        # Candidates can only update their own applications
+        if application.candidate_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to update this application")
+
+        # Candidates cannot update status
+        if application_update.status:
+            raise HTTPException(status_code=403, detail="Not authorized to update application status")
+
+    # Update application fields
+    for key, value in application_update.dict(exclude_unset=True).items():
+        setattr(application, key, value)
+
+    await db.commit()
+    await db.refresh(application)
+
+    return application
+
+@router.post("/{application_id}/documents", response_model=ApplicationResponse, openapi_extra=DOCUMENTS_OPENAPI)
+async def upload_application_documents(
+    application_id: int,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    application = await db.scalar(select(Application).where(Application.id == application_id))
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+
+    # Check if user has permission to update this application
+    if current_user.role == UserRole.CANDIDATE and application.candidate_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to update this application")
+    # Release the connection while the (possibly long) body is received
+    await db.close()
+
+    # Save uploaded files, streamed to disk as the body arrives
+    documents = await receive_documents(request)
+    # Loaded again: the session was closed while the body was received
+    application = await db.get(Application, application_id)
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+    if documents:
+        await db.execute(insert_blobs_statement(db.get_bind().dialect.name, documents))
+    for directory, part in documents.items():
+        setattr(application, f"{directory}_path", part.relative_path)
+
+    await db.commit()
+    await db.refresh(application)
+    # Text extraction starts only once the upload is committed and doesn't delay the response
+    text_extractor.schedule(application_id, documents)
+
+    return application
+
+@router.get("/{application_id}/documents/{kind}", response_class=Response, responses=DOCUMENT_RESPONSES)
+async def download_application_document(
+    application_id: int,
+    kind: str,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    document = check_document_access(
+        (await db.execute(document_query(application_id, kind, current_user))).first(), current_user
+    )
+    # Release the connection before the (possibly long) file transfer
+    await db.close()
+
+    return await run_in_threadpool(
+        document_response, request, document.path, f"{kind}-{application_id}", document.content_type, document.sha256,
+        document.tier, document.size
+    )
+
+@router.get("/{application_id}/bundle", response_class=StreamingResponse, responses=BUNDLE_RESPONSES)
+async def download_application_bundle(
+    application_id: int,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    row = check_application_access(
+        (await db.execute(bundle_query(current_user).where(Application.id == application_id))).first(), current_user
+    )
+    # Release the connection before the archive is streamed
+    await db.close()
+
+    return bundle_response([row], f"application-{application_id}.zip")
+
+@router.put("/{application_id}/status", response_model=ApplicationResponse)
+async def update_application_status(
+    application_id: int,
+    status: ApplicationStatus,
+    current_user: CurrentUser = Depends(get_admin_or_manager_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    application = await db.scalar(select(Application).where(Application.id == application_id))
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+
+    # Update status
+    application.status = status
+    await db.commit()
+    await db.refresh(application)
+
+    return application
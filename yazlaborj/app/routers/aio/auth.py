@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models.user import User
+from app.schemas.user import UserCreate, UserResponse, Token, UserLogin
+from app.utils.auth import create_user_token, rehash_statement
+from app.routers.auth import insert_user_statement, raise_registration_conflict
+from app.utils.passwords import password_hasher
+from app.utils.rate_limit import login_throttle
+
+router = APIRouter()
+
+@router.post("/register", response_model=UserResponse)
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    # Create new user
+    hashed_password = await password_hasher.hash_async(user.password)
+    try:
+        db_user = await db.scalar(insert_user_statement(user, hashed_password))
+    except IntegrityError as e:
+        await db.rollback()
+        raise_registration_conflict(e)
+
+    # expire_on_commit=False keeps the returned row loaded
+    await db.commit()
+    return db_user
+
+@router.post("/login", response_model=Token)
+async def login(request: Request, user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    await login_throttle.check_async(request, user_credentials.tc_kimlik)
+
+    # Find user by TC Kimlik
+    user = await db.scalar(select(User).where(User.tc_kimlik == user_credentials.tc_kimlik))
+
+    # Verify password; unknown users get a fake verify that takes as long
+    if user:
+        valid, new_hash = await password_hasher.verify_and_update_async(user_credentials.password, user.password)
+    else:
+        valid, new_hash = await password_hasher.fake_verify_async()
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Keep the stored hash at the configured BCRYPT_ROUNDS
+    if new_hash:
+        await db.execute(rehash_statement(user, new_hash))
+        await db.commit()
+
+    # Create access token
+    access_token = create_user_token(user)
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": user
+    }
+
+@router.post("/token", response_model=Token)
+async def login_for_access_token(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    await login_throttle.check_async(request, form_data.username)
+
+    # Find user by TC Kimlik or email
+    user = await db.scalar(select(User).where(
+        (User.tc_kimlik == form_data.username) | (User.email == form_data.username)
+    ))
+
+    if user:
+        valid, new_hash = await password_hasher.verify_and_update_async(form_data.password, user.password)
+    else:
+        valid, new_hash = await password_hasher.fake_verify_async()
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Keep the stored hash at the configured BCRYPT_ROUNDS
+    if new_hash:
+        await db.execute(rehash_statement(user, new_hash))
+        await db.commit()
+
+    # Create access token
+    access_token = create_user_token(user)
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": user
+    }
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.database import get_async_db
+from app.models.criteria import Criteria
+from app.models.listing import PositionType
+from app.schemas.criteria import CriteriaCreate, CriteriaResponse, CriteriaUpdate
+from app.schemas.user import CurrentUser
+from app.utils.auth import get_current_active_user_async, get_manager_user_async
+
+router = APIRouter()
+
+@router.post("/", response_model=CriteriaResponse, status_code=status.HTTP_201_CREATED)
+async def create_criteria(
+    criteria: CriteriaCreate,
+    current_user: CurrentUser = Depends(get_manager_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Create new criteria
+    db_criteria = Criteria(**criteria.dict())
+    db.add(db_criteria)
+    await db.commit()
+    await db.refresh(db_criteria)
+
+    return db_criteria
+
+@router.get("/", response_model=List[CriteriaResponse])
+async def get_criteria(
+    position_type: PositionType = None,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    query = select(Criteria)
+
+    # Filter by position type if provided
+    if position_type:
+        query = query.where(Criteria.position_type == position_type)
+
+    criteria = (await db.scalars(query)).all()
+    return criteria
+
+@router.get("/{criteria_id}", response_model=CriteriaResponse)
+async def get_criterion(
+    criteria_id: int,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    criterion = await db.scalar(select(Criteria).where(Criteria.id == criteria_id))
+    if not criterion:
+        raise HTTPException(status_code=404, detail="Criterion not found")
+
+    return criterion
+
+@router.put("/{criteria_id}", response_model=CriteriaResponse)
+async def update_criterion(
+    criteria_id: int,
+    criteria_update: CriteriaUpdate,
+    current_user: CurrentUser = Depends(get_manager_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    criterion = await db.scalar(select(Criteria).where(Criteria.id == criteria_id))
+    if not criterion:
+        raise HTTPException(status_code=404, detail="Criterion not found")
+
+    # Update criterion fields
+    for key, value in criteria_update.dict(exclude_unset=True).items():
+        setattr(criterion, key, value)
+
+    await db.commit()
+    await db.refresh(criterion)
+
+    return criterion
+
+@router.delete("/{criteria_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_criterion(
+    criteria_id: int,
+    current_user: CurrentUser = Depends(get_manager_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    criterion = await db.scalar(select(Criteria).where(Criteria.id == criteria_id))
+    if not criterion:
+        raise HTTPException(status_code=404, detail="Criterion not found")
+
+    await db.delete(criterion)
+    await db.commit()
+    return None
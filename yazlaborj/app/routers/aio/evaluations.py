@@ -0,0 +1,193 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from typing import List, Optional
+import logging
+from datetime import datetime, timedelta
+
+from app.database import get_async_db
+from app.models.evaluation import Evaluation, EvaluationResult
+from app.models.application import Application
+from app.models.listing import Listing
+from app.models.user import User, UserRole
+from app.schemas.evaluation import (
+    EvaluationCreate, EvaluationResponse, EvaluationUpdate,
+    EvaluationDetailResponse
+)
+from app.schemas.user import CurrentUser
+from app.utils.auth import get_current_active_user_async, get_manager_user_async, get_jury_user_async
+from app.utils.db_errors import is_unique_violation
+from app.utils.pagination import paginate, next_page
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# users is joined twice: once for the jury member, once for the candidate
+JuryMember = aliased(User, name="jury_member")
+Candidate = aliased(User, name="candidate")
+
+def select_evaluation_details():
+    """Evaluation plus every EvaluationDetailResponse field in one round trip"""
+    return select(
+        Evaluation,
+        JuryMember.name.label("jury_name"),
+        Candidate.name.label("candidate_name"),
+        Listing.position,
+        Listing.department
+    ).join(
+        JuryMember, Evaluation.jury_member_id == JuryMember.id
+    ).join(
+        Application, Evaluation.application_id == Application.id
+    ).join(
+        Listing, Application.listing_id == Listing.id
+    ).outerjoin(
+        Candidate, Application.candidate_id == Candidate.id
+    )
+
+def to_detail_dict(result):
+    eval_dict = result[0].__dict__
+    eval_dict["jury_name"] = result.jury_name
+    eval_dict["candidate_name"] = result.candidate_name or "Unknown"
+    eval_dict["position"] = result.position
+    eval_dict["department"] = result.department
+    return eval_dict
+
+@router.post("/", response_model=EvaluationResponse, status_code=status.HTTP_201_CREATED)
+async def create_evaluation(
+    evaluation: EvaluationCreate,
+    current_user: CurrentUser = Depends(get_manager_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        # Check if application exists
+        application = await db.scalar(select(Application).where(Application.id == evaluation.application_id))
+        if not application:
+            raise HTTPException(status_code=404, detail="Application not found")
+
+        # Check if jury member exists
+        jury_member = await db.scalar(select(User).where(
+            User.id == evaluation.jury_member_id,
+            User.role == UserRole.JURY
+        ))
+        if not jury_member:
+            raise HTTPException(status_code=404, detail="Jury member not found")
+
+        # Create new evaluation; uq_evaluations_application_jury rejects duplicates
+        db_evaluation = Evaluation(**evaluation.dict())
+        db.add(db_evaluation)
+        await db.commit()
+        await db.refresh(db_evaluation)
+
+        return db_evaluation
+    except Exception as e:
+        await db.rollback()
+        if isinstance(e, IntegrityError) and is_unique_violation(e, "uq_evaluations_application_jury", "evaluations.application_id"):
+            raise HTTPException(status_code=400, detail="Evaluation already exists")
+        if isinstance(e, HTTPException):
+            raise e
+        logger.exception(f"Error in create_evaluation: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@router.get("/", response_model=List[EvaluationDetailResponse])
+async def get_evaluations(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    is_completed: bool = None,
+    cursor: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        # Base query with joins
+        query = select_evaluation_details()
+
+        # Filter by completion status if provided
+        if is_completed is not None:
+            query = query.where(Evaluation.is_completed == is_completed)
+
+        # Filter based on user role
+        if current_user.role == UserRole.JURY:
+            # Jury members can only see their own evaluations
+            query = query.where(Evaluation.jury_member_id == current_user.id)
+
+        # Get evaluations
+        query = paginate(query, Evaluation.assigned_date, Evaluation.id, skip, limit, cursor)
+        results = next_page((await db.execute(query)).all(), limit, lambda result: (result[0].assigned_date, result[0].id), response)
+
+        # Convert to response model
+        return [to_detail_dict(result) for result in results]
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
+        logger.exception(f"Error in get_evaluations: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@router.get("/{evaluation_id}", response_model=EvaluationDetailResponse)
+async def get_evaluation(
+    evaluation_id: int,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Query evaluation with joins
+    result = (await db.execute(select_evaluation_details().where(
+        Evaluation.id == evaluation_id
+    ))).first()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+
+    # Check if user has permission to view this evaluation
+    evaluation = result[0]
+    if current_user.role == UserRole.JURY and evaluation.jury_member_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this evaluation")
+
+    # Convert to response model
+    return to_detail_dict(result)
+
+@router.put("/{evaluation_id}", response_model=EvaluationResponse)
+async def update_evaluation(
+    evaluation_id: int,
+    evaluation_update: EvaluationUpdate,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    evaluation = await db.scalar(select(Evaluation).where(Evaluation.id == evaluation_id))
+    if not evaluation:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+
+    # Check permissions
+    if current_user.role == UserRole.JURY:
+        # Jury members can only update their own evaluations
+        if evaluation.jury_member_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to update this evaluation")
+
+    # If marking as completed, set completed date
+    if evaluation_update.is_completed and evaluation_update.is_completed != evaluation.is_completed:
+        evaluation.completed_date = datetime.now()
+
+    # Update evaluation fields
+    for key, value in evaluation_update.dict(exclude_unset=True).items():
+        setattr(evaluation, key, value)
+
+    await db.commit()
+    await db.refresh(evaluation)
+
+    return evaluation
+
+@router.delete("/{evaluation_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_evaluation(
+    evaluation_id: int,
+    current_user: CurrentUser = Depends(get_manager_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    evaluation = await db.scalar(select(Evaluation).where(Evaluation.id == evaluation_id))
+    if not evaluation:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+
+    await db.delete(evaluation)
+    await db.commit()
+    return None
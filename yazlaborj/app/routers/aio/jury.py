@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import logging
+
+from app.database import get_async_db
+from app.models.user import User, UserRole
+from app.models.jury_assignment import JuryAssignment
+from app.schemas.jury import JuryMemberResponse, JuryAssignmentCreate, JuryAssignmentResponse
+from app.schemas.user import CurrentUser
+from app.utils.auth import get_current_active_user_async, get_manager_user_async
+from app.utils.pagination import paginate, next_page
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/members", response_model=List[JuryMemberResponse])
+async def get_jury_members(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_manager_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        # Get all users with JURY role
+        query = paginate(select(User).where(
+            User.role == UserRole.JURY
+        ), User.created_at, User.id, skip, limit, cursor)
+        jury_members = next_page((await db.scalars(query)).all(), limit, lambda user: (user.created_at, user.id), response)
+
+        return jury_members
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
+        logger.exception(f"Error in get_jury_members: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@router.post("/assignments", response_model=JuryAssignmentResponse, status_code=status.HTTP_201_CREATED)
+async def create_jury_assignment(
+    assignment: JuryAssignmentCreate,
+    current_user: CurrentUser = Depends(get_manager_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Check if jury member exists
+    jury_member = await db.scalar(select(User).where(
+        User.id == assignment.jury_member_id,
+        User.role == UserRole.JURY
+    ))
+
+    if not jury_member:
+        raise HTTPException(status_code=404, detail="Jury member not found")
+
+    # Create new assignment
+    db_assignment = JuryAssignment(
+        jury_member_id=assignment.jury_member_id,
+        department=assignment.department,
+        assigned_by=current_user.id
+    )
+
+    db.add(db_assignment)
+    await db.commit()
+    await db.refresh(db_assignment)
+
+    return db_assignment
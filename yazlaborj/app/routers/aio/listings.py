@@ -0,0 +1,125 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+
+from app.database import get_async_db
+from app.models.application import Application
+from app.models.listing import Listing, ListingStatus
+from app.models.user import UserRole
+from app.routers.applications import bundle_query, BUNDLE_RESPONSES
+from app.schemas.listing import ListingCreate, ListingResponse, ListingUpdate
+from app.schemas.user import CurrentUser
+from app.utils.auth import get_current_active_user_async, get_admin_user_async
+from app.utils.document_bundle import bundle_response
+from app.utils.pagination import paginate, next_page
+
+router = APIRouter()
+
+@router.post("/", response_model=ListingResponse, status_code=status.HTTP_201_CREATED)
+async def create_listing(
+    listing: ListingCreate,
+    current_user: CurrentUser = Depends(get_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Create new listing
+    db_listing = Listing(
+        **listing.dict(),
+        created_by=current_user.id
+    )
+    db.add(db_listing)
+    await db.commit()
+    await db.refresh(db_listing)
+
+    return db_listing
+
+@router.get("/", response_model=List[ListingResponse])
+async def get_listings(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    status: ListingStatus = None,
+    cursor: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    query = select(Listing)
+
+    # Filter by status if provided
+    if status:
+        query = query.where(Listing.status == status)
+
+    # Get listings (applications_count is a column, no per-listing COUNT needed)
+    query = paginate(query, Listing.created_at, Listing.id, skip, limit, cursor)
+    listings = next_page((await db.scalars(query)).all(), limit, lambda listing: (listing.created_at, listing.id), response)
+
+    return listings
+
+@router.get("/{listing_id}", response_model=ListingResponse)
+async def get_listing(
+    listing_id: int,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    listing = await db.scalar(select(Listing).where(Listing.id == listing_id))
+    if not listing:
+        raise HTTPException(status_code=404, detail="Listing not found")
+
+    return listing
+
+@router.put("/{listing_id}", response_model=ListingResponse)
+async def update_listing(
+    listing_id: int,
+    listing_update: ListingUpdate,
+    current_user: CurrentUser = Depends(get_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    listing = await db.scalar(select(Listing).where(Listing.id == listing_id))
+    if not listing:
+        raise HTTPException(status_code=404, detail="Listing not found")
+
+    # Update listing fields
+    for key, value in listing_update.dict(exclude_unset=True).items():
+        setattr(listing, key, value)
+
+    await db.commit()
+    await db.refresh(listing)
+
+    return listing
+
+@router.delete("/{listing_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_listing(
+    listing_id: int,
+    current_user: CurrentUser = Depends(get_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    listing = await db.scalar(select(Listing).where(Listing.id == listing_id))
+    if not listing:
+        raise HTTPException(status_code=404, detail="Listing not found")
+
+    await db.delete(listing)
+    await db.commit()
+    return None
+
+@router.get("/{listing_id}/bundle", response_class=StreamingResponse, responses=BUNDLE_RESPONSES)
+async def download_listing_bundle(
+    listing_id: int,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user.role == UserRole.CANDIDATE:
+        raise HTTPException(status_code=403, detail="Not authorized to download this listing")
+    if not await db.scalar(select(Listing.id).where(Listing.id == listing_id)):
+        raise HTTPException(status_code=404, detail="Listing not found")
+
+    query = bundle_query(current_user).where(Application.listing_id == listing_id)
+    # Juries only get the applications they evaluate
+    if current_user.role == UserRole.JURY:
+        query = query.where(query.selected_columns.assigned)
+    rows = (await db.execute(query)).all()
+    # Release the connection before the archive is streamed
+    await db.close()
+
+    return bundle_response(rows, f"listing-{listing_id}.zip")
@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.database import get_async_db
+from app.models.user import User, UserRole
+from app.schemas.user import UserResponse, UserUpdate, CurrentUser
+from app.utils.auth import get_current_active_user_async, get_admin_user_async, load_user_async
+from app.utils.user_cache import user_cache
+from app.utils.pagination import paginate, next_page
+
+router = APIRouter()
+
+@router.get("/me", response_model=UserResponse)
+async def get_current_user_info(
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await load_user_async(db, current_user)
+
+@router.put("/me", response_model=UserResponse)
+async def update_current_user(
+    user_update: UserUpdate,
+    current_user: CurrentUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    user = await load_user_async(db, current_user)
+
+    # Update user fields
+    for key, value in user_update.dict(exclude_unset=True).items():
+        setattr(user, key, value)
+
+    await db.commit()
+    user_cache.invalidate(user.id)
+    await db.refresh(user)
+    return user
+
+@router.get("/", response_model=List[UserResponse])
+async def get_users(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    role: UserRole = None,
+    cursor: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    query = select(User)
+    if role:
+        query = query.where(User.role == role)
+
+    query = paginate(query, User.created_at, User.id, skip, limit, cursor)
+    users = next_page((await db.scalars(query)).all(), limit, lambda user: (user.created_at, user.id), response)
+    return users
+
+@router.get("/{user_id}", response_model=UserResponse)
+async def get_user(
+    user_id: int,
+    current_user: CurrentUser = Depends(get_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    user = await db.scalar(select(User).where(User.id == user_id))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+@router.put("/{user_id}", response_model=UserResponse)
+async def update_user(
+    user_id: int,
+    user_update: UserUpdate,
+    current_user: CurrentUser = Depends(get_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    user = await db.scalar(select(User).where(User.id == user_id))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Update user fields
+    for key, value in user_update.dict(exclude_unset=True).items():
+        setattr(user, key, value)
+
+    await db.commit()
+    user_cache.invalidate(user.id)
+    await db.refresh(user)
+    return user
+
+@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_user(
+    user_id: int,
+    current_user: CurrentUser = Depends(get_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    user = await db.scalar(select(User).where(User.id == user_id))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    await db.delete(user)
+    await db.commit()
+    user_cache.invalidate(user_id)
+    return None
@@ -1,25 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, exists, func, null
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
 from typing import List, Optional
 from datetime import datetime, timezone
+import re
 
 from app.database import get_db
+from app.services.document_text import text_extractor
 from app.models.application import Application, ApplicationStatus
+from app.models.document_blob import DocumentBlob
+from app.models.document_text import DocumentText, search_config, search_vector
+from app.models.evaluation import Evaluation
 from app.models.listing import Listing
 from app.models.user import User, UserRole
 from app.schemas.application import (
     ApplicationCreate, ApplicationResponse, ApplicationUpdate, 
-    ApplicationDetailResponse, ApplicationDocumentUpdate
+    ApplicationDetailResponse, ApplicationDocumentUpdate, DocumentSearchResult
 )
+from app.schemas.user import CurrentUser
 from app.utils.auth import get_current_active_user, get_admin_or_manager_user
-from app.utils.file_upload import save_upload_file
+from app.utils.db_errors import is_unique_violation
+from app.utils.document_bundle import bundle_response
+from app.utils.file_download import document_response
+from app.utils.file_upload import receive_documents, insert_blobs_statement, DOCUMENTS_OPENAPI, DOCUMENT_CATEGORIES
+from app.utils.pagination import paginate, next_page
 
 router = APIRouter()
 
 @router.post("/", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
 def create_application(
     application: ApplicationCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     # Check if listing exists
@@ -37,32 +51,32 @@ def create_application(
     if listing.deadline < now_utc:
         raise HTTPException(status_code=400, detail="Application deadline has passed")
     
-    # Check if user already applied to this listing
-    existing_application = db.query(Application).filter(
-        Application.candidate_id == current_user.id,
-        Application.listing_id == application.listing_id
-    ).first()
-    
-    if existing_application:
-        raise HTTPException(status_code=400, detail="You have already applied to this listing")
-    
-    # Create new application
+    # Create new application; uq_applications_candidate_listing rejects a second
+    # application of the same candidate to the same listing
     db_application = Application(
         candidate_id=current_user.id,
         listing_id=application.listing_id
     )
     db.add(db_application)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if is_unique_violation(e, "uq_applications_candidate_listing", "applications.candidate_id"):
+            raise HTTPException(status_code=400, detail="You have already applied to this listing")
+        raise
     db.refresh(db_application)
     
     return db_application
 
 @router.get("/", response_model=List[ApplicationDetailResponse])
 def get_applications(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: ApplicationStatus = None,
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     query = db.query(
@@ -87,7 +101,8 @@ def get_applications(
         query = query.filter(Application.candidate_id == current_user.id)
     
     # Get applications
-    results = query.offset(skip).limit(limit).all()
+    query = paginate(query, Application.apply_date, Application.id, skip, limit, cursor)
+    results = next_page(query.all(), limit, lambda result: (result[0].apply_date, result[0].id), response)
     
     # Convert to response model
     applications = []
@@ -101,10 +116,95 @@ def get_applications(
     
     return applications
 
+# Marks ts_headline puts around matched words; control characters, removed
+# from the text first, so split_headline can tell them apart from content
+HIGHLIGHT_START, HIGHLIGHT_STOP = "\x02", "\x03"
+# Headline options: up to two fragments of the matched text per document
+SEARCH_HEADLINE_OPTIONS = (
+    f'MaxFragments=2, MaxWords=25, MinWords=8, StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}"'
+)
+
+def split_headline(headline: Optional[str]):
+    """(plain snippet, [(start, end), ...]) of a headline: the client renders the
+    snippet as text and highlights the character ranges, so document content is
+    never interpreted as markup"""
+    if headline is None:
+        return None, []
+    parts, highlights, length, start = [], [], 0, None
+    for piece in re.split(f"([{HIGHLIGHT_START}{HIGHLIGHT_STOP}])", headline):
+        if piece == HIGHLIGHT_START:
+            start = length
+        elif piece == HIGHLIGHT_STOP:
+            if start is not None:
+                highlights.append((start, length))
+            start = None
+        else:
+            parts.append(piece)
+            length += len(piece)
+    return "".join(parts), highlights
+
+def document_search_result(row) -> dict:
+    result = row._asdict()
+    result["snippet"], result["highlights"] = split_headline(result["snippet"])
+    return result
+
+def document_search_query(dialect_name: str, q: str, kind: Optional[str], current_user: CurrentUser):
+    """Documents whose extracted text matches q, best match first. PostgreSQL
+    uses the GIN full-text index (websearch syntax: "exact phrase", or, -word);
+    other databases fall back to a substring match without ranking"""
+    if current_user.role == UserRole.CANDIDATE:
+        raise HTTPException(status_code=403, detail="Not authorized to search documents")
+    if kind is not None and kind not in DOCUMENT_CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(DOCUMENT_CATEGORIES)}")
+    if dialect_name == "postgresql":
+        query = func.websearch_to_tsquery(search_config(), q)
+        matches = search_vector(DocumentText.text).op("@@")(query)
+        rank = func.ts_rank(search_vector(DocumentText.text), query)
+        headline_text = func.translate(DocumentText.text, HIGHLIGHT_START + HIGHLIGHT_STOP, "")
+        snippet = func.ts_headline(search_config(), headline_text, query, SEARCH_HEADLINE_OPTIONS)
+    else:
+        matches = DocumentText.text.icontains(q, autoescape=True)
+        rank = null()
+        snippet = null()
+    statement = select(
+        DocumentText.application_id,
+        DocumentText.kind,
+        Application.listing_id,
+        User.name.label("candidate_name"),
+        DocumentText.page_count,
+        snippet.label("snippet"),
+        rank.label("rank")
+    ).join(
+        Application, Application.id == DocumentText.application_id
+    ).join(
+        User, Application.candidate_id == User.id
+    ).where(matches)
+    if kind is not None:
+        statement = statement.where(DocumentText.kind == kind)
+    if current_user.role == UserRole.JURY:
+        statement = statement.where(jury_assigned(current_user))
+    if dialect_name == "postgresql":
+        statement = statement.order_by(rank.desc(), DocumentText.application_id, DocumentText.kind)
+    else:
+        statement = statement.order_by(DocumentText.application_id, DocumentText.kind)
+    return statement
+
+@router.get("/search", response_model=List[DocumentSearchResult])
+def search_application_documents(
+    q: str,
+    kind: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    query = document_search_query(db.get_bind().dialect.name, q, kind, current_user)
+    return [document_search_result(row) for row in db.execute(query.offset(skip).limit(limit)).all()]
+
 @router.get("/{application_id}", response_model=ApplicationDetailResponse)
 def get_application(
     application_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     # Query application with join
@@ -143,7 +243,7 @@ def get_application(
 def update_application(
     application_id: int,
     application_update: ApplicationUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     application = db.query(Application).filter(Application.id == application_id).first()
@@ -169,17 +269,7 @@ def update_application(
     
     return application
 
-@router.post("/{application_id}/documents", response_model=ApplicationResponse)
-def upload_application_documents(
-    application_id: int,
-    cv: Optional[UploadFile] = File(None),
-    diploma: Optional[UploadFile] = File(None),
-    publications: Optional[UploadFile] = File(None),
-    citations: Optional[UploadFile] = File(None),
-    conferences: Optional[UploadFile] = File(None),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
+def get_application_for_upload(db: Session, application_id: int, current_user: CurrentUser) -> Application:
     application = db.query(Application).filter(Application.id == application_id).first()
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
@@ -187,33 +277,161 @@ def upload_application_documents(
     # Check if user has permission to update this application
     if current_user.role == UserRole.CANDIDATE and application.candidate_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update this application")
-    
-    # Save uploaded files
-    if cv:
-        application.cv_path = save_upload_file(cv, "cv")
-    
-    if diploma:
-        application.diploma_path = save_upload_file(diploma, "diploma")
-    
-    if publications:
-        application.publications_path = save_upload_file(publications, "publications")
-    
-    if citations:
-        application.citations_path = save_upload_file(citations, "citations")
-    
-    if conferences:
-        application.conferences_path = save_upload_file(conferences, "conferences")
+    return application
+
+def set_document_paths(db: Session, application_id: int, documents: dict) -> Application:
+    """Blob rows and the application's paths in one transaction, with the
+    ref_count UPDATE of the Application mapper events"""
+    # Loaded again: the session was closed while the body was received
+    application = db.get(Application, application_id)
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+    if documents:
+        db.execute(insert_blobs_statement(db.get_bind().dialect.name, documents))
+    for directory, part in documents.items():
+        setattr(application, f"{directory}_path", part.relative_path)
     
     db.commit()
     db.refresh(application)
+    return application
+
+# async so the body can be streamed to disk as it arrives; the sync Session
+# is only used from the thread pool
+@router.post("/{application_id}/documents", response_model=ApplicationResponse, openapi_extra=DOCUMENTS_OPENAPI)
+async def upload_application_documents(
+    application_id: int,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    # Permission is checked before any of the body is read
+    await run_in_threadpool(get_application_for_upload, db, application_id, current_user)
+    # Release the connection while the (possibly long) body is received
+    await run_in_threadpool(db.close)
     
+    # Save uploaded files
+    documents = await receive_documents(request)
+    
+    application = await run_in_threadpool(set_document_paths, db, application_id, documents)
+    # Text extraction starts only once the upload is committed and doesn't delay the response
+    text_extractor.schedule(application_id, documents)
     return application
 
+def jury_assigned(current_user: CurrentUser):
+    """Whether the jury member evaluates the application (NULL for other roles);
+    juries only see documents of applications they evaluate"""
+    if current_user.role != UserRole.JURY:
+        return null()
+    return exists().where(
+        Evaluation.application_id == Application.id,
+        Evaluation.jury_member_id == current_user.id
+    )
+
+def check_application_access(row, current_user: CurrentUser):
+    if not row:
+        raise HTTPException(status_code=404, detail="Application not found")
+    if current_user.role == UserRole.CANDIDATE and row.candidate_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this application")
+    if current_user.role == UserRole.JURY and not row.assigned:
+        raise HTTPException(status_code=403, detail="Not authorized to view this application")
+    return row
+
+def document_query(application_id: int, kind: str, current_user: CurrentUser):
+    """Path, blob metadata and access facts of one document in a single SELECT"""
+    if kind not in DOCUMENT_CATEGORIES:
+        raise HTTPException(status_code=404, detail="Document not found")
+    path_column = getattr(Application, f"{kind}_path")
+    return select(
+        Application.candidate_id,
+        path_column.label("path"),
+        DocumentBlob.sha256,
+        DocumentBlob.content_type,
+        DocumentBlob.tier,
+        DocumentBlob.size,
+        jury_assigned(current_user).label("assigned")
+    ).outerjoin(
+        DocumentBlob, DocumentBlob.path == path_column
+    ).where(
+        Application.id == application_id
+    )
+
+def check_document_access(document, current_user: CurrentUser):
+    check_application_access(document, current_user)
+    if not document.path:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return document
+
+def bundle_query(current_user: CurrentUser):
+    """Applications with their candidate, document paths and blob content
+    types, tiers and sizes (what bundle_chunks needs), in one SELECT"""
+    blobs = {kind: aliased(DocumentBlob, name=f"{kind}_blob") for kind in DOCUMENT_CATEGORIES}
+    query = select(
+        Application.id.label("application_id"),
+        Application.candidate_id,
+        Application.status,
+        Application.apply_date,
+        User.name.label("candidate_name"),
+        jury_assigned(current_user).label("assigned"),
+        *[getattr(Application, f"{kind}_path") for kind in DOCUMENT_CATEGORIES],
+        *[blob.content_type.label(f"{kind}_content_type") for kind, blob in blobs.items()],
+        *[blob.tier.label(f"{kind}_tier") for kind, blob in blobs.items()],
+        *[blob.size.label(f"{kind}_size") for kind, blob in blobs.items()]
+    ).join(
+        User, Application.candidate_id == User.id
+    )
+    for kind, blob in blobs.items():
+        query = query.outerjoin(blob, blob.path == getattr(Application, f"{kind}_path"))
+    return query.order_by(Application.id)
+
+DOCUMENT_RESPONSES = {
+    200: {"description": "The document", "content": {"application/octet-stream": {}}},
+    206: {"description": "The requested byte range of the document"},
+    304: {"description": "Not modified (If-None-Match / If-Modified-Since)"},
+    416: {"description": "Requested range not satisfiable"},
+}
+
+@router.get("/{application_id}/documents/{kind}", response_class=Response, responses=DOCUMENT_RESPONSES)
+def download_application_document(
+    application_id: int,
+    kind: str,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    document = check_document_access(
+        db.execute(document_query(application_id, kind, current_user)).first(), current_user
+    )
+    # Release the connection before the (possibly long) file transfer
+    db.close()
+    
+    return document_response(
+        request, document.path, f"{kind}-{application_id}", document.content_type, document.sha256,
+        document.tier, document.size
+    )
+
+BUNDLE_RESPONSES = {
+    200: {"description": "ZIP of the documents with a manifest.csv", "content": {"application/zip": {}}},
+}
+
+@router.get("/{application_id}/bundle", response_class=StreamingResponse, responses=BUNDLE_RESPONSES)
+def download_application_bundle(
+    application_id: int,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    row = check_application_access(
+        db.execute(bundle_query(current_user).where(Application.id == application_id)).first(), current_user
+    )
+    # Release the connection before the archive is streamed
+    db.close()
+    
+    return bundle_response([row], f"application-{application_id}.zip")
+
 @router.put("/{application_id}/status", response_model=ApplicationResponse)
 def update_application_status(
     application_id: int,
     status: ApplicationStatus,
-    current_user: User = Depends(get_admin_or_manager_user),
+    current_user: CurrentUser = Depends(get_admin_or_manager_user),
     db: Session = Depends(get_db)
 ):
     application = db.query(Application).filter(Application.id == application_id).first()
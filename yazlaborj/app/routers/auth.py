@@ -1,97 +1,111 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from datetime import timedelta
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token, UserLogin
-from app.utils.auth import verify_password, get_password_hash, create_access_token
-from app.config import settings
+from app.utils.auth import create_user_token, rehash_statement
+from app.utils.db_errors import is_unique_violation
+from app.utils.passwords import password_hasher
+from app.utils.rate_limit import login_throttle
 
 router = APIRouter()
 
-@router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    # Check if user with TC Kimlik already exists
-    db_user_tc = db.query(User).filter(User.tc_kimlik == user.tc_kimlik).first()
-    if db_user_tc:
-        raise HTTPException(status_code=400, detail="TC Kimlik already registered")
-    
-    # Check if user with email already exists
-    db_user_email = db.query(User).filter(User.email == user.email).first()
-    if db_user_email:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Create new user
-    hashed_password = get_password_hash(user.password)
-    db_user = User(
+def insert_user_statement(user: UserCreate, hashed_password: str):
+    # One INSERT ... RETURNING; the unique indexes on tc_kimlik and email
+    # reject duplicates instead of SELECTs up front
+    return insert(User).values(
         tc_kimlik=user.tc_kimlik,
         name=user.name,
         email=user.email,
         password=hashed_password,
         role=user.role
-    )
-    db.add(db_user)
+    ).returning(User)
+
+def raise_registration_conflict(error: IntegrityError):
+    if is_unique_violation(error, "ix_users_tc_kimlik", "users.tc_kimlik"):
+        raise HTTPException(status_code=400, detail="TC Kimlik already registered")
+    if is_unique_violation(error, "ix_users_email", "users.email"):
+        raise HTTPException(status_code=400, detail="Email already registered")
+    raise error
+
+def create_user(db: Session, user: UserCreate, hashed_password: str) -> UserResponse:
+    try:
+        db_user = db.scalar(insert_user_statement(user, hashed_password))
+    except IntegrityError as e:
+        db.rollback()
+        raise_registration_conflict(e)
+    
+    # Serialize before commit, which would expire the row and reload it
+    response = UserResponse.model_validate(db_user)
     db.commit()
-    db.refresh(db_user)
-    return db_user
+    return response
 
-@router.post("/login", response_model=Token)
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
-    # Find user by TC Kimlik
-    user = db.query(User).filter(User.tc_kimlik == user_credentials.tc_kimlik).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+# async like the login routes: no request thread waits for bcrypt (a burst of
+# registrations before a deadline would otherwise fill the thread pool); the
+# sync Session is only used from the thread pool
+@router.post("/register", response_model=UserResponse)
+async def register(user: UserCreate, db: Session = Depends(get_db)):
+    # Create new user
+    hashed_password = await password_hasher.hash_async(user.password)
+    return await run_in_threadpool(create_user, db, user, hashed_password)
+
+def find_login_user(db: Session, condition):
+    return db.query(User).filter(condition).first()
+
+def login_response(db: Session, user: User, new_hash) -> dict:
+    # Serialize before commit, which would expire the row and reload it
+    response = {
+        "access_token": create_user_token(user),
+        "token_type": "bearer",
+        "user": UserResponse.model_validate(user)
+    }
+    
+    # Keep the stored hash at the configured BCRYPT_ROUNDS
+    if new_hash:
+        db.execute(rehash_statement(user, new_hash))
+        db.commit()
+    return response
+
+async def authenticate(db: Session, condition, password: str) -> dict:
+    """Token response of the user matching condition, 401 on a wrong password.
+    
+    async so no request thread waits for bcrypt (or for the equally long fake
+    verify of unknown identifiers, which throttled attackers could otherwise use
+    to fill the thread pool); the sync Session is only used from the thread pool.
+    """
+    user = await run_in_threadpool(find_login_user, db, condition)
     
-    # Verify password
-    if not verify_password(user_credentials.password, user.password):
+    # Verify password; unknown users get a fake verify that takes as long
+    if user:
+        valid, new_hash = await password_hasher.verify_and_update_async(password, user.password)
+    else:
+        valid, new_hash = await password_hasher.fake_verify_async()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id), "role": user.role},
-        expires_delta=access_token_expires
-    )
+    return await run_in_threadpool(login_response, db, user, new_hash)
+
+@router.post("/login", response_model=Token)
+async def login(request: Request, user_credentials: UserLogin, db: Session = Depends(get_db)):
+    await login_throttle.check_async(request, user_credentials.tc_kimlik)
     
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "user": user
-    }
+    # Find user by TC Kimlik
+    return await authenticate(db, User.tc_kimlik == user_credentials.tc_kimlik, user_credentials.password)
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    # Find user by TC Kimlik or email
-    user = db.query(User).filter(
-        (User.tc_kimlik == form_data.username) | (User.email == form_data.username)
-    ).first()
+async def login_for_access_token(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    await login_throttle.check_async(request, form_data.username)
     
-    if not user or not verify_password(form_data.password, user.password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id), "role": user.role},
-        expires_delta=access_token_expires
+    # Find user by TC Kimlik or email
+    return await authenticate(
+        db, (User.tc_kimlik == form_data.username) | (User.email == form_data.username), form_data.password
     )
-    
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "user": user
-    }
@@ -5,8 +5,8 @@ from typing import List
 from app.database import get_db
 from app.models.criteria import Criteria
 from app.models.listing import PositionType
-from app.models.user import User
 from app.schemas.criteria import CriteriaCreate, CriteriaResponse, CriteriaUpdate
+from app.schemas.user import CurrentUser
 from app.utils.auth import get_current_active_user, get_manager_user
 
 router = APIRouter()
@@ -14,7 +14,7 @@ router = APIRouter()
 @router.post("/", response_model=CriteriaResponse, status_code=status.HTTP_201_CREATED)
 def create_criteria(
     criteria: CriteriaCreate,
-    current_user: User = Depends(get_manager_user),
+    current_user: CurrentUser = Depends(get_manager_user),
     db: Session = Depends(get_db)
 ):
     # Create new criteria
@@ -28,7 +28,7 @@ def create_criteria(
 @router.get("/", response_model=List[CriteriaResponse])
 def get_criteria(
     position_type: PositionType = None,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     query = db.query(Criteria)
@@ -43,7 +43,7 @@ def get_criteria(
 @router.get("/{criteria_id}", response_model=CriteriaResponse)
 def get_criterion(
     criteria_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     criterion = db.query(Criteria).filter(Criteria.id == criteria_id).first()
@@ -56,7 +56,7 @@ def get_criterion(
 def update_criterion(
     criteria_id: int,
     criteria_update: CriteriaUpdate,
-    current_user: User = Depends(get_manager_user),
+    current_user: CurrentUser = Depends(get_manager_user),
     db: Session = Depends(get_db)
 ):
     criterion = db.query(Criteria).filter(Criteria.id == criteria_id).first()
@@ -75,7 +75,7 @@ def update_criterion(
 @router.delete("/{criteria_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_criterion(
     criteria_id: int,
-    current_user: User = Depends(get_manager_user),
+    current_user: CurrentUser = Depends(get_manager_user),
     db: Session = Depends(get_db)
 ):
     criterion = db.query(Criteria).filter(Criteria.id == criteria_id).first()
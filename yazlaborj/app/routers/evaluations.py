@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+from typing import List, Optional
+import logging
 from datetime import datetime, timedelta
 
 from app.database import get_db
@@ -12,14 +14,49 @@ from app.schemas.evaluation import (
     EvaluationCreate, EvaluationResponse, EvaluationUpdate, 
     EvaluationDetailResponse
 )
+from app.schemas.user import CurrentUser
 from app.utils.auth import get_current_active_user, get_manager_user, get_jury_user
+from app.utils.db_errors import is_unique_violation
+from app.utils.pagination import paginate, next_page
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# users is joined twice: once for the jury member, once for the candidate
+JuryMember = aliased(User, name="jury_member")
+Candidate = aliased(User, name="candidate")
+
+def query_evaluation_details(db: Session):
+    """Evaluation plus every EvaluationDetailResponse field in one round trip"""
+    return db.query(
+        Evaluation,
+        JuryMember.name.label("jury_name"),
+        Candidate.name.label("candidate_name"),
+        Listing.position,
+        Listing.department
+    ).join(
+        JuryMember, Evaluation.jury_member_id == JuryMember.id
+    ).join(
+        Application, Evaluation.application_id == Application.id
+    ).join(
+        Listing, Application.listing_id == Listing.id
+    ).outerjoin(
+        Candidate, Application.candidate_id == Candidate.id
+    )
+
+def to_detail_dict(result):
+    eval_dict = result[0].__dict__
+    eval_dict["jury_name"] = result.jury_name
+    eval_dict["candidate_name"] = result.candidate_name or "Unknown"
+    eval_dict["position"] = result.position
+    eval_dict["department"] = result.department
+    return eval_dict
+
 @router.post("/", response_model=EvaluationResponse, status_code=status.HTTP_201_CREATED)
 def create_evaluation(
     evaluation: EvaluationCreate,
-    current_user: User = Depends(get_manager_user),
+    current_user: CurrentUser = Depends(get_manager_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -36,16 +73,7 @@ def create_evaluation(
         if not jury_member:
             raise HTTPException(status_code=404, detail="Jury member not found")
         
-        # Check if evaluation already exists
-        existing_evaluation = db.query(Evaluation).filter(
-            Evaluation.application_id == evaluation.application_id,
-            Evaluation.jury_member_id == evaluation.jury_member_id
-        ).first()
-        
-        if existing_evaluation:
-            raise HTTPException(status_code=400, detail="Evaluation already exists")
-        
-        # Create new evaluation
+        # Create new evaluation; uq_evaluations_application_jury rejects duplicates
         db_evaluation = Evaluation(**evaluation.dict())
         db.add(db_evaluation)
         db.commit()
@@ -54,34 +82,26 @@ def create_evaluation(
         return db_evaluation
     except Exception as e:
         db.rollback()
-        print(f"Error in create_evaluation: {str(e)}")
+        if isinstance(e, IntegrityError) and is_unique_violation(e, "uq_evaluations_application_jury", "evaluations.application_id"):
+            raise HTTPException(status_code=400, detail="Evaluation already exists")
         if isinstance(e, HTTPException):
             raise e
+        logger.exception(f"Error in create_evaluation: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/", response_model=List[EvaluationDetailResponse])
 def get_evaluations(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     is_completed: bool = None,
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     try:
         # Base query with joins
-        query = db.query(
-            Evaluation,
-            User.name.label("jury_name"),
-            Application.candidate_id,
-            Listing.position,
-            Listing.department
-        ).join(
-            User, Evaluation.jury_member_id == User.id
-        ).join(
-            Application, Evaluation.application_id == Application.id
-        ).join(
-            Listing, Application.listing_id == Listing.id
-        )
+        query = query_evaluation_details(db)
         
         # Filter by completion status if provided
         if is_completed is not None:
@@ -93,47 +113,25 @@ def get_evaluations(
             query = query.filter(Evaluation.jury_member_id == current_user.id)
         
         # Get evaluations
-        results = query.offset(skip).limit(limit).all()
+        query = paginate(query, Evaluation.assigned_date, Evaluation.id, skip, limit, cursor)
+        results = next_page(query.all(), limit, lambda result: (result[0].assigned_date, result[0].id), response)
         
         # Convert to response model
-        evaluations = []
-        for result in results:
-            eval_dict = result[0].__dict__
-            eval_dict["jury_name"] = result.jury_name
-            
-            # Get candidate name directly
-            candidate = db.query(User).filter(User.id == result.candidate_id).first()
-            eval_dict["candidate_name"] = candidate.name if candidate else "Unknown"
-            
-            eval_dict["position"] = result.position
-            eval_dict["department"] = result.department
-            evaluations.append(eval_dict)
-        
-        return evaluations
+        return [to_detail_dict(result) for result in results]
     except Exception as e:
-        print(f"Error in get_evaluations: {str(e)}")
+        if isinstance(e, HTTPException):
+            raise e
+        logger.exception(f"Error in get_evaluations: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/{evaluation_id}", response_model=EvaluationDetailResponse)
 def get_evaluation(
     evaluation_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     # Query evaluation with joins
-    result = db.query(
-        Evaluation,
-        User.name.label("jury_name"),
-        Application.candidate_id,
-        Listing.position,
-        Listing.department
-    ).join(
-        User, Evaluation.jury_member_id == User.id
-    ).join(
-        Application, Evaluation.application_id == Application.id
-    ).join(
-        Listing, Application.listing_id == Listing.id
-    ).filter(
+    result = query_evaluation_details(db).filter(
         Evaluation.id == evaluation_id
     ).first()
     
@@ -145,23 +143,14 @@ def get_evaluation(
     if current_user.role == UserRole.JURY and evaluation.jury_member_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to view this evaluation")
     
-    # Get candidate name
-    candidate = db.query(User).filter(User.id == result.candidate_id).first()
-    
     # Convert to response model
-    eval_dict = evaluation.__dict__
-    eval_dict["jury_name"] = result.jury_name
-    eval_dict["candidate_name"] = candidate.name if candidate else "Unknown"
-    eval_dict["position"] = result.position
-    eval_dict["department"] = result.department
-    
-    return eval_dict
+    return to_detail_dict(result)
 
 @router.put("/{evaluation_id}", response_model=EvaluationResponse)
 def update_evaluation(
     evaluation_id: int,
     evaluation_update: EvaluationUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     evaluation = db.query(Evaluation).filter(Evaluation.id == evaluation_id).first()
@@ -190,7 +179,7 @@ def update_evaluation(
 @router.delete("/{evaluation_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_evaluation(
     evaluation_id: int,
-    current_user: User = Depends(get_manager_user),
+    current_user: CurrentUser = Depends(get_manager_user),
     db: Session = Depends(get_db)
 ):
     evaluation = db.query(Evaluation).filter(Evaluation.id == evaluation_id).first()
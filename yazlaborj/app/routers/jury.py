@@ -1,36 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+import logging
 
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.schemas.jury import JuryMemberResponse, JuryAssignmentCreate, JuryAssignmentResponse
+from app.schemas.user import CurrentUser
 from app.utils.auth import get_current_active_user, get_manager_user
+from app.utils.pagination import paginate, next_page
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.get("/members", response_model=List[JuryMemberResponse])
 def get_jury_members(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_manager_user),
+    cursor: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_manager_user),
     db: Session = Depends(get_db)
 ):
     try:
         # Get all users with JURY role
-        jury_members = db.query(User).filter(
+        query = paginate(db.query(User).filter(
             User.role == UserRole.JURY
-        ).offset(skip).limit(limit).all()
+        ), User.created_at, User.id, skip, limit, cursor)
+        jury_members = next_page(query.all(), limit, lambda user: (user.created_at, user.id), response)
         
         return jury_members
     except Exception as e:
-        print(f"Error in get_jury_members: {str(e)}")
+        if isinstance(e, HTTPException):
+            raise e
+        logger.exception(f"Error in get_jury_members: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.post("/assignments", response_model=JuryAssignmentResponse, status_code=status.HTTP_201_CREATED)
 def create_jury_assignment(
     assignment: JuryAssignmentCreate,
-    current_user: User = Depends(get_manager_user),
+    current_user: CurrentUser = Depends(get_manager_user),
     db: Session = Depends(get_db)
 ):
     # Check if jury member exists
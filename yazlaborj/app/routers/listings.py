@@ -1,21 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
 from app.database import get_db
+from app.models.application import Application
 from app.models.listing import Listing, ListingStatus
-from app.models.user import User
+from app.models.user import UserRole
+from app.routers.applications import bundle_query, BUNDLE_RESPONSES
 from app.schemas.listing import ListingCreate, ListingResponse, ListingUpdate
+from app.schemas.user import CurrentUser
 from app.utils.auth import get_current_active_user, get_admin_user
-from app.models.application import Application
+from app.utils.document_bundle import bundle_response
+from app.utils.pagination import paginate, next_page
 
 router = APIRouter()
 
 @router.post("/", response_model=ListingResponse, status_code=status.HTTP_201_CREATED)
 def create_listing(
     listing: ListingCreate,
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     # Create new listing
@@ -27,17 +32,16 @@ def create_listing(
     db.commit()
     db.refresh(db_listing)
     
-    # Add applications count
-    setattr(db_listing, "applications_count", 0)
-    
     return db_listing
 
 @router.get("/", response_model=List[ListingResponse])
 def get_listings(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: ListingStatus = None,
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     query = db.query(Listing)
@@ -46,37 +50,29 @@ def get_listings(
     if status:
         query = query.filter(Listing.status == status)
     
-    # Get listings
-    listings = query.offset(skip).limit(limit).all()
-    
-    # Add applications count to each listing
-    for listing in listings:
-        applications_count = db.query(Application).filter(Application.listing_id == listing.id).count()
-        setattr(listing, "applications_count", applications_count)
+    # Get listings (applications_count is a column, no per-listing COUNT needed)
+    query = paginate(query, Listing.created_at, Listing.id, skip, limit, cursor)
+    listings = next_page(query.all(), limit, lambda listing: (listing.created_at, listing.id), response)
     
     return listings
 
 @router.get("/{listing_id}", response_model=ListingResponse)
 def get_listing(
     listing_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     listing = db.query(Listing).filter(Listing.id == listing_id).first()
     if not listing:
         raise HTTPException(status_code=404, detail="Listing not found")
     
-    # Add applications count
-    applications_count = db.query(Application).filter(Application.listing_id == listing.id).count()
-    setattr(listing, "applications_count", applications_count)
-    
     return listing
 
 @router.put("/{listing_id}", response_model=ListingResponse)
 def update_listing(
     listing_id: int,
     listing_update: ListingUpdate,
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     listing = db.query(Listing).filter(Listing.id == listing_id).first()
@@ -90,16 +86,12 @@ def update_listing(
     db.commit()
     db.refresh(listing)
     
-    # Add applications count
-    applications_count = db.query(Application).filter(Application.listing_id == listing.id).count()
-    setattr(listing, "applications_count", applications_count)
-    
     return listing
 
 @router.delete("/{listing_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_listing(
     listing_id: int,
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     listing = db.query(Listing).filter(Listing.id == listing_id).first()
@@ -109,3 +101,24 @@ def delete_listing(
     db.delete(listing)
     db.commit()
     return None
+
+@router.get("/{listing_id}/bundle", response_class=StreamingResponse, responses=BUNDLE_RESPONSES)
+def download_listing_bundle(
+    listing_id: int,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    if current_user.role == UserRole.CANDIDATE:
+        raise HTTPException(status_code=403, detail="Not authorized to download this listing")
+    if not db.query(Listing.id).filter(Listing.id == listing_id).first():
+        raise HTTPException(status_code=404, detail="Listing not found")
+    
+    query = bundle_query(current_user).where(Application.listing_id == listing_id)
+    # Juries only get the applications they evaluate
+    if current_user.role == UserRole.JURY:
+        query = query.where(query.selected_columns.assigned)
+    rows = db.execute(query).all()
+    # Release the connection before the archive is streamed
+    db.close()
+    
+    return bundle_response(rows, f"listing-{listing_id}.zip")
@@ -1,51 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
 from app.models.user import User, UserRole
-from app.schemas.user import UserResponse, UserUpdate
-from app.utils.auth import get_current_active_user, get_admin_user
+from app.schemas.user import UserResponse, UserUpdate, CurrentUser
+from app.utils.auth import get_current_active_user, get_admin_user, load_user
+from app.utils.user_cache import user_cache
+from app.utils.pagination import paginate, next_page
 
 router = APIRouter()
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_active_user)):
-    return current_user
+def get_current_user_info(
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    return load_user(db, current_user)
 
 @router.put("/me", response_model=UserResponse)
 def update_current_user(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
+    user = load_user(db, current_user)
+    
     # Update user fields
     for key, value in user_update.dict(exclude_unset=True).items():
-        setattr(current_user, key, value)
+        setattr(user, key, value)
     
     db.commit()
-    db.refresh(current_user)
-    return current_user
+    user_cache.invalidate(user.id)
+    db.refresh(user)
+    return user
 
 @router.get("/", response_model=List[UserResponse])
 def get_users(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
     role: UserRole = None,
-    current_user: User = Depends(get_admin_user),
+    cursor: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     query = db.query(User)
     if role:
         query = query.filter(User.role == role)
     
-    users = query.offset(skip).limit(limit).all()
+    query = paginate(query, User.created_at, User.id, skip, limit, cursor)
+    users = next_page(query.all(), limit, lambda user: (user.created_at, user.id), response)
     return users
 
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
     user_id: int,
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     user = db.query(User).filter(User.id == user_id).first()
@@ -57,7 +68,7 @@ def get_user(
 def update_user(
     user_id: int,
     user_update: UserUpdate,
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     user = db.query(User).filter(User.id == user_id).first()
@@ -69,13 +80,14 @@ def update_user(
         setattr(user, key, value)
     
     db.commit()
+    user_cache.invalidate(user.id)
     db.refresh(user)
     return user
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_user(
     user_id: int,
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     user = db.query(User).filter(User.id == user_id).first()
@@ -84,4 +96,5 @@ def delete_user(
     
     db.delete(user)
     db.commit()
+    user_cache.invalidate(user_id)
     return None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
 
 from app.models.application import ApplicationStatus
@@ -45,3 +45,14 @@ class ApplicationDetailResponse(ApplicationResponse):
     
     class Config:
         from_attributes = True
+
+class DocumentSearchResult(BaseModel):
+    application_id: int
+    kind: str
+    listing_id: int
+    candidate_name: str
+    page_count: Optional[int] = None
+    # Plain text; highlights are (start, end) character offsets of the matched words in it
+    snippet: Optional[str] = None
+    highlights: List[Tuple[int, int]] = []
+    rank: Optional[float] = None
@@ -54,6 +54,14 @@ class Token(BaseModel):
     token_type: str
     user: UserResponse
 
+class CurrentUser(BaseModel):
+    """Auth fields of the requesting user, as returned by the auth guards"""
+    id: int
+    role: UserRole
+    is_active: bool
+
 class TokenData(BaseModel):
     user_id: Optional[int] = None
     role: Optional[UserRole] = None
+    is_active: Optional[bool] = None
+    issued_at: Optional[float] = None
@@ -0,0 +1 @@
+# Maintenance jobs shared by manage.py commands and background tasks
@@ -0,0 +1,273 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, delete, func, or_, select, update
+
+from app import database
+from app.config import settings
+from app.models.application import Application, DOCUMENT_PATH_COLUMNS
+from app.models.document_blob import DocumentBlob, StorageTier
+from app.storage import cold_storage, storage, TEMP_PREFIX
+from app.storage.tiering import cold_key, COLD_SUFFIX
+from app.utils import file_upload
+from app.utils.advisory_locks import blob_lock, job_lock, DOCUMENT_GC_LOCK_KEY
+
+logger = logging.getLogger(__name__)
+
+# Suffix of objects still being written (upload spill files, blobs before the rename)
+TEMP_SUFFIX = ".part"
+
+
+class CollectionReport:
+    """What one collector run found and (unless dry_run) removed"""
+
+    def __init__(self, dry_run: bool):
+        self.dry_run = dry_run
+        self.started_at = datetime.now(timezone.utc)
+        self.scanned = 0
+        self.referenced = 0
+        self.recent = 0
+        # {"path", "size", "modified", "temp", "cold"} of every unreferenced file past the grace period
+        self.orphans = []
+        self.deleted_files = 0
+        self.deleted_bytes = 0
+        self.blob_rows_deleted = 0
+        self.ref_counts_fixed = 0
+        self.errors = []
+
+    @property
+    def orphan_bytes(self) -> int:
+        return sum(orphan["size"] for orphan in self.orphans)
+
+    def as_dict(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "started_at": self.started_at.isoformat(),
+            "scanned": self.scanned,
+            "referenced": self.referenced,
+            "recent": self.recent,
+            "orphan_files": len(self.orphans),
+            "orphan_bytes": self.orphan_bytes,
+            "deleted_files": self.deleted_files,
+            "deleted_bytes": self.deleted_bytes,
+            "blob_rows_deleted": self.blob_rows_deleted,
+            "ref_counts_fixed": self.ref_counts_fixed,
+            "errors": self.errors,
+            "orphans": self.orphans,
+        }
+
+    def summary(self) -> str:
+        action = "would delete" if self.dry_run else "deleted"
+        deleted = len(self.orphans) if self.dry_run else self.deleted_files
+        size = self.orphan_bytes if self.dry_run else self.deleted_bytes
+        return (
+            f"scanned {self.scanned} files: {self.referenced} referenced, {self.recent} within the grace period, "
+            f"{len(self.orphans)} orphaned; {action} {deleted} files ({size / 1024 / 1024:.1f} MB), "
+            f"{self.blob_rows_deleted} blob rows, fixed {self.ref_counts_fixed} ref counts, {len(self.errors)} errors"
+        )
+
+
+def actual_ref_count():
+    """Number of application columns pointing at DocumentBlob.path"""
+    columns = [getattr(Application, column) for column in DOCUMENT_PATH_COLUMNS]
+    return (
+        select(func.coalesce(func.sum(sum(case((column == DocumentBlob.path, 1), else_=0) for column in columns)), 0))
+        .where(or_(*[column == DocumentBlob.path for column in columns]))
+        .scalar_subquery()
+    )
+
+
+def reconcile_blob_refs(db, dry_run: bool = False) -> int:
+    """Recompute DocumentBlob.ref_count where it drifted from the application
+    columns (e.g. rows changed outside the ORM); returns the number of blobs"""
+    actual = actual_ref_count()
+    if dry_run:
+        return db.scalar(select(func.count()).where(DocumentBlob.ref_count != actual))
+    result = db.execute(
+        update(DocumentBlob)
+        .where(DocumentBlob.ref_count != actual)
+        .values(ref_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def referenced_paths(db, paths=None) -> set:
+    """Every path an application points at (or those of paths that are)"""
+    if paths is not None and not paths:
+        return set()
+    columns = [getattr(Application, column) for column in DOCUMENT_PATH_COLUMNS]
+    query = select(*columns)
+    if paths is not None:
+        query = query.where(or_(*[column.in_(paths) for column in columns]))
+    referenced = set()
+    for row in db.execute(query.execution_options(yield_per=1000)):
+        referenced.update(path for path in row if path)
+    return referenced if paths is None else referenced & set(paths)
+
+
+def cold_paths(db, paths=None) -> set:
+    """Paths of the blobs in the cold tier (or those of paths that are)"""
+    if paths is not None and not paths:
+        return set()
+    query = select(DocumentBlob.path).where(DocumentBlob.tier == StorageTier.COLD)
+    if paths is not None:
+        query = query.where(DocumentBlob.path.in_(paths))
+    return set(db.scalars(query.execution_options(yield_per=1000)))
+
+
+def upload_files():
+    """(cold, StoredObject) of every document the application stores: the
+    legacy per-category prefixes, the blob store and spilled upload parts,
+    then the compressed blobs of the cold tier"""
+    for prefix in file_upload.DOCUMENT_CATEGORIES + [file_upload.BLOB_DIR, TEMP_PREFIX]:
+        for stored in storage.list(prefix):
+            yield False, stored
+    for prefix in [file_upload.BLOB_DIR, TEMP_PREFIX]:
+        for stored in cold_storage.list(prefix):
+            yield True, stored
+
+
+def document_path(orphan: dict) -> str:
+    """The path application columns use for the file of an orphan entry"""
+    return orphan["path"].removesuffix(COLD_SUFFIX) if orphan["cold"] else orphan["path"]
+
+
+def is_kept(path: str, cold: bool, referenced: set, cold_blobs: set) -> bool:
+    # A referenced document lives in one tier; a copy in the other is left over
+    return path in referenced and cold == (path in cold_blobs)
+
+
+def delete_batch(db, report: CollectionReport, batch: list, cutoff: float):
+    # Re-checked right before deleting: a row may have started pointing at the
+    # file, or a deduplicating upload touched it, since the scan
+    deleted_blobs = []
+    for orphan in batch:
+        path = document_path(orphan)
+        store = cold_storage if orphan["cold"] else storage
+        try:
+            # Under the lock an upload takes to reuse the blob: either its touch
+            # is seen here, or it finds the blob gone and stores it again
+            with blob_lock(path):
+                if not orphan["temp"]:
+                    still_referenced = referenced_paths(db, [path])
+                    if is_kept(path, orphan["cold"], still_referenced, cold_paths(db, [path])):
+                        continue
+                if store.stat(orphan["path"]).modified >= cutoff:
+                    continue
+                store.delete(orphan["path"])
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            report.errors.append(f"{orphan['path']}: {e}")
+            continue
+        report.deleted_files += 1
+        report.deleted_bytes += orphan["size"]
+        if (
+            not orphan["temp"] and not orphan["cold"] and not still_referenced
+            and path.startswith(file_upload.BLOB_DIR + "/")
+        ):
+            deleted_blobs.append(path)
+    if deleted_blobs:
+        # Rows of cold blobs go once their compressed copy is gone (see collect_documents)
+        result = db.execute(
+            delete(DocumentBlob)
+            .where(DocumentBlob.path.in_(deleted_blobs), DocumentBlob.tier == StorageTier.HOT)
+            .execution_options(synchronize_session=False)
+        )
+        report.blob_rows_deleted += result.rowcount
+    db.commit()
+
+
+def collect_documents(db, dry_run: bool = False, grace_minutes=None, batch_size=None, pause=None) -> CollectionReport:
+    """Delete uploaded files no application points at any more.
+
+    Files newer than the grace period are left alone (an upload stores its
+    files before it commits the row that references them, and deduplicated
+    uploads touch the existing blob). A blob's copy in the tier its row is
+    not in (a hot copy the tiering job kept, a cold copy of a blob uploaded
+    again) counts as unreferenced. Deletion runs in batches with a pause
+    in between so the collector doesn't saturate the disk; every file is
+    checked against the database again, under the blob's lock, just before
+    it is removed. With dry_run nothing is changed and the report lists
+    what would go.
+    """
+    grace_minutes = settings.DOCUMENT_GC_GRACE_MINUTES if grace_minutes is None else grace_minutes
+    batch_size = batch_size or settings.DOCUMENT_GC_BATCH_SIZE
+    pause = settings.DOCUMENT_GC_BATCH_PAUSE if pause is None else pause
+    report = CollectionReport(dry_run)
+    cutoff = time.time() - grace_minutes * 60
+
+    report.ref_counts_fixed = reconcile_blob_refs(db, dry_run)
+    referenced = referenced_paths(db)
+    cold_blobs = cold_paths(db)
+    for cold, stored in upload_files():
+        report.scanned += 1
+        path = stored.key.removesuffix(COLD_SUFFIX) if cold else stored.key
+        if is_kept(path, cold, referenced, cold_blobs):
+            report.referenced += 1
+        elif stored.modified >= cutoff:
+            report.recent += 1
+        else:
+            report.orphans.append({
+                "path": stored.key,
+                "size": stored.size,
+                "modified": datetime.fromtimestamp(stored.modified, timezone.utc).isoformat(),
+                "temp": stored.key.endswith(TEMP_SUFFIX),
+                "cold": cold,
+            })
+
+    if dry_run:
+        return report
+    for start in range(0, len(report.orphans), batch_size):
+        if start and pause:
+            time.sleep(pause)
+        delete_batch(db, report, report.orphans[start:start + batch_size], cutoff)
+
+    # Rows of unreferenced blobs whose file (in the blob's tier) is already gone
+    unreferenced = db.execute(
+        select(DocumentBlob.path, DocumentBlob.tier)
+        .where(DocumentBlob.ref_count <= 0, DocumentBlob.updated_at < datetime.fromtimestamp(cutoff, timezone.utc))
+    ).all()
+    missing = [
+        path for path, tier in unreferenced
+        if not (cold_storage.exists(cold_key(path)) if tier == StorageTier.COLD else storage.exists(path))
+    ]
+    if missing:
+        result = db.execute(
+            delete(DocumentBlob)
+            .where(DocumentBlob.path.in_(missing), DocumentBlob.ref_count <= 0)
+            .execution_options(synchronize_session=False)
+        )
+        report.blob_rows_deleted += result.rowcount
+        db.commit()
+    return report
+
+
+def run_collection(dry_run: bool = False):
+    """One collector run, or None when another worker (or manage.py) is running it"""
+    with job_lock(DOCUMENT_GC_LOCK_KEY) as acquired:
+        if not acquired:
+            logger.info("Document collector: another process is collecting, skipped")
+            return None
+        db = database.SessionLocal()
+        try:
+            report = collect_documents(db, dry_run=dry_run)
+        finally:
+            db.close()
+    logger.info(f"Document collector: {report.summary()}")
+    return report
+
+
+async def collect_documents_forever():
+    """Lifespan task: run the collector every DOCUMENT_GC_INTERVAL_HOURS"""
+    while True:
+        await asyncio.sleep(settings.DOCUMENT_GC_INTERVAL_HOURS * 3600)
+        try:
+            await run_in_threadpool(run_collection)
+        except Exception:
+            logger.exception("Document collection failed")
@@ -0,0 +1,291 @@
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib.util import find_spec
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import database
+from app.config import settings
+from app.models.application import Application
+from app.models.document_blob import DocumentBlob, StorageTier
+from app.models.document_text import DocumentText
+
+logger = logging.getLogger(__name__)
+
+
+# Run inside the pool's worker processes
+
+def _lower_priority():
+    # Extraction only uses CPU the request handlers leave over
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+
+def _extract(path: str, tier: str, size: int, max_chars: int) -> dict:
+    """Page count and plain text of a stored PDF; {"error"} when it can't be read"""
+    import pypdf
+    from app.storage import storage
+    from app.storage.tiering import open_cold
+
+    try:
+        file, _ = open_cold(path, size) if tier == StorageTier.COLD else storage.open(path)
+        with file:
+            # pypdf seeks around the file; remote and decompressed streams can't
+            source = file if getattr(file, "seekable", lambda: False)() else io.BytesIO(file.read())
+            reader = pypdf.PdfReader(source)
+            if reader.is_encrypted:
+                # Many PDFs are encrypted with an empty user password (printing restrictions only)
+                reader.decrypt("")
+            parts, length = [], 0
+            for page in reader.pages:
+                if length >= max_chars:
+                    break
+                text = page.extract_text() or ""
+                parts.append(text)
+                length += len(text) + 1
+            page_count = len(reader.pages)
+    except Exception as e:
+        return {"page_count": None, "text": "", "error": f"{type(e).__name__}: {e}"[:500]}
+    # PostgreSQL text can't hold NUL characters
+    text = "\n".join(parts)[:max_chars].replace("\x00", "")
+    return {"page_count": page_count, "text": text, "error": None}
+
+
+def extraction_available() -> bool:
+    return find_spec("pypdf") is not None
+
+
+def create_pool(workers: int) -> ProcessPoolExecutor:
+    # Spawned, not forked, like the password hashing pool
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_lower_priority,
+    )
+
+
+def lookup_text(db, application_id: int, kind: str, sha256: str):
+    """"current" when the stored text is already of this content, else the
+    extraction result of another document with the same content, or None"""
+    current = db.scalar(
+        select(DocumentText.sha256).where(DocumentText.application_id == application_id, DocumentText.kind == kind)
+    )
+    if current == sha256:
+        return "current"
+    same = db.execute(
+        select(DocumentText.page_count, DocumentText.text, DocumentText.error)
+        .where(DocumentText.sha256 == sha256)
+        .limit(1)
+    ).first()
+    return dict(same._mapping) if same else None
+
+
+def save_text(db, application_id: int, kind: str, path: str, sha256: str, result: dict) -> bool:
+    """Store the text of a document, unless the application has moved on to
+    another file for kind in the meantime"""
+    current_path = db.scalar(select(getattr(Application, f"{kind}_path")).where(Application.id == application_id))
+    if current_path != path:
+        db.rollback()
+        return False
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    values = {"sha256": sha256, **result}
+    db.execute(
+        insert(DocumentText)
+        .values(application_id=application_id, kind=kind, **values)
+        .on_conflict_do_update(index_elements=["application_id", "kind"], set_=dict(values, extracted_at=func.now()))
+    )
+    db.commit()
+    return True
+
+
+class DocumentTextExtractor:
+    """Extracts the text of freshly uploaded documents on a process pool.
+
+    schedule() is called once the upload has committed and returns at once;
+    the database work runs in the thread pool and the PDF parsing in worker
+    processes, so the upload's latency doesn't change. Content whose text is
+    already stored (same SHA-256) is not parsed again. At most max_pending
+    documents wait; the rest are left to `manage.py extract-documents`.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.executor = None
+        self.pending = 0
+        self.tasks = set()
+
+    def start(self):
+        if not settings.DOCUMENT_TEXT_EXTRACTION:
+            return
+        if not extraction_available():
+            logger.warning("pypdf is not installed, document text extraction is disabled")
+            return
+        with self.lock:
+            if self.executor is None:
+                self.executor = create_pool(self.workers)
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        for task in list(self.tasks):
+            task.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def schedule(self, application_id: int, documents: dict):
+        """Queue the documents ({kind: DocumentPart}) of a committed upload"""
+        if self.executor is None:
+            return
+        for kind, part in documents.items():
+            if kind not in settings.DOCUMENT_TEXT_KINDS:
+                continue
+            with self.lock:
+                full = self.pending >= self.max_pending
+                if not full:
+                    self.pending += 1
+            if full:
+                logger.warning(f"Text extraction queue full, application {application_id} {kind} left for later")
+                continue
+            task = asyncio.create_task(self._process(application_id, kind, part.relative_path, part.sha256, part.size))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _process(self, application_id: int, kind: str, path: str, sha256: str, size: int):
+        try:
+            found = await run_in_threadpool(self._run_in_session, lookup_text, application_id, kind, sha256)
+            if found == "current":
+                return
+            result = found
+            if result is None:
+                executor = self.executor
+                if executor is None:
+                    return
+                # Fresh uploads are always in the hot tier
+                result = await asyncio.wrap_future(
+                    executor.submit(_extract, path, StorageTier.HOT, size, settings.DOCUMENT_TEXT_MAX_CHARS)
+                )
+            await run_in_threadpool(self._run_in_session, save_text, application_id, kind, path, sha256, result)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"Text extraction failed for application {application_id} {kind}")
+        finally:
+            with self.lock:
+                self.pending -= 1
+
+    @staticmethod
+    def _run_in_session(fn, *args):
+        db = database.SessionLocal()
+        try:
+            return fn(db, *args)
+        finally:
+            db.close()
+
+
+text_extractor = DocumentTextExtractor(settings.DOCUMENT_TEXT_WORKERS, settings.DOCUMENT_TEXT_QUEUE_SIZE)
+
+
+class ExtractionReport:
+    """What one extract-documents run did"""
+
+    def __init__(self):
+        self.pending = 0
+        self.extracted = 0
+        self.reused = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.pending} documents without current text: {self.extracted} extracted "
+            f"({self.failed} unreadable), {self.reused} reused from identical content, {self.skipped} skipped"
+        )
+
+
+def pending_documents_query():
+    """Documents of the extracted kinds whose stored text is missing or of
+    older content; legacy per-category files have no hash and are left out"""
+    documents = union_all(*[
+        select(
+            Application.id.label("application_id"),
+            literal(kind).label("kind"),
+            getattr(Application, f"{kind}_path").label("path"),
+        ).where(getattr(Application, f"{kind}_path").isnot(None))
+        for kind in settings.DOCUMENT_TEXT_KINDS
+    ]).subquery()
+    return select(
+        documents.c.application_id,
+        documents.c.kind,
+        documents.c.path,
+        DocumentBlob.sha256,
+        DocumentBlob.tier,
+        DocumentBlob.size,
+    ).join(
+        DocumentBlob, DocumentBlob.path == documents.c.path
+    ).outerjoin(
+        DocumentText,
+        (DocumentText.application_id == documents.c.application_id) & (DocumentText.kind == documents.c.kind),
+    ).where(
+        DocumentText.sha256.is_distinct_from(DocumentBlob.sha256)
+    ).order_by(documents.c.application_id, documents.c.kind)
+
+
+def extract_documents(db, limit=None, workers=None) -> ExtractionReport:
+    """Extract the text of every document that has none yet (uploads made
+    while extraction was off, queue overflows, documents from before it
+    existed). Identical content is parsed once."""
+    report = ExtractionReport()
+    query = pending_documents_query()
+    if limit:
+        query = query.limit(limit)
+    documents = db.execute(query).all()
+    db.commit()
+    report.pending = len(documents)
+    if not documents:
+        return report
+
+    first_of = {}
+    duplicates = []
+    with create_pool(workers or settings.DOCUMENT_TEXT_WORKERS) as executor:
+        futures = {}
+        for document in documents:
+            found = lookup_text(db, document.application_id, document.kind, document.sha256)
+            if found is not None and found != "current":
+                report.reused += save_text(
+                    db, document.application_id, document.kind, document.path, document.sha256, found
+                )
+            elif document.sha256 in first_of:
+                duplicates.append(document)
+            else:
+                first_of[document.sha256] = None
+                future = executor.submit(
+                    _extract, document.path, document.tier, document.size, settings.DOCUMENT_TEXT_MAX_CHARS
+                )
+                futures[future] = document
+        db.commit()
+        for future in as_completed(futures):
+            document = futures[future]
+            result = future.result()
+            first_of[document.sha256] = result
+            if save_text(db, document.application_id, document.kind, document.path, document.sha256, result):
+                report.extracted += 1
+                report.failed += result["error"] is not None
+            else:
+                report.skipped += 1
+    for document in duplicates:
+        if save_text(
+            db, document.application_id, document.kind, document.path, document.sha256, first_of[document.sha256]
+        ):
+            report.reused += 1
+        else:
+            report.skipped += 1
+    return report
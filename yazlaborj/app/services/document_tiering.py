@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, func, or_, select, union_all, update
+
+from app import database
+from app.config import settings
+from app.models.application import Application, ApplicationStatus, DOCUMENT_PATH_COLUMNS
+from app.models.document_blob import DocumentBlob, StorageTier
+from app.models.listing import Listing, ListingStatus
+from app.storage import cold_storage, storage
+from app.storage.tiering import cold_key, compress_to_cold
+from app.utils.advisory_locks import blob_lock, job_lock, DOCUMENT_TIERING_LOCK_KEY
+
+logger = logging.getLogger(__name__)
+
+# An application in one of these keeps its listing (and the listing's documents) hot
+UNDECIDED_STATUSES = (ApplicationStatus.PENDING, ApplicationStatus.IN_REVIEW)
+
+
+class TieringReport:
+    """What one tiering run found and (unless dry_run) moved to the cold tier"""
+
+    def __init__(self, dry_run: bool):
+        self.dry_run = dry_run
+        self.started_at = datetime.now(timezone.utc)
+        # {"path", "size"} of every hot blob used only by closed listings
+        self.candidates = []
+        self.moved = 0
+        self.original_bytes = 0
+        self.compressed_bytes = 0
+        # Became ineligible (re-uploaded, listing reopened) while being compressed
+        self.skipped = 0
+        self.errors = []
+
+    @property
+    def candidate_bytes(self) -> int:
+        return sum(candidate["size"] for candidate in self.candidates)
+
+    def as_dict(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "started_at": self.started_at.isoformat(),
+            "candidate_blobs": len(self.candidates),
+            "candidate_bytes": self.candidate_bytes,
+            "moved": self.moved,
+            "original_bytes": self.original_bytes,
+            "compressed_bytes": self.compressed_bytes,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "candidates": self.candidates,
+        }
+
+    def summary(self) -> str:
+        if self.dry_run:
+            return f"would move {len(self.candidates)} blobs ({self.candidate_bytes / 1024 / 1024:.1f} MB) to the cold tier"
+        return (
+            f"moved {self.moved} of {len(self.candidates)} blobs to the cold tier: "
+            f"{self.original_bytes / 1024 / 1024:.1f} MB -> {self.compressed_bytes / 1024 / 1024:.1f} MB, "
+            f"{self.skipped} skipped, {len(self.errors)} errors"
+        )
+
+
+def open_listing_ids():
+    """Listings whose documents stay hot: not expired, or with an undecided application"""
+    undecided = (
+        select(Application.id)
+        .where(Application.listing_id == Listing.id, Application.status.in_(UNDECIDED_STATUSES))
+        .exists()
+    )
+    return select(Listing.id).where(or_(Listing.status.is_distinct_from(ListingStatus.EXPIRED), undecided))
+
+
+def closed_paths():
+    """Document paths every referencing application of which belongs to a closed listing"""
+    references = union_all(*[
+        select(Application.listing_id, getattr(Application, column).label("path"))
+        .where(getattr(Application, column).isnot(None))
+        for column in DOCUMENT_PATH_COLUMNS
+    ]).subquery()
+    still_open = case((references.c.listing_id.in_(open_listing_ids()), 1), else_=0)
+    return select(references.c.path).group_by(references.c.path).having(func.max(still_open) == 0)
+
+
+def move_blob(db, report: TieringReport, candidate: dict, cutoff: float, level: int):
+    path = candidate["path"]
+    try:
+        compressed = compress_to_cold(path, level)
+    except Exception as e:
+        report.errors.append(f"{path}: {e}")
+        return
+    # Eligibility is checked again in the same statement that switches the tier
+    result = db.execute(
+        update(DocumentBlob)
+        .where(
+            DocumentBlob.path == path,
+            DocumentBlob.tier == StorageTier.HOT,
+            DocumentBlob.path.in_(closed_paths()),
+        )
+        .values(tier=StorageTier.COLD, compressed_size=compressed)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if not result.rowcount:
+        report.skipped += 1
+        cold_storage.delete(cold_key(path))
+        return
+    report.moved += 1
+    report.original_bytes += candidate["size"]
+    report.compressed_bytes += compressed
+    try:
+        # A deduplicating upload touched the hot copy within the collector's
+        # grace period, so its row update (tier back to HOT) may still be on
+        # its way: leave the copy, the collector removes it once the grace
+        # period is over if the blob stays cold. The upload checks and touches
+        # under the same lock, and the tier is read again under it
+        with blob_lock(path):
+            tier = db.scalar(select(DocumentBlob.tier).where(DocumentBlob.path == path))
+            db.commit()
+            if tier == StorageTier.COLD and storage.stat(path).modified < cutoff:
+                storage.delete(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        report.errors.append(f"{path}: {e}")
+
+
+def tier_documents(
+    db, dry_run: bool = False, batch_size=None, pause=None, level=None, grace_minutes=None
+) -> TieringReport:
+    """Move the documents of closed listings to the cold tier.
+
+    A listing is closed once it is EXPIRED and none of its applications is
+    pending or in review; a blob moves only when every application pointing
+    at it belongs to a closed listing. Each blob is compressed with zstd into
+    the cold storage, switched to COLD in the database and then removed from
+    the hot storage, unless an upload touched it within the collector's grace
+    period (the collector removes that copy later). Blobs are moved in
+    batches with a pause in between. Legacy per-category files (no
+    DocumentBlob row) stay where they are.
+    """
+    batch_size = batch_size or settings.DOCUMENT_TIERING_BATCH_SIZE
+    pause = settings.DOCUMENT_TIERING_BATCH_PAUSE if pause is None else pause
+    level = level or settings.DOCUMENT_TIERING_ZSTD_LEVEL
+    grace_minutes = settings.DOCUMENT_GC_GRACE_MINUTES if grace_minutes is None else grace_minutes
+    report = TieringReport(dry_run)
+    # Hot copies touched after this (by deduplicating uploads) stay, see move_blob
+    cutoff = time.time() - grace_minutes * 60
+
+    rows = db.execute(
+        select(DocumentBlob.path, DocumentBlob.size)
+        .where(DocumentBlob.tier == StorageTier.HOT, DocumentBlob.path.in_(closed_paths()))
+        .order_by(DocumentBlob.path)
+    ).all()
+    report.candidates = [{"path": path, "size": size} for path, size in rows]
+    # Nothing is kept open while files are compressed
+    db.commit()
+
+    if dry_run:
+        return report
+    for start in range(0, len(report.candidates), batch_size):
+        if start and pause:
+            time.sleep(pause)
+        for candidate in report.candidates[start:start + batch_size]:
+            move_blob(db, report, candidate, cutoff, level)
+    return report
+
+
+def run_tiering(dry_run: bool = False):
+    """One tiering run, or None when another worker (or manage.py) is running it"""
+    # Two runs moving the same blob would remove each other's cold copy
+    with job_lock(DOCUMENT_TIERING_LOCK_KEY) as acquired:
+        if not acquired:
+            logger.info("Document tiering: another process is moving documents, skipped")
+            return None
+        db = database.SessionLocal()
+        try:
+            report = tier_documents(db, dry_run=dry_run)
+        finally:
+            db.close()
+    logger.info(f"Document tiering: {report.summary()}")
+    return report
+
+
+async def tier_documents_forever():
+    """Lifespan task: run the tiering job every DOCUMENT_TIERING_INTERVAL_HOURS"""
+    while True:
+        await asyncio.sleep(settings.DOCUMENT_TIERING_INTERVAL_HOURS * 3600)
+        try:
+            await run_in_threadpool(run_tiering)
+        except Exception:
+            logger.exception("Document tiering failed")
@@ -0,0 +1,23 @@
+from sqlalchemy import func, select, update
+
+from app.models.application import Application
+from app.models.listing import Listing
+
+def recount_applications(db) -> int:
+    """Recompute Listing.applications_count for every listing that drifted.
+
+    Runs as a single UPDATE; returns the number of corrected listings.
+    """
+    actual = (
+        select(func.count(Application.id))
+        .where(Application.listing_id == Listing.id)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Listing)
+        .where(Listing.applications_count != actual)
+        .values(applications_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,32 @@
+# Document storage: local disk (default) or an S3-compatible bucket
+from app.config import settings
+from app.storage.base import Storage, StorageWriter, StoredObject, TEMP_PREFIX
+from app.storage.local import LocalStorage
+
+
+def create_storage(cold: bool = False) -> Storage:
+    """The configured storage; cold=True for the tier of closed listings'
+    (compressed) documents"""
+    if settings.STORAGE_BACKEND == "s3":
+        # boto3 (in requirements.txt) is only imported for this backend
+        from app.storage.s3 import S3Storage
+
+        return S3Storage(
+            bucket=(settings.S3_COLD_BUCKET or settings.S3_BUCKET) if cold else settings.S3_BUCKET,
+            prefix=settings.S3_COLD_PREFIX if cold else settings.S3_PREFIX,
+            storage_class=settings.S3_COLD_STORAGE_CLASS if cold else "",
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            public_endpoint_url=settings.S3_PUBLIC_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            part_size=settings.S3_PART_SIZE_MB * 1024 * 1024,
+            concurrency=settings.S3_UPLOAD_CONCURRENCY,
+            workers=settings.S3_UPLOAD_WORKERS,
+            presign_seconds=settings.S3_PRESIGN_SECONDS,
+        )
+    return LocalStorage(settings.COLD_UPLOAD_DIR if cold else settings.UPLOAD_DIR)
+
+
+storage = create_storage()
+cold_storage = create_storage(cold=True)
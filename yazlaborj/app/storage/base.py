@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, NamedTuple, Optional
+
+# Objects still being written (spilled upload parts) live under this prefix
+TEMP_PREFIX = "tmp"
+
+
+class StoredObject(NamedTuple):
+    key: str
+    size: int
+    # Seconds since the epoch
+    modified: float
+
+
+class StorageWriter(ABC):
+    """Receives one object chunk by chunk, before its key is known.
+
+    commit() publishes what was written under a key, abort() drops it.
+    Blocking: used from the thread pool.
+    """
+
+    @abstractmethod
+    def write(self, data: bytes):
+        ...
+
+    @abstractmethod
+    def commit(self, key: str):
+        ...
+
+    @abstractmethod
+    def abort(self):
+        ...
+
+
+class Storage(ABC):
+    """Where uploaded documents live, addressed by keys like
+    "blobs/ab/cd/<sha256>" or (legacy) "cv/<uuid>.pdf".
+
+    Every method blocks; async code calls them through run_in_threadpool.
+    Missing objects raise FileNotFoundError.
+    """
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def stat(self, key: str) -> StoredObject:
+        ...
+
+    @abstractmethod
+    def touch(self, key: str):
+        """Set the modification time to now (restarts the collector's grace period)"""
+
+    @abstractmethod
+    def put(self, key: str, chunks: list):
+        """Store a small object held in memory"""
+
+    @abstractmethod
+    def writer(self) -> StorageWriter:
+        ...
+
+    @abstractmethod
+    def open(self, key: str):
+        """(readable file object, StoredObject) of an object"""
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    def list(self, prefix: str) -> Iterator[StoredObject]:
+        """Every object under prefix/"""
+
+    def presigned_url(self, key: str, content_type: str, disposition: str) -> Optional[str]:
+        """Time-limited URL the client can download the object from directly,
+        or None when the API has to serve it"""
+        return None
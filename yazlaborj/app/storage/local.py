@@ -0,0 +1,99 @@
+import os
+import uuid
+from pathlib import Path
+
+from app.storage.base import Storage, StorageWriter, StoredObject, TEMP_PREFIX
+
+
+class LocalWriter(StorageWriter):
+    """Spools to <root>/tmp and renames into place on commit"""
+
+    def __init__(self, storage: "LocalStorage"):
+        self.storage = storage
+        self.temp_path = storage.root / TEMP_PREFIX / f"{uuid.uuid4()}.part"
+        os.makedirs(self.temp_path.parent, exist_ok=True)
+        self.file = open(self.temp_path, "wb")
+
+    def write(self, data: bytes):
+        self.file.write(data)
+
+    def commit(self, key: str):
+        self.file.close()
+        target = self.storage.path(key)
+        os.makedirs(target.parent, exist_ok=True)
+        # Same filesystem: atomic, readers see either no file or the whole file
+        os.replace(self.temp_path, target)
+        self.temp_path = None
+
+    def abort(self):
+        if not self.file.closed:
+            self.file.close()
+        if self.temp_path is not None:
+            try:
+                os.remove(self.temp_path)
+            except FileNotFoundError:
+                pass
+            self.temp_path = None
+
+
+class LocalStorage(Storage):
+    """Files under a directory on this machine (UPLOAD_DIR)"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        root = self.root.resolve()
+        path = (root / key).resolve()
+        # Keys come from the database; never follow one out of the root
+        if not path.is_relative_to(root) or path == root:
+            raise FileNotFoundError(key)
+        return path
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def stat(self, key: str) -> StoredObject:
+        stat = os.stat(self.path(key))
+        return StoredObject(key, stat.st_size, stat.st_mtime)
+
+    def touch(self, key: str):
+        os.utime(self.path(key))
+
+    def put(self, key: str, chunks: list):
+        target = self.path(key)
+        os.makedirs(target.parent, exist_ok=True)
+        temp_path = target.parent / f".{uuid.uuid4()}.part"
+        try:
+            with open(temp_path, "wb") as file:
+                file.writelines(chunks)
+            os.replace(temp_path, target)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    def writer(self) -> LocalWriter:
+        return LocalWriter(self)
+
+    def open(self, key: str):
+        try:
+            file = open(self.path(key), "rb")
+        except IsADirectoryError:
+            raise FileNotFoundError(key)
+        # fstat on the open descriptor: size and time describe exactly what is read
+        stat = os.fstat(file.fileno())
+        return file, StoredObject(key, stat.st_size, stat.st_mtime)
+
+    def delete(self, key: str):
+        os.remove(self.path(key))
+
+    def list(self, prefix: str):
+        for directory, _, names in os.walk(self.root / prefix):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                key = os.path.relpath(path, self.root).replace(os.sep, "/")
+                yield StoredObject(key, stat.st_size, stat.st_mtime)
@@ -0,0 +1,208 @@
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from app.storage.base import Storage, StorageWriter, StoredObject, TEMP_PREFIX
+
+# S3 rejects multipart parts below 5 MB (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+def _is_not_found(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+
+class S3Writer(StorageWriter):
+    """Streams an object as a multipart upload while it is written.
+
+    The final (content-addressed) key is only known at the end, so parts go
+    to a temporary key and commit() copies the finished object server-side.
+    Parts are uploaded by the storage's thread pool, at most `concurrency`
+    of them in flight per object; write() blocks beyond that.
+    """
+
+    def __init__(self, storage: "S3Storage"):
+        self.storage = storage
+        self.temp_key = storage.key(f"{TEMP_PREFIX}/{uuid.uuid4()}.part")
+        self.buffer = []
+        self.buffered = 0
+        self.upload_id = None
+        self.part_number = 0
+        self.futures = []
+
+    def write(self, data: bytes):
+        self.buffer.append(data)
+        self.buffered += len(data)
+        if self.buffered >= self.storage.part_size:
+            self._send_part()
+
+    def _send_part(self):
+        body = b"".join(self.buffer)
+        self.buffer, self.buffered = [], 0
+        if self.upload_id is None:
+            self.upload_id = self.storage.client.create_multipart_upload(
+                Bucket=self.storage.bucket, Key=self.temp_key, **self.storage.object_options
+            )["UploadId"]
+        in_flight = [future for future in self.futures if not future.done()]
+        if len(in_flight) >= self.storage.concurrency:
+            wait(in_flight, return_when=FIRST_COMPLETED)
+        self.part_number += 1
+        self.futures.append(self.storage.executor.submit(self._upload_part, self.part_number, body))
+
+    def _upload_part(self, number: int, body: bytes) -> dict:
+        response = self.storage.client.upload_part(
+            Bucket=self.storage.bucket, Key=self.temp_key, UploadId=self.upload_id, PartNumber=number, Body=body
+        )
+        return {"PartNumber": number, "ETag": response["ETag"]}
+
+    def commit(self, key: str):
+        if self.upload_id is None:
+            # Never reached a full part: one PUT straight to the final key
+            self.storage.put(key, self.buffer)
+            self.buffer = []
+            return
+        if self.buffer:
+            self._send_part()
+        parts = [future.result() for future in self.futures]
+        client, bucket = self.storage.client, self.storage.bucket
+        client.complete_multipart_upload(
+            Bucket=bucket, Key=self.temp_key, UploadId=self.upload_id, MultipartUpload={"Parts": parts}
+        )
+        self.upload_id = None
+        client.copy_object(
+            Bucket=bucket, Key=self.storage.key(key), CopySource={"Bucket": bucket, "Key": self.temp_key},
+            **self.storage.object_options,
+        )
+        client.delete_object(Bucket=bucket, Key=self.temp_key)
+
+    def abort(self):
+        self.buffer = []
+        for future in self.futures:
+            future.cancel()
+        wait(self.futures)
+        if self.upload_id is not None:
+            self.storage.client.abort_multipart_upload(
+                Bucket=self.storage.bucket, Key=self.temp_key, UploadId=self.upload_id
+            )
+            self.upload_id = None
+
+
+class S3Storage(Storage):
+    """Objects in an S3-compatible bucket (AWS S3, MinIO, ...), shared by
+    every API replica. Downloads are served by the bucket through presigned
+    URLs. Needs the boto3 package.
+
+    Incomplete multipart uploads of crashed workers are not listed as
+    objects; an AbortIncompleteMultipartUpload lifecycle rule on the bucket
+    cleans them up.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str = None,
+        public_endpoint_url: str = None,
+        region: str = None,
+        access_key_id: str = None,
+        secret_access_key: str = None,
+        part_size: int = 8 * 1024 * 1024,
+        concurrency: int = 4,
+        workers: int = 8,
+        presign_seconds: int = 300,
+        storage_class: str = "",
+    ):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.concurrency = concurrency
+        self.presign_seconds = presign_seconds
+        # Applied to every object written (e.g. STANDARD_IA for the cold tier)
+        self.object_options = {"StorageClass": storage_class} if storage_class else {}
+        options = {
+            "region_name": region or None,
+            "aws_access_key_id": access_key_id or None,
+            "aws_secret_access_key": secret_access_key or None,
+            "config": Config(
+                signature_version="s3v4",
+                # Path-style URLs work with MinIO and custom endpoints
+                s3={"addressing_style": "path" if endpoint_url else "auto"},
+                max_pool_connections=workers + 10,
+            ),
+        }
+        self.client = boto3.client("s3", endpoint_url=endpoint_url or None, **options)
+        # Presigned URLs must use the host the browser can reach
+        self.presign_client = (
+            boto3.client("s3", endpoint_url=public_endpoint_url, **options) if public_endpoint_url else self.client
+        )
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-upload")
+
+    def key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _stored(self, key: str, size: int, modified) -> StoredObject:
+        return StoredObject(key, size, modified.timestamp())
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.stat(key)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def stat(self, key: str) -> StoredObject:
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=self.key(key))
+        except ClientError as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(key)
+            raise
+        return self._stored(key, response["ContentLength"], response["LastModified"])
+
+    def touch(self, key: str):
+        # In-place copy: server-side, no data passes through the API
+        full_key = self.key(key)
+        self.client.copy_object(
+            Bucket=self.bucket, Key=full_key, CopySource={"Bucket": self.bucket, "Key": full_key},
+            MetadataDirective="REPLACE", **self.object_options,
+        )
+
+    def put(self, key: str, chunks: list):
+        self.client.put_object(Bucket=self.bucket, Key=self.key(key), Body=b"".join(chunks), **self.object_options)
+
+    def writer(self) -> S3Writer:
+        return S3Writer(self)
+
+    def open(self, key: str):
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self.key(key))
+        except ClientError as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(key)
+            raise
+        return response["Body"], self._stored(key, response["ContentLength"], response["LastModified"])
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self.key(key))
+
+    def list(self, prefix: str):
+        strip = len(self.prefix) + 1 if self.prefix else 0
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.key(prefix) + "/"):
+            for item in page.get("Contents", []):
+                yield self._stored(item["Key"][strip:], item["Size"], item["LastModified"])
+
+    def presigned_url(self, key: str, content_type: str, disposition: str) -> str:
+        return self.presign_client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self.key(key),
+                "ResponseContentType": content_type,
+                "ResponseContentDisposition": disposition,
+            },
+            ExpiresIn=self.presign_seconds,
+        )
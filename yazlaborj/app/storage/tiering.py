@@ -0,0 +1,51 @@
+# zstd-compressed copies of blobs in the cold storage (needs the zstandard package)
+from app.storage import cold_storage, storage
+from app.storage.base import StoredObject
+
+COLD_SUFFIX = ".zst"
+# Hot objects are read (and compressed) in chunks of this size
+COMPRESS_CHUNK_SIZE = 1024 * 1024
+
+
+def cold_key(key: str) -> str:
+    return key + COLD_SUFFIX
+
+
+def compress_to_cold(key: str, level: int) -> int:
+    """Stream the hot object key into the cold storage as one zstd frame;
+    returns the compressed size. The hot object is left in place."""
+    import zstandard
+
+    source, stored = storage.open(key)
+    writer = cold_storage.writer()
+    compressed = 0
+    try:
+        with source:
+            # The frame header records the original size
+            compressor = zstandard.ZstdCompressor(level=level).compressobj(size=stored.size)
+            while chunk := source.read(COMPRESS_CHUNK_SIZE):
+                data = compressor.compress(chunk)
+                if data:
+                    writer.write(data)
+                    compressed += len(data)
+            data = compressor.flush()
+            writer.write(data)
+            compressed += len(data)
+        writer.commit(cold_key(key))
+    except BaseException:
+        writer.abort()
+        raise
+    return compressed
+
+
+def open_cold(key: str, size: int):
+    """(reader, StoredObject) of a cold blob, decompressed while it is read.
+
+    size is the original size (DocumentBlob.size). The reader has no file
+    descriptor and can't seek, so it is always sent in chunks.
+    """
+    import zstandard
+
+    file, stored = cold_storage.open(cold_key(key))
+    reader = zstandard.ZstdDecompressor().stream_reader(file, closefd=True)
+    return reader, StoredObject(key, size, stored.modified)
@@ -0,0 +1,75 @@
+import threading
+import zlib
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+from app import database
+
+# pg_advisory_lock keys, next to the migration runner's (74021)
+DOCUMENT_GC_LOCK_KEY = 74022
+DOCUMENT_TIERING_LOCK_KEY = 74024
+# First key of the two-key form; the second is a hash of the blob path
+BLOB_LOCK_NAMESPACE = 74023
+
+# Other databases (SQLite, development only) run a single process
+_local_blob_lock = threading.Lock()
+_local_job_locks = {}
+_local_job_locks_guard = threading.Lock()
+
+
+def _path_key(path: str) -> int:
+    # crc32 as a signed int4; a collision only serializes two unrelated paths
+    key = zlib.crc32(path.encode())
+    return key - (1 << 32) if key >= 1 << 31 else key
+
+
+@contextmanager
+def _lock_connection():
+    # Session-level advisory locks outlive transactions, so the connection
+    # is kept in autocommit and held for as long as the lock is. It comes
+    # from the unpooled lock engine: callers (an upload's session, the
+    # collector's) may already hold a pooled connection each, and waiting on
+    # the pool for a second one deadlocks once the pool is exhausted
+    with database.lock_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        yield connection
+
+
+@contextmanager
+def blob_lock(path: str):
+    """Serializes work on one stored blob across processes: an upload
+    deciding to reuse it, the collector or the tiering job removing it"""
+    if database.lock_engine is None:
+        with _local_blob_lock:
+            yield
+        return
+    parameters = {"namespace": BLOB_LOCK_NAMESPACE, "key": _path_key(path)}
+    with _lock_connection() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:namespace, :key)"), parameters)
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:namespace, :key)"), parameters)
+
+
+@contextmanager
+def job_lock(key: int):
+    """Yields whether this process got the lock of a background job; a job
+    every worker schedules runs in one of them at a time"""
+    if database.lock_engine is None:
+        with _local_job_locks_guard:
+            lock = _local_job_locks.setdefault(key, threading.Lock())
+        acquired = lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+        return
+    with _lock_connection() as connection:
+        acquired = connection.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
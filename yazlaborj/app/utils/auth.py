@@ -1,28 +1,39 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import time
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.user import User, UserRole
-from app.schemas.user import TokenData
+from app.schemas.user import TokenData, CurrentUser
 from app.config import settings
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.utils.passwords import pwd_context
+from app.utils.revocation import revocations
+from app.utils.user_cache import user_cache
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/login")
 
+# Inline hashing, for scripts; request handlers use app.utils.passwords.password_hasher
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def rehash_statement(user: User, new_hash: str):
+    """Store a rehashed password without going through the ORM.
+
+    The password is unchanged, so this must not fire the User mapper events
+    that revoke the user's tokens.
+    """
+    return update(User).where(User.id == user.id).values(password=new_hash).execution_options(synchronize_session=False)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -30,10 +41,22 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    to_encode.setdefault("iat", time.time())
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def create_user_token(user: User) -> str:
+    """Access token carrying the claims that AUTH_MODE=claims trusts"""
+    if settings.AUTH_MODE == "claims":
+        expires_delta = timedelta(minutes=settings.CLAIMS_TOKEN_EXPIRE_MINUTES)
+    else:
+        expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return create_access_token(
+        data={"sub": str(user.id), "role": user.role.value, "active": bool(user.is_active)},
+        expires_delta=expires_delta
+    )
+
+def decode_access_token(token: str) -> TokenData:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -44,20 +67,70 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         user_id: int = payload.get("sub")
         if user_id is None:
             raise credentials_exception
-        token_data = TokenData(user_id=user_id)
+        return TokenData(
+            user_id=user_id,
+            role=payload.get("role"),
+            is_active=payload.get("active"),
+            issued_at=payload.get("iat"),
+        )
     except JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+
+def credentials_exception():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+# Only the columns the guards need; the full row is loaded by the endpoints that return it
+auth_columns = (User.id, User.role, User.is_active)
+
+def cache_current_user(row) -> CurrentUser:
+    user = CurrentUser(id=row.id, role=row.role, is_active=bool(row.is_active))
+    user_cache.set(user)
+    return user
+
+def claims_user(token_data: TokenData) -> Optional[CurrentUser]:
+    """CurrentUser taken from the token in AUTH_MODE=claims.
+
+    Returns None, meaning "ask the database", for tokens issued without the
+    claims and while the revocation list is not loaded or gone stale.
+    """
+    if settings.AUTH_MODE != "claims":
+        return None
+    if token_data.role is None or token_data.is_active is None or token_data.issued_at is None:
+        return None
+    if not revocations.is_fresh():
+        return None
+    if revocations.is_revoked(token_data.user_id, token_data.issued_at):
+        raise credentials_exception()
+    return CurrentUser(id=token_data.user_id, role=token_data.role, is_active=token_data.is_active)
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> CurrentUser:
+    token_data = decode_access_token(token)
+    user = claims_user(token_data) or user_cache.get(token_data.user_id)
+    if user is not None:
+        return user
+    row = db.query(*auth_columns).filter(User.id == token_data.user_id).first()
+    if row is None:
+        raise credentials_exception()
+    return cache_current_user(row)
+
+def load_user(db: Session, current_user: CurrentUser) -> User:
+    """Full row of the requesting user, for endpoints that return or modify it"""
+    user = db.query(User).filter(User.id == current_user.id).first()
     if user is None:
-        raise credentials_exception
+        user_cache.invalidate(current_user.id)
+        raise credentials_exception()
     return user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)):
+def get_current_active_user(current_user: CurrentUser = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-def get_admin_user(current_user: User = Depends(get_current_active_user)):
+def get_admin_user(current_user: CurrentUser = Depends(get_current_active_user)):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -65,7 +138,7 @@ def get_admin_user(current_user: User = Depends(get_current_active_user)):
         )
     return current_user
 
-def get_manager_user(current_user: User = Depends(get_current_active_user)):
+def get_manager_user(current_user: CurrentUser = Depends(get_current_active_user)):
     if current_user.role != UserRole.MANAGER:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -73,7 +146,7 @@ def get_manager_user(current_user: User = Depends(get_current_active_user)):
         )
     return current_user
 
-def get_jury_user(current_user: User = Depends(get_current_active_user)):
+def get_jury_user(current_user: CurrentUser = Depends(get_current_active_user)):
     if current_user.role != UserRole.JURY:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -81,10 +154,45 @@ def get_jury_user(current_user: User = Depends(get_current_active_user)):
         )
     return current_user
 
-def get_admin_or_manager_user(current_user: User = Depends(get_current_active_user)):
+def get_admin_or_manager_user(current_user: CurrentUser = Depends(get_current_active_user)):
     if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
     return current_user
+
+
+# Async variants used by the routers in app.routers.aio (DB_ASYNC=True)
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> CurrentUser:
+    token_data = decode_access_token(token)
+    user = claims_user(token_data) or user_cache.get(token_data.user_id)
+    if user is not None:
+        return user
+    row = (await db.execute(select(*auth_columns).where(User.id == token_data.user_id))).first()
+    if row is None:
+        raise credentials_exception()
+    return cache_current_user(row)
+
+async def load_user_async(db: AsyncSession, current_user: CurrentUser) -> User:
+    user = await db.scalar(select(User).where(User.id == current_user.id))
+    if user is None:
+        user_cache.invalidate(current_user.id)
+        raise credentials_exception()
+    return user
+
+async def get_current_active_user_async(current_user: CurrentUser = Depends(get_current_user_async)):
+    return get_current_active_user(current_user)
+
+async def get_admin_user_async(current_user: CurrentUser = Depends(get_current_active_user_async)):
+    return get_admin_user(current_user)
+
+async def get_manager_user_async(current_user: CurrentUser = Depends(get_current_active_user_async)):
+    return get_manager_user(current_user)
+
+async def get_jury_user_async(current_user: CurrentUser = Depends(get_current_active_user_async)):
+    return get_jury_user(current_user)
+
+async def get_admin_or_manager_user_async(current_user: CurrentUser = Depends(get_current_active_user_async)):
+    return get_admin_or_manager_user(current_user)
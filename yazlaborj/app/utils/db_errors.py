@@ -0,0 +1,20 @@
+from sqlalchemy.exc import IntegrityError
+
+# SQLSTATE for unique_violation (psycopg2 and asyncpg both expose it as .pgcode)
+UNIQUE_VIOLATION = "23505"
+
+def is_unique_violation(error: IntegrityError, *names) -> bool:
+    """Check whether an IntegrityError comes from a unique index/constraint.
+
+    names are index names or column names ("users.email" on SQLite,
+    "ix_users_email" on PostgreSQL); if given, one of them must appear in the
+    driver's error message.
+    """
+    orig = error.orig
+    pgcode = getattr(orig, "pgcode", None)
+    if pgcode is not None and pgcode != UNIQUE_VIOLATION:
+        return False
+    message = str(orig)
+    if "unique" not in message.lower():
+        return False
+    return not names or any(name in message for name in names)
@@ -0,0 +1,263 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+# Separate logger so the slow query file only receives slow query entries
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+
+_whitespace = re.compile(r"\s+")
+
+
+class NPlusOneError(RuntimeError):
+    """Raised in N_PLUS_ONE_MODE=raise when a statement repeats too often"""
+
+
+class RequestQueryStats:
+    """Statements executed while serving one request"""
+
+    def __init__(self, route: Optional[str] = None):
+        self.route = route
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[_whitespace.sub(" ", statement).strip()] += 1
+
+    def repeated(self, threshold: int):
+        return [(shape, count) for shape, count in self.shapes.items() if count > threshold]
+
+
+# Stats of the request being served; the middleware sets it, the engine
+# listeners fill it (contextvars follow sync handlers into the thread pool)
+_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the execution context, which ends with the statement: a statement
+    # that raises never reaches _after_cursor_execute, and state kept on the
+    # (pooled, long-lived) connection would be left behind
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_start_time", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        record_slow_query(conn, statement, parameters, executemany, elapsed, stats.route if stats else None)
+
+
+class SlowQueryLog:
+    """Most recent slow queries, kept in memory for the admin endpoint"""
+
+    def __init__(self, size: int):
+        self.lock = threading.Lock()
+        self.entries = deque(maxlen=size)
+
+    def add(self, entry: dict):
+        with self.lock:
+            self.entries.append(entry)
+
+    def recent(self, limit: Optional[int] = None) -> list:
+        with self.lock:
+            entries = list(reversed(self.entries))
+        return entries[:limit] if limit else entries
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+slow_queries = SlowQueryLog(settings.SLOW_QUERY_BUFFER)
+
+
+def redact_parameters(parameters, executemany: bool):
+    """Keep parameter names/positions and types, never the values"""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+class AnalyzeSampler:
+    """Lets at most one EXPLAIN ANALYZE through per interval (per process).
+
+    ANALYZE runs the statement a second time inside the request, so it is
+    only sampled; all other slow queries get the estimated plan.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last = None
+
+    def allow(self) -> bool:
+        interval = settings.SLOW_QUERY_ANALYZE_INTERVAL
+        if interval <= 0:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            if self.last is not None and now - self.last < interval:
+                return False
+            self.last = now
+            return True
+
+
+analyze_sampler = AnalyzeSampler()
+
+
+def explain(conn, statement: str, parameters, analyze: bool = False) -> Optional[str]:
+    """Capture the plan of a statement on the connection that ran it.
+
+    The plan is read through a separate DBAPI cursor so the caller's pending
+    rows are untouched. On PostgreSQL the plan is estimated only, unless
+    analyze is set for a SELECT (which runs the query again); the explain
+    runs inside a savepoint so a failure can't abort the caller's transaction.
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        prefix, savepoint = "EXPLAIN QUERY PLAN ", False
+    elif dialect == "postgresql":
+        is_select = statement.lstrip()[:6].upper() == "SELECT"
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze and is_select else "EXPLAIN "
+        savepoint = conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT"
+    else:
+        return None
+
+    cursor = conn.connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        if savepoint:
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+    # PostgreSQL returns one text line per row, SQLite (id, parent, notused, detail)
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def record_slow_query(conn, statement, parameters, executemany, elapsed, route):
+    plan = None
+    if settings.SLOW_QUERY_EXPLAIN and not executemany:
+        try:
+            plan = explain(conn, statement, parameters, analyze=analyze_sampler.allow())
+        except Exception as e:
+            plan = f"EXPLAIN failed: {e}"
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "route": route,
+        "duration_ms": round(elapsed * 1000, 2),
+        "statement": statement,
+        "parameters": redact_parameters(parameters, executemany),
+        "plan": plan,
+    }
+    slow_queries.add(entry)
+    slow_query_logger.warning(json.dumps(entry, ensure_ascii=False))
+
+
+def setup_slow_query_log():
+    """Send slow query entries to SLOW_QUERY_LOG_FILE, rotating by size"""
+    path = settings.SLOW_QUERY_LOG_FILE
+    if not path or any(isinstance(h, RotatingFileHandler) for h in slow_query_logger.handlers):
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    handler = RotatingFileHandler(
+        path,
+        maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+        backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+        encoding="utf-8",
+    )
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_query_logger.addHandler(handler)
+
+
+def instrument_engine(engine):
+    """Attach the statement timing listeners to a (sync) Engine"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def check_n_plus_one(stats: RequestQueryStats):
+    mode = settings.N_PLUS_ONE_MODE
+    if mode == "off":
+        return
+    repeated = stats.repeated(settings.N_PLUS_ONE_THRESHOLD)
+    if not repeated:
+        return
+    for shape, count in repeated:
+        message = f"Possible N+1 in {stats.route}: statement ran {count} times: {shape[:300]}"
+        if mode == "raise":
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+
+class DBQueryStatsMiddleware:
+    """Collects RequestQueryStats per request and reports them on the response.
+
+    Plain ASGI rather than an @app.middleware("http") function, so response
+    messages other than http.response.body (the zero-copy file send of the
+    document download) pass through untouched. The stats are read when the
+    response starts, i.e. after the handler has run.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(f"{scope['method']} {scope['path']}")
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                check_n_plus_one(stats)
+                if settings.DB_QUERY_STATS_HEADERS:
+                    headers = MutableHeaders(scope=message)
+                    headers[QUERY_COUNT_HEADER] = str(stats.count)
+                    headers[QUERY_TIME_HEADER] = f"{stats.total_time * 1000:.2f}"
+            await send(message)
+
+        token = _request_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _request_stats.reset(token)
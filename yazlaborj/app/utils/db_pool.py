@@ -0,0 +1,108 @@
+import logging
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CheckoutStats:
+    """Counters for connection checkouts of a single pool"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_log = time.monotonic()
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self.lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            avg_wait = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(avg_wait * 1000, 3),
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class TimedCheckoutMixin:
+    """Measures how long callers wait for a connection from the pool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = CheckoutStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_stats.record(time.perf_counter() - start, timed_out=True)
+            logger.warning("Connection pool timeout: %s", pool_status(self))
+            raise
+        self.checkout_stats.record(time.perf_counter() - start)
+        self._maybe_log()
+        return connection
+
+    def _maybe_log(self):
+        interval = settings.DB_POOL_LOG_INTERVAL
+        if interval <= 0:
+            return
+        stats = self.checkout_stats
+        now = time.monotonic()
+        if now - stats.last_log < interval:
+            return
+        stats.last_log = now
+        logger.info("Connection pool: %s", pool_status(self))
+
+
+class InstrumentedQueuePool(TimedCheckoutMixin, QueuePool):
+    # keep SQLAlchemy's own pool logging under the "sqlalchemy" logger
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.QueuePool"
+
+
+class InstrumentedAsyncQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
+
+
+def pool_options(is_async: bool = False) -> dict:
+    """Keyword arguments for create_engine/create_async_engine"""
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def pool_status(pool) -> dict:
+    """Current connection usage of a pool plus its checkout wait statistics"""
+    status = {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+    }
+    stats = getattr(pool, "checkout_stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
@@ -0,0 +1,113 @@
+import csv
+import io
+import mimetypes
+import os
+import re
+import time
+import zipfile
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.utils.file_download import open_document
+from app.utils.file_upload import DOCUMENT_CATEGORIES
+
+# Documents are read (and the archive handed to the server) in chunks of this size
+BUNDLE_CHUNK_SIZE = 256 * 1024
+MANIFEST_NAME = "manifest.csv"
+MANIFEST_COLUMNS = [
+    "application_id", "candidate_id", "candidate_name", "status", "apply_date", "folder", "documents", "missing",
+]
+
+_unsafe_name = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+
+
+class ArchiveSink:
+    """Write-only, unseekable target for ZipFile.
+
+    zipfile then writes each member with a data descriptor instead of
+    seeking back to patch its header, so the archive can be sent as it is
+    built; drain() hands over (and forgets) what was written so far.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        if self.chunks:
+            data = b"".join(self.chunks)
+            self.chunks = []
+            yield data
+
+
+def application_folder(row) -> str:
+    name = _unsafe_name.sub("_", row.candidate_name or "").strip(" ._")
+    return f"{row.application_id}_{name}" if name else str(row.application_id)
+
+
+def document_name(kind: str, path: str, content_type) -> str:
+    extension = os.path.splitext(path)[1] or mimetypes.guess_extension(content_type or "") or ""
+    return kind + extension
+
+
+def bundle_chunks(rows):
+    """The ZIP archive of the documents of rows (see bundle_query), in chunks.
+
+    Files are stored uncompressed (PDFs already are compressed), read one
+    chunk at a time and never staged, so memory stays constant whatever the
+    number and size of the documents. manifest.csv comes last and also lists
+    documents whose file is missing from storage.
+    """
+    sink = ArchiveSink()
+    manifest = io.StringIO()
+    writer = csv.writer(manifest)
+    writer.writerow(MANIFEST_COLUMNS)
+
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as archive:
+        for row in rows:
+            folder = application_folder(row)
+            included, missing = [], []
+            for kind in DOCUMENT_CATEGORIES:
+                path = getattr(row, f"{kind}_path")
+                if not path:
+                    continue
+                name = document_name(kind, path, getattr(row, f"{kind}_content_type"))
+                try:
+                    source, stat = open_document(path, getattr(row, f"{kind}_tier"), getattr(row, f"{kind}_size"))
+                except (HTTPException, OSError):
+                    missing.append(name)
+                    continue
+                with source:
+                    info = zipfile.ZipInfo(f"{folder}/{name}", time.localtime(stat.modified)[:6])
+                    # Known up front, so zipfile picks ZIP64 for files over 4 GB
+                    info.file_size = stat.size
+                    with archive.open(info, "w") as target:
+                        while chunk := source.read(BUNDLE_CHUNK_SIZE):
+                            target.write(chunk)
+                            yield from sink.drain()
+                included.append(name)
+            yield from sink.drain()
+            writer.writerow([
+                row.application_id, row.candidate_id, row.candidate_name, row.status.value,
+                row.apply_date.isoformat() if row.apply_date else "", folder,
+                ";".join(included), ";".join(missing),
+            ])
+        # BOM so spreadsheet programs read the (Turkish) names as UTF-8
+        archive.writestr(MANIFEST_NAME, manifest.getvalue().encode("utf-8-sig"))
+    yield from sink.drain()
+
+
+def bundle_response(rows, filename: str) -> StreamingResponse:
+    """Stream the ZIP of rows as an attachment (generated in the thread pool)"""
+    return StreamingResponse(
+        bundle_chunks(rows),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,212 @@
+import mimetypes
+import os
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from starlette.responses import RedirectResponse, Response
+
+from app.models.document_blob import StorageTier
+from app.storage import storage
+from app.storage.tiering import open_cold
+
+# ASGI extension: the server hands the file descriptor to os.sendfile
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+# Chunk size of the fallback when the server has no zero-copy send
+READ_CHUNK_SIZE = 256 * 1024
+
+# Types a browser may render in place; anything else is sent as an attachment
+INLINE_TYPES = ("application/pdf", "image/png", "image/jpeg", "image/gif", "image/webp")
+
+_byte_range = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def has_descriptor(file) -> bool:
+    try:
+        file.fileno()
+    except (AttributeError, OSError):
+        return False
+    return True
+
+
+class FileRangeResponse(Response):
+    """Sends bytes [start, end] of an open file.
+
+    With the zerocopysend extension the kernel copies the file to the socket;
+    otherwise the file is read in chunks in the thread pool, so at most one
+    chunk is in Python memory. Streams without a file descriptor (remote
+    storage) are read sequentially. Closes the file when done.
+    """
+
+    def __init__(self, file, start: int, end: int, status_code: int, headers: dict):
+        super().__init__(status_code=status_code, headers=headers)
+        self.file = file
+        self.start = start
+        self.end = end
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            count = self.end - self.start + 1
+            if scope["method"] == "HEAD" or count <= 0:
+                await send({"type": "http.response.body", "body": b""})
+            elif not has_descriptor(self.file):
+                await self.send_stream(send, count)
+            elif ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+                await send({"type": ZEROCOPY_EXTENSION, "file": self.file, "offset": self.start, "count": count})
+            else:
+                await self.send_chunks(send, count)
+        finally:
+            await run_in_threadpool(self.file.close)
+
+    async def send_chunks(self, send, count: int):
+        offset = self.start
+        remaining = count
+        while remaining > 0:
+            chunk = await run_in_threadpool(os.pread, self.file.fileno(), min(READ_CHUNK_SIZE, remaining), offset)
+            # A truncated file ends the body early; the server sees the short Content-Length
+            remaining = remaining - len(chunk) if chunk else 0
+            offset += len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+
+    async def send_stream(self, send, count: int):
+        skip = self.start
+        while skip > 0:
+            skipped = await run_in_threadpool(self.file.read, min(READ_CHUNK_SIZE, skip))
+            skip = skip - len(skipped) if skipped else 0
+        remaining = count
+        while remaining > 0:
+            chunk = await run_in_threadpool(self.file.read, min(READ_CHUNK_SIZE, remaining))
+            remaining = remaining - len(chunk) if chunk else 0
+            await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+
+
+def parse_range(header: str, size: int) -> Optional[tuple]:
+    """(start, end) of a single "bytes=" range, None to send the whole file.
+
+    Multiple ranges and malformed headers are ignored (a full 200 is a valid
+    answer to both); a range past the end of the file is a 416.
+    """
+    match = _byte_range.fullmatch(header.strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if first:
+        start, end = int(first), int(last) if last else size - 1
+        if last and end < start:
+            return None
+    else:
+        suffix = int(last)
+        # "bytes=-0" asks for nothing, which can't be satisfied
+        start, end = (max(size - suffix, 0) if suffix else size), size - 1
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, min(end, size - 1)
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match check (weak comparison)"""
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def open_document(relative_path: str, tier: Optional[str] = None, size: Optional[int] = None):
+    """Open a stored document; (file, StoredObject) or 404.
+
+    Cold blobs (tier, with their original size) are decompressed while read.
+    """
+    try:
+        if tier == StorageTier.COLD:
+            return open_cold(relative_path, size)
+        return storage.open(relative_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+
+def document_response(
+    request: Request,
+    relative_path: str,
+    filename: str,
+    content_type: Optional[str] = None,
+    sha256: Optional[str] = None,
+    tier: Optional[str] = None,
+    size: Optional[int] = None,
+) -> Response:
+    """Serve a stored document with ETag, Last-Modified and single Range support.
+
+    Blobs are content-addressed, so their SHA-256 is a strong ETag; legacy
+    per-category files use mtime and size. When the storage can presign URLs
+    (S3) the client is redirected to the bucket instead, which then handles
+    ranges and revalidation itself. Cold blobs (tier, size of the blob row)
+    are always decompressed and sent by the API. Blocking (open/fstat,
+    presigning): call it from the thread pool in async handlers.
+    """
+    content_type = content_type or mimetypes.guess_type(relative_path)[0] or "application/octet-stream"
+    if not Path(filename).suffix:
+        filename += Path(relative_path).suffix or mimetypes.guess_extension(content_type) or ""
+
+    disposition = "inline" if content_type in INLINE_TYPES else "attachment"
+    content_disposition = f'{disposition}; filename="{filename}"'
+    url = None if tier == StorageTier.COLD else storage.presigned_url(relative_path, content_type, content_disposition)
+    if url is not None:
+        # The URL expires; the redirect itself must not be cached
+        return RedirectResponse(url, status_code=307, headers={"Cache-Control": "private, no-store"})
+
+    file, stat = open_document(relative_path, tier, size)
+    etag = f'"{sha256}"' if sha256 else f'"{int(stat.modified * 1e9):x}-{stat.size:x}"'
+    last_modified = format_datetime(datetime.fromtimestamp(stat.modified, timezone.utc), usegmt=True)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Accept-Ranges": "bytes",
+        # Personal documents: browsers may keep them, shared caches may not
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": content_disposition,
+        "X-Content-Type-Options": "nosniff",
+    }
+
+    try:
+        if not_modified(request, etag, stat.modified):
+            file.close()
+            return Response(status_code=304, headers=headers)
+
+        size = stat.size
+        byte_range = None
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        # If-Range: only honour the range while the client's copy is current
+        if range_header and (if_range is None or if_range.strip() in (etag, last_modified)):
+            byte_range = parse_range(range_header, size)
+    except BaseException:
+        file.close()
+        raise
+
+    headers["Content-Type"] = content_type
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return FileRangeResponse(file, 0, size - 1, 200, headers)
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return FileRangeResponse(file, start, end, 206, headers)
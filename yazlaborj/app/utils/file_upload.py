@@ -1,40 +1,296 @@
-import os
-import shutil
-from fastapi import UploadFile, HTTPException
-from pathlib import Path
-import uuid
-
-# Base directory for file uploads
-UPLOAD_DIR = Path("uploads")
-
-def create_upload_dir():
-    """Create upload directory if it doesn't exist"""
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-    for dir_name in ["cv", "diploma", "publications", "citations", "conferences"]:
-        os.makedirs(UPLOAD_DIR / dir_name, exist_ok=True)
-
-def save_upload_file(upload_file: UploadFile, directory: str) -> str:
-    """Save an upload file to the specified directory and return the file path"""
-    create_upload_dir()
-    
-    # Validate directory
-    if directory not in ["cv", "diploma", "publications", "citations", "conferences"]:
-        raise HTTPException(status_code=400, detail="Invalid directory")
-    
-    # Create a unique filename
-    file_extension = os.path.splitext(upload_file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    
-    # Full path to save the file
-    file_path = UPLOAD_DIR / directory / unique_filename
-    
-    # Save the file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
-    
-    # Return the relative path
-    return str(Path(directory) / unique_filename)
-
-def get_file_path(relative_path: str) -> Path:
-    """Get the full path for a file from its relative path"""
-    return UPLOAD_DIR / relative_path
+import asyncio
+import hashlib
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.config import settings
+from app.models.document_blob import DocumentBlob, StorageTier
+from app.storage import storage
+from app.utils.advisory_locks import blob_lock
+
+# Content-addressed documents: blobs/<sha[:2]>/<sha[2:4]>/<sha>
+BLOB_DIR = "blobs"
+
+DOCUMENT_CATEGORIES = ["cv", "diploma", "publications", "citations", "conferences"]
+
+# Parts are buffered up to this size before each (threaded) hash + write
+WRITE_BUFFER_SIZE = 1024 * 1024
+# Parts up to this size stay in memory until their hash is known, so a
+# re-upload of an existing document writes nothing to storage
+MEMORY_PART_SIZE = 8 * 1024 * 1024
+
+# Request body of the documents endpoints, for the OpenAPI docs (the body is
+# parsed by DocumentUploadReceiver, not by FastAPI's File parameters)
+DOCUMENTS_OPENAPI = {
+    "requestBody": {
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {name: {"type": "string", "format": "binary"} for name in DOCUMENT_CATEGORIES},
+                }
+            }
+        },
+        "required": True,
+    }
+}
+
+def blob_path(sha256: str) -> str:
+    """Storage key of the blob with the given hash (two levels of fan-out)"""
+    return f"{BLOB_DIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+def upload_limit(directory: str) -> int:
+    """Maximum size in bytes of a document in the given category"""
+    return settings.UPLOAD_LIMIT_MB[directory] * 1024 * 1024
+
+class DocumentPart:
+    """One file part, hashed while it streams in and stored as a blob.
+
+    Batches of WRITE_BUFFER_SIZE are hashed and written in the thread pool,
+    one batch in flight per part, so the parser keeps receiving while the
+    previous batch is on its way to storage. Small parts are kept in memory,
+    larger ones spill to a storage writer. Once the SHA-256 is known the
+    part is either dropped (the blob already exists) or committed under its
+    blob key.
+    """
+
+    def __init__(self, directory: str, content_type: str):
+        self.directory = directory
+        self.content_type = content_type
+        self.limit = upload_limit(directory)
+        self.digest = hashlib.sha256()
+        self.size = 0
+        # Chunks not yet handed to the thread pool, joined once per batch
+        self.pending = []
+        self.pending_size = 0
+        self.in_flight = None
+        # Batches of a part still in memory; touched only by _consume/_store,
+        # which never run concurrently
+        self.memory = []
+        self.memory_size = 0
+        self.writer = None
+        self.sha256 = None
+        self.relative_path = None
+        self.deduplicated = False
+        self.stored = False
+
+    async def write(self, data: bytes):
+        self.size += len(data)
+        if self.size > self.limit:
+            raise HTTPException(
+                status_code=413,
+                detail=f"{self.directory} exceeds the {settings.UPLOAD_LIMIT_MB[self.directory]} MB limit",
+            )
+        self.pending.append(data)
+        self.pending_size += len(data)
+        if self.pending_size >= WRITE_BUFFER_SIZE:
+            await self.submit()
+
+    async def submit(self):
+        data = b"".join(self.pending)
+        self.pending, self.pending_size = [], 0
+        # Back-pressure: wait for the previous batch before queueing the next
+        await self.settle()
+        self.in_flight = asyncio.ensure_future(run_in_threadpool(self._consume, data))
+
+    async def settle(self):
+        if self.in_flight is not None:
+            in_flight, self.in_flight = self.in_flight, None
+            await in_flight
+
+    def _consume(self, data: bytes):
+        self.digest.update(data)
+        if self.writer is None and self.memory_size + len(data) > MEMORY_PART_SIZE:
+            self.writer = storage.writer()
+            for chunk in self.memory:
+                self.writer.write(chunk)
+            self.memory = []
+        if self.writer is not None:
+            self.writer.write(data)
+        else:
+            self.memory.append(data)
+            self.memory_size += len(data)
+
+    async def close(self):
+        if self.pending:
+            await self.submit()
+        await self.settle()
+        self.sha256 = self.digest.hexdigest()
+        self.relative_path = blob_path(self.sha256)
+        await run_in_threadpool(self._store)
+
+    def _store(self):
+        # The collector can't remove the blob between the check and the touch
+        with blob_lock(self.relative_path):
+            if storage.exists(self.relative_path):
+                # Restart the collector's grace period: the row that will point
+                # at this blob isn't committed yet
+                storage.touch(self.relative_path)
+                self.deduplicated = True
+                self.stored = True
+                self.discard()
+                return
+            # Atomic in both cases: readers see either no blob or all of it
+            if self.writer is None:
+                storage.put(self.relative_path, self.memory)
+            else:
+                self.writer.commit(self.relative_path)
+                self.writer = None
+        self.stored = True
+        self.memory = []
+
+    def discard(self):
+        """Drop anything not yet stored as a blob"""
+        if self.writer is not None:
+            writer, self.writer = self.writer, None
+            writer.abort()
+        self.pending = []
+        self.memory = []
+
+class DocumentUploadReceiver:
+    """Streams a multipart/form-data body of documents straight to storage.
+
+    Each file part is hashed while the body arrives and stored once per
+    content, instead of being spooled by Starlette and copied. A finished
+    part is flushed and stored in the background while the next one is
+    received, so the request ends about when the body does. receive()
+    returns only once every part is stored; on any failure (e.g. a part
+    over its category limit, 413) the partial objects of all parts are
+    removed. Blobs already stored for the request are left for the garbage
+    collector (other rows may share them).
+    """
+
+    def __init__(self, request: Request):
+        self.request = request
+        self.saved = {}
+        self.events = []
+        self.header_field = b""
+        self.header_value = b""
+        self.headers = {}
+        self.part = None
+        self.parts = []
+        self.closing = []
+
+    # python-multipart callbacks (sync); handled in _process_events
+    def on_part_begin(self):
+        self.headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self.header_value += data[start:end]
+
+    def on_header_end(self):
+        self.headers[self.header_field.lower()] = self.header_value
+        self.header_field = b""
+        self.header_value = b""
+
+    def on_headers_finished(self):
+        self.events.append(("headers", self.headers))
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        self.events.append(("data", data[start:end]))
+
+    def on_part_end(self):
+        self.events.append(("end", None))
+
+    def check_content_length(self):
+        content_length = self.request.headers.get("content-length")
+        # Multipart framing is small; anything beyond all limits plus 1 MB can't be valid
+        max_body = sum(upload_limit(name) for name in DOCUMENT_CATEGORIES) + 1024 * 1024
+        if content_length and content_length.isdigit() and int(content_length) > max_body:
+            raise HTTPException(status_code=413, detail="Request body too large")
+
+    async def receive(self) -> dict:
+        """Returns {category: DocumentPart} of the stored documents"""
+        content_type, params = parse_options_header(self.request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise HTTPException(status_code=400, detail="Expected multipart/form-data")
+        self.check_content_length()
+
+        parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        })
+        try:
+            async for chunk in self.request.stream():
+                parser.write(chunk)
+                await self._process_events()
+            parser.finalize()
+            await self._process_events()
+            # Every part must be stored before the caller touches the database
+            for closing in self.closing:
+                await closing
+        except BaseException:
+            await self.rollback()
+            raise
+        return self.saved
+
+    async def rollback(self):
+        """Let the threaded writes finish, then remove every partial object"""
+        pending = self.closing + [part.in_flight for part in self.parts if part.in_flight is not None]
+        await asyncio.gather(*pending, return_exceptions=True)
+        unstored = [part for part in self.parts if not part.stored]
+        if unstored:
+            await run_in_threadpool(lambda: [part.discard() for part in unstored])
+
+    async def _process_events(self):
+        events, self.events = self.events, []
+        for kind, value in events:
+            if kind == "headers":
+                self.part = self._start_part(value)
+                if self.part is not None:
+                    self.parts.append(self.part)
+            elif kind == "data" and self.part is not None:
+                await self.part.write(value)
+            elif kind == "end" and self.part is not None:
+                # Flush and store in the background while the next part arrives
+                self.closing.append(asyncio.ensure_future(self.part.close()))
+                # The same field twice: the last file wins
+                self.saved[self.part.directory] = self.part
+                self.part = None
+
+    def _start_part(self, headers: dict):
+        _, options = parse_options_header(headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        filename = options.get(b"filename", b"").decode("utf-8", "replace")
+        if name not in DOCUMENT_CATEGORIES:
+            raise HTTPException(status_code=400, detail="Invalid directory")
+        # Empty file inputs are sent without a filename; treat them as not provided
+        if not filename:
+            return None
+        content_type = headers.get(b"content-type", b"application/octet-stream").decode("latin-1")
+        return DocumentPart(name, content_type)
+
+async def receive_documents(request: Request) -> dict:
+    """Store the documents of a multipart request; {category: DocumentPart}"""
+    return await DocumentUploadReceiver(request).receive()
+
+def insert_blobs_statement(dialect_name: str, documents: dict):
+    """INSERT of the document_blobs rows, skipping blobs that are already known.
+
+    Runs in the same transaction that points the application columns at the
+    blobs; the Application mapper events then take the references. A known
+    blob that was moved to the cold tier is HOT again: the upload has just
+    stored it in the hot storage.
+    """
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    # One row per blob: DO UPDATE may not touch the same row twice in one statement
+    parts = {part.sha256: part for part in documents.values()}.values()
+    return insert(DocumentBlob).values([
+        {"sha256": part.sha256, "path": part.relative_path, "size": part.size, "content_type": part.content_type}
+        for part in parts
+    ]).on_conflict_do_update(
+        index_elements=["sha256"],
+        set_={"tier": StorageTier.HOT, "compressed_size": None, "updated_at": func.now()},
+        where=DocumentBlob.tier != StorageTier.HOT,
+    )
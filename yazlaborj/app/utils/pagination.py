@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Response
+from sqlalchemy import bindparam, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# Response header carrying the opaque cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class keyset_timestamp(FunctionElement):
+    """A timestamp as keyset pagination orders and compares it.
+
+    SQLite stores timestamps as text in whatever format they were written
+    with: CURRENT_TIMESTAMP defaults have whole seconds, while bound
+    datetimes get six fractional digits, so the same instant compares as
+    different strings. There both the column and the cursor go through
+    julianday(), which gives equal values for equal instants. Elsewhere
+    the column is used as is (and ordered by its index).
+    """
+    inherit_cache = True
+    name = "keyset_timestamp"
+
+    def __init__(self, timestamp):
+        super().__init__(timestamp)
+        self.type = timestamp.type
+
+@compiles(keyset_timestamp)
+def _compile_keyset_timestamp(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+@compiles(keyset_timestamp, "sqlite")
+def _compile_keyset_timestamp_sqlite(element, compiler, **kw):
+    return f"julianday({compiler.process(element.clauses, **kw)})"
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    payload = json.dumps([timestamp.isoformat() if timestamp else None, row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def paginate(query, timestamp_column, id_column, skip: int, limit: int, cursor: Optional[str]):
+    """Order by (timestamp, id) and apply either the cursor or skip.
+
+    Works for both Query (sync routers) and Select (async routers). One extra
+    row is fetched so that next_page() can tell whether another page exists.
+    """
+    ordered_timestamp = keyset_timestamp(timestamp_column)
+    query = query.order_by(ordered_timestamp, id_column)
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(ordered_timestamp, id_column) > tuple_(
+            keyset_timestamp(bindparam("cursor_ts", timestamp, type_=timestamp_column.type)),
+            bindparam("cursor_id", row_id, type_=id_column.type),
+        ))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit + 1)
+
+def next_page(rows, limit: int, key, response: Response):
+    """Trim the look-ahead row and expose the next cursor as a header"""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return rows
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import multiprocessing
+import statistics
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Password hashing; hashes with a different cost report needs_update()
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+
+# Run inside the pool's worker processes
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+def _verify_and_update(password: str, hashed_password: str):
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """bcrypt on a small process pool with a bounded number of pending jobs.
+
+    Hashing never holds the GIL of the serving process, and at most
+    max_pending requests wait for it; beyond that callers get a 503 instead
+    of queueing. Workers are spawned (not forked) so they don't inherit the
+    server's threads and locks.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.executor = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        # Observed verify latency (queue wait included), used by fake_verify_async;
+        # starts from a guess and follows the real verifies
+        self.verify_seconds = 0.25
+
+    def start(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+        return self.executor
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _done(self, future: Future, fn, started: float):
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.pending -= 1
+            self.completed += 1
+            if fn is not _hash and not future.cancelled() and future.exception() is None:
+                self.verify_seconds = 0.8 * self.verify_seconds + 0.2 * elapsed
+
+    def _submit(self, fn, *args) -> Future:
+        with self.lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                full = True
+            else:
+                self.pending += 1
+                full = False
+        if full:
+            logger.warning(f"Password hash queue full ({self.max_pending} pending), shedding request")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again",
+                headers={"Retry-After": "1"},
+            )
+        started = time.perf_counter()
+        try:
+            future = self.start().submit(fn, *args)
+        except Exception:
+            with self.lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(lambda done: self._done(done, fn, started))
+        return future
+
+    # Sync routers: the request thread waits, but only max_pending of them can
+    def hash(self, password: str) -> str:
+        return self._submit(_hash, password).result()
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self._submit(_verify, password, hashed_password).result()
+
+    def verify_and_update(self, password: str, hashed_password: str):
+        """(valid, new_hash); new_hash is set when the stored cost is outdated"""
+        return self._submit(_verify_and_update, password, hashed_password).result()
+
+    # Async routers: awaited without occupying a thread
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hash, password))
+
+    async def verify_async(self, password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(_verify, password, hashed_password))
+
+    async def verify_and_update_async(self, password: str, hashed_password: str):
+        return await asyncio.wrap_future(self._submit(_verify_and_update, password, hashed_password))
+
+    async def fake_verify_async(self):
+        """Stand-in for verify when the user doesn't exist.
+
+        Takes as long as a real verify, so response times don't reveal which
+        identifiers exist, but spends no CPU on a hash and holds no thread
+        (both login routers await it).
+        """
+        await asyncio.sleep(self.verify_seconds)
+        return False, None
+
+    def status(self) -> dict:
+        with self.lock:
+            return {
+                "workers": self.workers,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "verify_ms": round(self.verify_seconds * 1000, 1),
+            }
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE)
+
+
+# Cost calibration (manage.py calibrate-bcrypt, benchmarks/bench_password_cost.py)
+
+MIN_BCRYPT_ROUNDS = 10
+
+def measure_hash_time(rounds: int, samples: int = 3) -> float:
+    """Median seconds for one bcrypt hash at the given cost on this machine"""
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.hash("calibration-password")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def calibrate_rounds(target_ms: float, max_rounds: int = 16, samples: int = 3):
+    """Highest cost whose hash time stays within target_ms (never below 10).
+
+    Returns (rounds, {rounds: milliseconds}). Each extra round doubles the
+    time, so measuring stops at the first cost over the budget.
+    """
+    timings = {}
+    chosen = MIN_BCRYPT_ROUNDS
+    for rounds in range(MIN_BCRYPT_ROUNDS, max_rounds + 1):
+        timings[rounds] = measure_hash_time(rounds, samples) * 1000
+        if timings[rounds] > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
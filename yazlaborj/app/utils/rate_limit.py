@@ -0,0 +1,119 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+
+
+class MemoryBucketStore:
+    """Token buckets in process memory; each worker limits on its own"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+        self.buckets = OrderedDict()
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        """Take one token; returns 0 on success, else seconds until one is available"""
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate
+            self.buckets[key] = (tokens, now)
+            self.buckets.move_to_end(key)
+            # Least recently used buckets are the ones that have refilled the longest
+            while len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return wait
+
+
+# Same algorithm as MemoryBucketStore.take, atomically on the Redis server
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """Token buckets shared by every worker through Redis (needs the redis package)"""
+
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.script = self.client.register_script(TAKE_SCRIPT)
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        return float(self.script(keys=[f"login_throttle:{key}"], args=[capacity, rate, time.time()]))
+
+
+class LoginThrottle:
+    """Per client IP and per login identifier token buckets for /login and /token.
+
+    Every attempt takes a token from both buckets, whether the password is
+    right or not, so a client can't burn CPU on bcrypt faster than the
+    refill rate. Rejections are a 429 raised before any query or hash.
+    """
+
+    def __init__(self):
+        self.store = None
+
+    def get_store(self):
+        if self.store is None:
+            if settings.RATE_LIMIT_BACKEND == "redis":
+                self.store = RedisBucketStore(settings.RATE_LIMIT_REDIS_URL)
+            else:
+                self.store = MemoryBucketStore(settings.RATE_LIMIT_MAX_KEYS)
+        return self.store
+
+    def check(self, request: Request, identifier: str):
+        if not settings.LOGIN_RATE_LIMIT:
+            return
+        store = self.get_store()
+        client_ip = request.client.host if request.client else "unknown"
+        wait = store.take(
+            f"ip:{client_ip}", settings.LOGIN_IP_BUCKET_SIZE, settings.LOGIN_IP_REFILL_PER_MINUTE / 60
+        )
+        if not wait:
+            wait = store.take(
+                f"id:{identifier.strip().lower()}", settings.LOGIN_ID_BUCKET_SIZE, settings.LOGIN_ID_REFILL_PER_MINUTE / 60
+            )
+        if wait:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please try again later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+    async def check_async(self, request: Request, identifier: str):
+        # Redis calls are blocking I/O; memory buckets are cheap enough inline
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            await run_in_threadpool(self.check, request, identifier)
+        else:
+            self.check(request, identifier)
+
+
+login_throttle = LoginThrottle()
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.token_revocation import TokenRevocation
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """Per-worker copy of token_revocations: user id -> revocation time (epoch seconds).
+
+    Only revocations younger than the claims token lifetime are kept; older
+    ones can't match a token that is still valid.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.revoked = {}
+        self.loaded_at: Optional[float] = None
+
+    def is_fresh(self) -> bool:
+        """False until the first load, or when refreshes have been failing"""
+        if self.loaded_at is None:
+            return False
+        return time.monotonic() - self.loaded_at < settings.REVOCATION_REFRESH_SECONDS * 3
+
+    def is_revoked(self, user_id: int, issued_at: float) -> bool:
+        revoked_at = self.revoked.get(user_id)
+        return revoked_at is not None and issued_at <= revoked_at
+
+    def add(self, user_id: int, revoked_at: float):
+        with self.lock:
+            self.revoked[user_id] = max(revoked_at, self.revoked.get(user_id, 0))
+
+    def replace(self, entries: dict, cutoff: float):
+        with self.lock:
+            # Keep local revocations that committed after the snapshot was read
+            for user_id, revoked_at in self.revoked.items():
+                if revoked_at > max(cutoff, entries.get(user_id, 0)):
+                    entries[user_id] = revoked_at
+            self.revoked = entries
+            self.loaded_at = time.monotonic()
+
+
+revocations = RevocationList()
+
+
+def load_revocations(db: Session) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=settings.CLAIMS_TOKEN_EXPIRE_MINUTES)
+    rows = db.execute(
+        select(TokenRevocation.user_id, TokenRevocation.revoked_at).where(TokenRevocation.revoked_at > cutoff)
+    ).all()
+    revocations.replace({row.user_id: row.revoked_at.timestamp() for row in rows}, cutoff.timestamp())
+    return len(rows)
+
+
+def refresh_revocations():
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        load_revocations(db)
+    finally:
+        db.close()
+
+
+async def refresh_revocations_forever():
+    """Lifespan task of AUTH_MODE=claims: reload the list every few seconds"""
+    while True:
+        await asyncio.sleep(settings.REVOCATION_REFRESH_SECONDS)
+        try:
+            await run_in_threadpool(refresh_revocations)
+        except Exception:
+            logger.exception("Token revocation list refresh failed")
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_revocations(session):
+    for user_id, revoked_at in session.info.pop("revoked_users", {}).items():
+        revocations.add(user_id, revoked_at.timestamp())
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_revocations(session):
+    session.info.pop("revoked_users", None)
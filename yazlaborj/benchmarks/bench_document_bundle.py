@@ -0,0 +1,76 @@
+"""Peak memory of streaming a listing's documents as one ZIP.
+
+Builds a bundle of --applications applications with a --size-mb publication
+PDF each through app.utils.document_bundle.bundle_chunks and reports the
+time, the archive size and the peak Python memory (tracemalloc), which
+should stay around one read chunk whatever the total size. The archive is
+written to --output when given (to check it with unzip -t), else discarded.
+
+    python benchmarks/bench_document_bundle.py --applications 20 --size-mb 50
+
+Files are written to the local storage backend, under a temporary directory
+that is removed afterwards.
+"""
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.application import ApplicationStatus
+from app.storage import storage
+from app.utils import file_upload
+from app.utils.document_bundle import bundle_chunks
+
+def make_rows(count: int, size: int):
+    rows = []
+    for application_id in range(1, count + 1):
+        path = f"publications/{application_id}.pdf"
+        storage.put(path, [b"%PDF-1.4\n", os.urandom(size - 9)])
+        row = {f"{kind}_path": None for kind in file_upload.DOCUMENT_CATEGORIES}
+        for column in ("content_type", "tier", "size"):
+            row.update({f"{kind}_{column}": None for kind in file_upload.DOCUMENT_CATEGORIES})
+        row.update(
+            application_id=application_id, candidate_id=application_id, candidate_name=f"Aday {application_id}",
+            status=ApplicationStatus.PENDING, apply_date=datetime.datetime.now(datetime.timezone.utc),
+            publications_path=path,
+        )
+        rows.append(SimpleNamespace(**row))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applications", type=int, default=20)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage.root = Path(directory)
+        rows = make_rows(args.applications, args.size_mb * 1024 * 1024)
+        output = open(args.output, "wb") if args.output else None
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        total = 0
+        for chunk in bundle_chunks(rows):
+            total += len(chunk)
+            if output:
+                output.write(chunk)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if output:
+            output.close()
+
+    print(f"{total / 1024 / 1024:.1f} MB archive in {seconds:.2f} s "
+          f"({total / seconds / 1024 / 1024:.0f} MB/s), peak {peak / 1024 / 1024:.2f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Serving a 100 MB publication PDF: reading it into a Response versus document_response.
+
+Sends the same file to a no-op ASGI send through
+  * a plain Response(content=file.read()), the simplest way to serve a
+    stored document, and
+  * app.utils.file_download.document_response, in chunks (no zero-copy
+    extension) and with the zerocopysend extension, where the server would
+    hand the descriptor to os.sendfile.
+
+Reports the median time and the peak Python memory (tracemalloc) per send.
+
+    python benchmarks/bench_document_download.py --size-mb 100 --repeat 5
+
+The file is written to the local storage backend, under a temporary
+directory that is removed afterwards.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.storage import storage
+from app.utils.file_download import document_response, ZEROCOPY_EXTENSION
+
+RELATIVE_PATH = "publications/bench.pdf"
+
+def make_request(extensions: dict) -> Request:
+    return Request({"type": "http", "method": "GET", "headers": [], "extensions": extensions})
+
+async def send(message):
+    pass
+
+def read_into_memory(request: Request) -> Response:
+    with open(storage.path(RELATIVE_PATH), "rb") as file:
+        return Response(file.read(), media_type="application/pdf")
+
+def run(name, build, extensions: dict, repeat: int):
+    timings = []
+    peaks = []
+    for _ in range(repeat):
+        request = make_request(extensions)
+        tracemalloc.start()
+        start = time.perf_counter()
+        response = build(request)
+        asyncio.run(response(request.scope, None, send))
+        timings.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    seconds = statistics.median(timings)
+    print(f"{name:<32} {seconds * 1000:>9.1f} ms {max(peaks) / 1024 / 1024:>9.1f} MB peak")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage.root = Path(directory)
+        storage.put(RELATIVE_PATH, [b"%PDF-1.4\n", os.urandom(args.size_mb * 1024 * 1024)])
+
+        serve = lambda request: document_response(request, RELATIVE_PATH, "publications")
+        run("read into Response", read_into_memory, {}, args.repeat)
+        run("document_response, chunked", serve, {}, args.repeat)
+        run("document_response, zerocopysend", serve, {ZEROCOPY_EXTENSION: {}}, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Upload throughput of 50 MB publication PDFs: spooled form parsing versus streaming.
+
+Feeds the same multipart body, in 64 KB receive() chunks like an ASGI server
+would, through
+  * the previous path: Starlette's form parser (SpooledTemporaryFile, which
+    rolls over to disk after 1 MB) followed by shutil.copyfileobj, and
+  * app.utils.file_upload.receive_documents, which hashes while streaming
+    and stores each content once, for new content and for a re-upload of a
+    document that is already stored, and for all five documents in one
+    request.
+
+"tail" is the time from the last body chunk to the end of the upload: what
+the client waits for once everything is sent. --link-mb-s paces the chunks
+like a client on a link of that speed (chunk i is available at i * CHUNK /
+speed, whether or not the handler was busy), 0 feeds them as fast as they
+are read.
+
+    python benchmarks/bench_document_upload.py --size-mb 50 --repeat 5
+
+Files are written to the local storage backend, under a temporary directory
+that is removed afterwards.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.requests import Request
+
+from app.config import settings
+from app.storage import storage
+from app.utils import file_upload
+
+BOUNDARY = "benchmarkboundary"
+CHUNK = 64 * 1024
+
+# Sizes in MB of the five-document request (publications gets --size-mb)
+FIVE_DOCUMENTS_MB = {"cv": 5, "diploma": 5, "citations": 15, "conferences": 30}
+
+def multipart_body(size: int, sizes: dict = None) -> bytes:
+    body = b""
+    for name, part_size in (sizes or {"publications": size}).items():
+        payload = b"%PDF-1.4\n" + os.urandom(part_size - 9)
+        body += (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="{name}"; filename="{name}.pdf"\r\n'
+            "Content-Type: application/pdf\r\n\r\n"
+        ).encode() + payload + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+last_chunk_at = 0.0
+link_speed = 0
+
+def make_request(body: bytes) -> Request:
+    chunks = [body[i:i + CHUNK] for i in range(0, len(body), CHUNK)]
+    started = time.perf_counter()
+    sent = 0
+
+    async def receive():
+        global last_chunk_at
+        nonlocal sent
+        if chunks:
+            chunk = chunks.pop(0)
+            if link_speed:
+                sent += len(chunk)
+                await asyncio.sleep(max(0.0, started + sent / link_speed - time.perf_counter()))
+            last_chunk_at = time.perf_counter()
+            return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+        return {"type": "http.disconnect"}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [
+            (b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode()),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }
+    return Request(scope, receive)
+
+async def spooled_upload(body: bytes):
+    # What File(...) parameters plus the old save_upload_file did
+    form = await make_request(body).form()
+    upload = form["publications"]
+    path = storage.root / "publications" / f"{uuid.uuid4()}.pdf"
+    with open(path, "wb") as buffer:
+        shutil.copyfileobj(upload.file, buffer)
+    await form.close()
+
+async def streaming_upload(body: bytes):
+    await file_upload.receive_documents(make_request(body))
+
+def disk_usage() -> int:
+    return sum(
+        os.path.getsize(os.path.join(directory, name))
+        for directory, _, names in os.walk(storage.root) for name in names
+    )
+
+def run(name, upload, make_body, repeat: int):
+    timings = []
+    tails = []
+    used = disk_usage()
+    for _ in range(repeat):
+        body = make_body()
+        start = time.perf_counter()
+        asyncio.run(upload(body))
+        end = time.perf_counter()
+        timings.append(end - start)
+        tails.append(end - last_chunk_at)
+    seconds = statistics.median(timings)
+    tail = statistics.median(tails)
+    stored = (disk_usage() - used) / repeat / 1024 / 1024
+    print(f"{name:<30} {seconds * 1000:>9.1f} ms {len(body) / seconds / 1024 / 1024:>9.1f} MB/s "
+          f"{tail * 1000:>7.1f} ms tail {stored:>8.1f} MB stored/upload")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--link-mb-s", type=float, default=0)
+    args = parser.parse_args()
+
+    global link_speed
+    link_speed = args.link_mb_s * 1024 * 1024
+    settings.UPLOAD_LIMIT_MB["publications"] = max(settings.UPLOAD_LIMIT_MB["publications"], args.size_mb + 1)
+    size = args.size_mb * 1024 * 1024
+    body = multipart_body(size)
+    with tempfile.TemporaryDirectory() as directory:
+        storage.root = Path(directory)
+        os.makedirs(storage.root / "publications", exist_ok=True)
+        run("spooled + copyfileobj", spooled_upload, lambda: body, args.repeat)
+        run("streaming, new content", streaming_upload, lambda: multipart_body(size), args.repeat)
+        asyncio.run(streaming_upload(body))
+        run("streaming, re-upload", streaming_upload, lambda: body, args.repeat)
+        sizes = {name: mb * 1024 * 1024 for name, mb in FIVE_DOCUMENTS_MB.items()}
+        sizes["publications"] = size
+        run("streaming, five documents", streaming_upload, lambda: multipart_body(size, sizes), args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Login throughput per core at each bcrypt cost.
+
+A login costs one bcrypt verify, so 1 / (verify time) is the number of
+logins a single core can serve per second. The table also shows how many
+logins per second the PASSWORD_HASH_WORKERS pool sustains when each worker
+gets its own core.
+
+    python benchmarks/bench_password_cost.py --min-rounds 10 --max-rounds 14
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passlib.context import CryptContext
+
+from app.config import settings
+
+def bench_verify(rounds: int, repeat: int) -> float:
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    hashed = context.hash("benchmark-password")
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        context.verify("benchmark-password", hashed)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=14)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    args = parser.parse_args()
+
+    print(f"cpu cores: {os.cpu_count()}  configured BCRYPT_ROUNDS: {settings.BCRYPT_ROUNDS}")
+    print(f"{'rounds':>6} {'ms/verify':>10} {'login/s/core':>13} {f'login/s x{args.workers}':>14}")
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        seconds = bench_verify(rounds, args.repeat)
+        per_core = 1 / seconds
+        print(f"{rounds:>6} {seconds * 1000:>10.1f} {per_core:>13.1f} {per_core * args.workers:>14.1f}")
+
+if __name__ == "__main__":
+    main()
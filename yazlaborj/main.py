@@ -1,12 +1,28 @@
 import uvicorn
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 import logging
 
-from app.database import engine, get_db, Base
-from app.routers import auth, users, listings, applications, evaluations, jury, criteria
+from app import database
 from app.config import settings
+from app.migrations.runner import MigrationRunner
+from app.services.document_gc import collect_documents_forever
+from app.services.document_text import text_extractor
+from app.services.document_tiering import tier_documents_forever
+from app.utils.db_instrumentation import DBQueryStatsMiddleware, setup_slow_query_log, QUERY_COUNT_HEADER, QUERY_TIME_HEADER
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.passwords import password_hasher
+from app.utils.revocation import refresh_revocations, refresh_revocations_forever
+
+# DB_ASYNC ayarına göre senkron veya async router'ları seç
+if settings.DB_ASYNC:
+    from app.routers.aio import auth, users, listings, applications, evaluations, jury, criteria, admin
+else:
+    from app.routers import auth, users, listings, applications, evaluations, jury, criteria, admin
 
 # Loglama ayarları
 logging.basicConfig(
@@ -14,19 +30,57 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
+setup_slow_query_log()
 
-# Create database tables
-try:
-    logger.info("Veritabanı tabloları oluşturuluyor...")
-    Base.metadata.create_all(bind=engine)
-    logger.info("Veritabanı tabloları başarıyla oluşturuldu.")
-except Exception as e:
-    logger.error(f"Veritabanı tabloları oluşturulurken hata: {e}")
+def check_schema():
+    runner = MigrationRunner(database.engine)
+    if settings.DB_AUTO_MIGRATE:
+        logger.info("Veritabanı migration'ları uygulanıyor...")
+        applied = runner.upgrade()
+        logger.info(f"{len(applied)} migration uygulandı.")
+        return
+    pending = runner.pending()
+    if pending:
+        logger.warning(f"Bekleyen migration'lar var: {pending}. `python manage.py migrate` çalıştırın.")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Bağlantı ve şema kontrolü import sırasında değil, uygulama başlarken yapılır
+    await run_in_threadpool(database.init_db)
+    await run_in_threadpool(check_schema)
+    # bcrypt süreç havuzu
+    password_hasher.start()
+    # PDF metin çıkarma süreç havuzu (DOCUMENT_TEXT_EXTRACTION açıksa ve pypdf kuruluysa)
+    text_extractor.start()
+    # claims modunda token iptal listesi yüklenir ve arka planda yenilenir
+    refresher = None
+    if settings.AUTH_MODE == "claims":
+        await run_in_threadpool(refresh_revocations)
+        refresher = asyncio.create_task(refresh_revocations_forever())
+    # Yetim belge toplayıcı (DOCUMENT_GC_INTERVAL_HOURS > 0 ise)
+    collector = None
+    if settings.DOCUMENT_GC_INTERVAL_HOURS > 0:
+        collector = asyncio.create_task(collect_documents_forever())
+    # Kapanmış ilanların belgelerini soğuk katmana taşıma (DOCUMENT_TIERING_INTERVAL_HOURS > 0 ise)
+    tiering = None
+    if settings.DOCUMENT_TIERING_INTERVAL_HOURS > 0:
+        tiering = asyncio.create_task(tier_documents_forever())
+    yield
+    if refresher is not None:
+        refresher.cancel()
+    if collector is not None:
+        collector.cancel()
+    if tiering is not None:
+        tiering.cancel()
+    password_hasher.shutdown()
+    text_extractor.shutdown()
+    await database.dispose_db()
 
 app = FastAPI(
   title="Academic Personnel Application System API",
   description="API for managing academic personnel applications",
-  version="1.0.0"
+  version="1.0.0",
+  lifespan=lifespan
 )
 
 # Configure CORS
@@ -43,8 +97,16 @@ app.add_middleware(
   allow_credentials=True,
   allow_methods=["*"],
   allow_headers=["*"],
+  expose_headers=[
+    NEXT_CURSOR_HEADER, QUERY_COUNT_HEADER, QUERY_TIME_HEADER,
+    # Belge indirme: PDF görüntüleyicilerin parça parça okuyabilmesi için
+    "Accept-Ranges", "Content-Range", "Content-Disposition", "ETag",
+  ],
 )
 
+# İstek başına SQL sayısı/süresi ve N+1 kontrolü
+app.add_middleware(DBQueryStatsMiddleware)
+
 # Include routers
 try:
     logger.info("Router'lar ekleniyor...")
@@ -56,6 +118,7 @@ try:
     app.include_router(jury.router, tags=["Jury"], prefix="/api/jury")
     app.include_router(criteria.router, tags=["Criteria"], prefix="/api/criteria")
     app.include_router(jury.router, prefix="/api/jury", tags=["jury"])
+    app.include_router(admin.router, tags=["Admin"], prefix="/api/admin")
     logger.info("Router'lar başarıyla eklendi.")
 except Exception as e:
     logger.error(f"Router'lar eklenirken hata: {e}")
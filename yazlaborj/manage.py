@@ -0,0 +1,178 @@
+import argparse
+import json
+import logging
+
+from app import database
+from app.migrations.runner import MigrationRunner
+from app.models.token_revocation import revoke_user_tokens
+from app.services.document_gc import collect_documents
+from app.services.document_text import extract_documents, extraction_available
+from app.services.document_tiering import tier_documents
+from app.services.listing_counts import recount_applications
+from app.utils.advisory_locks import job_lock, DOCUMENT_GC_LOCK_KEY, DOCUMENT_TIERING_LOCK_KEY
+from app.utils.passwords import calibrate_rounds
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("manage")
+
+def cmd_migrate(args):
+    runner = MigrationRunner(database.init_db())
+    applied = runner.upgrade(target=args.to)
+    logger.info(f"{len(applied)} migration uygulandı")
+
+def cmd_downgrade(args):
+    runner = MigrationRunner(database.init_db())
+    reverted = runner.downgrade(target=args.to)
+    logger.info(f"{len(reverted)} migration geri alındı")
+
+def cmd_showmigrations(args):
+    runner = MigrationRunner(database.init_db())
+    for migration, applied in runner.status():
+        mark = "X" if applied else " "
+        print(f"[{mark}] {migration.version:04d} {migration.name} - {migration.description}")
+
+def cmd_recount_applications(args):
+    database.init_db()
+    db = database.SessionLocal()
+    try:
+        fixed = recount_applications(db)
+    finally:
+        db.close()
+    logger.info(f"{fixed} ilanın başvuru sayısı düzeltildi")
+
+def cmd_collect_documents(args):
+    database.init_db()
+    # API worker'larındaki toplayıcıyla aynı anda çalışmaz
+    with job_lock(DOCUMENT_GC_LOCK_KEY) as acquired:
+        if not acquired:
+            raise SystemExit("Başka bir süreç belge toplama çalıştırıyor, daha sonra tekrar deneyin")
+        db = database.SessionLocal()
+        try:
+            report = collect_documents(
+                db,
+                dry_run=args.dry_run,
+                grace_minutes=args.grace_minutes,
+                batch_size=args.batch_size,
+                pause=args.pause,
+            )
+        finally:
+            db.close()
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.as_dict(), f, ensure_ascii=False, indent=2)
+    elif args.dry_run:
+        for orphan in report.orphans:
+            print(f"{orphan['size']:>12}  {orphan['modified']}  {orphan['path']}")
+    for error in report.errors:
+        logger.error(error)
+    logger.info(("[dry-run] " if args.dry_run else "") + report.summary())
+
+def cmd_tier_documents(args):
+    database.init_db()
+    # API worker'larındaki taşıma göreviyle aynı anda çalışmaz
+    with job_lock(DOCUMENT_TIERING_LOCK_KEY) as acquired:
+        if not acquired:
+            raise SystemExit("Başka bir süreç belgeleri soğuk katmana taşıyor, daha sonra tekrar deneyin")
+        db = database.SessionLocal()
+        try:
+            report = tier_documents(
+                db,
+                dry_run=args.dry_run,
+                batch_size=args.batch_size,
+                pause=args.pause,
+                level=args.level,
+            )
+        finally:
+            db.close()
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.as_dict(), f, ensure_ascii=False, indent=2)
+    elif args.dry_run:
+        for candidate in report.candidates:
+            print(f"{candidate['size']:>12}  {candidate['path']}")
+    for error in report.errors:
+        logger.error(error)
+    logger.info(("[dry-run] " if args.dry_run else "") + report.summary())
+
+def cmd_extract_documents(args):
+    if not extraction_available():
+        raise SystemExit("pypdf paketi kurulu değil: pip install -r requirements.txt")
+    database.init_db()
+    db = database.SessionLocal()
+    try:
+        report = extract_documents(db, limit=args.limit, workers=args.workers)
+    finally:
+        db.close()
+    logger.info(report.summary())
+
+def cmd_revoke_tokens(args):
+    engine = database.init_db()
+    with engine.begin() as connection:
+        revoke_user_tokens(connection, args.user_id)
+    logger.info(f"{args.user_id} numaralı kullanıcının token'ları iptal edildi")
+
+def cmd_calibrate_bcrypt(args):
+    rounds, timings = calibrate_rounds(args.target_ms, max_rounds=args.max_rounds)
+    for cost, ms in timings.items():
+        print(f"rounds={cost:2d}  {ms:8.1f} ms/hash  {1000 / ms:6.1f} login/s/çekirdek")
+    if timings[rounds] > args.target_ms:
+        logger.warning(f"En düşük önerilen maliyet bile {args.target_ms} ms hedefini aşıyor")
+    print(f"BCRYPT_ROUNDS={rounds}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Academic Personnel Application System yönetim komutları")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate = subparsers.add_parser("migrate", help="Bekleyen migration'ları uygula")
+    migrate.add_argument("--to", type=int, default=None, help="Bu sürüme kadar uygula")
+    migrate.set_defaults(func=cmd_migrate)
+
+    downgrade = subparsers.add_parser("downgrade", help="Migration'ları verilen sürüme kadar geri al")
+    downgrade.add_argument("--to", type=int, required=True, help="Kalınacak sürüm (0: hepsini geri al)")
+    downgrade.set_defaults(func=cmd_downgrade)
+
+    showmigrations = subparsers.add_parser("showmigrations", help="Migration durumlarını listele")
+    showmigrations.set_defaults(func=cmd_showmigrations)
+
+    recount = subparsers.add_parser("recount-applications", help="listings.applications_count değerlerini yeniden hesapla")
+    recount.set_defaults(func=cmd_recount_applications)
+
+    collect = subparsers.add_parser("collect-documents", help="Hiçbir başvurunun göstermediği yüklenmiş dosyaları sil")
+    collect.add_argument("--dry-run", action="store_true", help="Hiçbir şey silme, sadece raporla")
+    collect.add_argument("--report", help="Ayrıntılı raporu bu JSON dosyasına yaz")
+    collect.add_argument("--grace-minutes", type=int, default=None, help="Bu süreden yeni dosyalara dokunma")
+    collect.add_argument("--batch-size", type=int, default=None, help="Bir seferde silinecek dosya sayısı")
+    collect.add_argument("--pause", type=float, default=None, help="Silme grupları arası bekleme (saniye)")
+    collect.set_defaults(func=cmd_collect_documents)
+
+    tier = subparsers.add_parser("tier-documents", help="Kapanmış ilanların belgelerini sıkıştırıp soğuk katmana taşı")
+    tier.add_argument("--dry-run", action="store_true", help="Hiçbir şey taşıma, sadece raporla")
+    tier.add_argument("--report", help="Ayrıntılı raporu bu JSON dosyasına yaz")
+    tier.add_argument("--batch-size", type=int, default=None, help="Bir seferde taşınacak belge sayısı")
+    tier.add_argument("--pause", type=float, default=None, help="Gruplar arası bekleme (saniye)")
+    tier.add_argument("--level", type=int, default=None, help="zstd sıkıştırma seviyesi")
+    tier.set_defaults(func=cmd_tier_documents)
+
+    extract = subparsers.add_parser("extract-documents", help="Metni henüz çıkarılmamış PDF belgelerin metnini çıkar")
+    extract.add_argument("--limit", type=int, default=None, help="En fazla bu kadar belge işle")
+    extract.add_argument("--workers", type=int, default=None, help="Paralel çalışan süreç sayısı")
+    extract.set_defaults(func=cmd_extract_documents)
+
+    revoke = subparsers.add_parser("revoke-tokens", help="Kullanıcının mevcut token'larını iptal et (AUTH_MODE=claims)")
+    revoke.add_argument("--user-id", type=int, required=True)
+    revoke.set_defaults(func=cmd_revoke_tokens)
+
+    calibrate = subparsers.add_parser("calibrate-bcrypt", help="Bu makinede hedef süreye uyan bcrypt maliyetini bul")
+    calibrate.add_argument("--target-ms", type=float, default=250, help="Bir hash için hedef süre (ms)")
+    calibrate.add_argument("--max-rounds", type=int, default=16)
+    calibrate.set_defaults(func=cmd_calibrate_bcrypt)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    finally:
+        if database.engine is not None:
+            database.engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,10 @@ source venv/bin/activate
 echo "Installing dependencies..."
 pip install -r requirements.txt
 
+# Apply pending database migrations
+echo "Applying migrations..."
+python manage.py migrate
+
 # Run the application
 echo "Starting the application..."
 uvicorn main:app --reload
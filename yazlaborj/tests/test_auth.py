@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+
+import anyio
+import httpx
+
+from app.utils.passwords import password_hasher
+
+USER = {"tc_kimlik": "12345678901", "name": "Aday", "email": "aday@example.com", "password": "secret1"}
+
+
+def test_login(client):
+    response = client.post("/api/register", json=USER)
+    assert response.status_code == 200, response.text
+    response = client.post("/api/register", json=dict(USER, tc_kimlik="10987654321"))
+    assert response.status_code == 400 and response.json()["detail"] == "Email already registered"
+
+    response = client.post("/api/login", json={"tc_kimlik": USER["tc_kimlik"], "password": USER["password"]})
+    assert response.status_code == 200, response.text
+    assert response.json()["user"]["email"] == USER["email"]
+
+    response = client.post("/api/token", data={"username": USER["email"], "password": USER["password"]})
+    assert response.status_code == 200, response.text
+
+    response = client.post("/api/login", json={"tc_kimlik": USER["tc_kimlik"], "password": "wrong"})
+    assert response.status_code == 401
+    response = client.post("/api/login", json={"tc_kimlik": "10987654321", "password": "secret1"})
+    assert response.status_code == 401
+
+
+def test_unknown_user_logins_hold_no_thread(client, monkeypatch):
+    import main
+
+    monkeypatch.setattr(password_hasher, "verify_seconds", 0.3)
+    logins = 5
+
+    async def run():
+        # A single worker thread: a fake verify sleeping in it would serialize the logins
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 1
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            started = time.perf_counter()
+            responses = await asyncio.gather(*[
+                async_client.post("/api/login", json={"tc_kimlik": f"1000000000{i}", "password": "secret1"})
+                for i in range(logins)
+            ])
+            return time.perf_counter() - started, responses
+
+    elapsed, responses = asyncio.run(run())
+    assert [response.status_code for response in responses] == [401] * logins
+    assert elapsed < 0.3 * logins / 2, elapsed
+
+
+def test_registrations_hold_no_thread_while_hashing(client, monkeypatch):
+    import main
+
+    def slow_submit(fn, *args):
+        # Queue wait plus bcrypt, spent outside the request's thread
+        future = Future()
+        threading.Timer(0.3, lambda: future.set_result(fn(*args))).start()
+        return future
+
+    monkeypatch.setattr(password_hasher, "_submit", slow_submit)
+    registrations = 5
+
+    async def run():
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 1
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            started = time.perf_counter()
+            responses = await asyncio.gather(*[
+                async_client.post("/api/register", json=dict(
+                    USER, tc_kimlik=f"2000000000{i}", email=f"aday{i}@example.com"
+                ))
+                for i in range(registrations)
+            ])
+            return time.perf_counter() - started, responses
+
+    elapsed, responses = asyncio.run(run())
+    assert [response.status_code for response in responses] == [200] * registrations
+    assert elapsed < 0.3 * registrations / 2, elapsed
@@ -0,0 +1,27 @@
+import importlib
+import inspect
+
+import pytest
+from fastapi.params import Depends
+
+from app.schemas.user import CurrentUser
+from app.utils import auth
+
+ROUTERS = ["admin", "applications", "auth", "criteria", "evaluations", "jury", "listings", "users"]
+
+# The guards return CurrentUser (id, role, is_active), never the ORM row,
+# in both AUTH_MODE=db and AUTH_MODE=claims
+GUARDS = {
+    getattr(auth, name) for name in dir(auth)
+    if name.startswith("get_") and name.endswith(("_user", "_user_async"))
+}
+
+
+@pytest.mark.parametrize("package", ["app.routers", "app.routers.aio"])
+@pytest.mark.parametrize("name", ROUTERS)
+def test_current_user_is_annotated_as_current_user(package, name):
+    router = importlib.import_module(f"{package}.{name}").router
+    for route in router.routes:
+        for parameter in inspect.signature(route.endpoint).parameters.values():
+            if isinstance(parameter.default, Depends) and parameter.default.dependency in GUARDS:
+                assert parameter.annotation is CurrentUser, f"{package}.{name}.{route.endpoint.__name__}"
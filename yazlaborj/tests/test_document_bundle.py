@@ -0,0 +1,83 @@
+import csv
+import io
+import os
+import zipfile
+from datetime import datetime, timezone
+
+from app.models.evaluation import Evaluation
+from app.models.listing import Listing
+from app.models.user import User, UserRole
+from app.storage import storage
+from app.utils.document_bundle import MANIFEST_NAME
+
+
+def pdf() -> bytes:
+    return b"%PDF-1.4 " + os.urandom(2000)
+
+
+def open_bundle(response):
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.testzip() is None
+    manifest = archive.read(MANIFEST_NAME).decode("utf-8-sig")
+    return archive, list(csv.DictReader(io.StringIO(manifest)))
+
+
+def test_application_bundle(client, app_db, make_application, upload_documents):
+    cv, diploma = pdf(), pdf()
+    application, headers = make_application()
+    response = upload_documents(application.id, headers, cv=cv, diploma=diploma)
+    assert response.status_code == 200, response.text
+    name = app_db.get(User, application.candidate_id).name
+    folder = f"{application.id}_{name}"
+
+    archive, manifest = open_bundle(client.get(f"/api/applications/{application.id}/bundle", headers=headers))
+
+    assert sorted(archive.namelist()) == sorted([f"{folder}/cv.pdf", f"{folder}/diploma.pdf", MANIFEST_NAME])
+    assert archive.read(f"{folder}/cv.pdf") == cv
+    assert archive.read(f"{folder}/diploma.pdf") == diploma
+    assert len(manifest) == 1
+    assert manifest[0]["application_id"] == str(application.id)
+    assert manifest[0]["candidate_name"] == name
+    assert manifest[0]["folder"] == folder
+    assert manifest[0]["documents"] == "cv.pdf;diploma.pdf"
+    assert manifest[0]["missing"] == ""
+
+    # A document whose file is gone from storage is listed, not archived
+    storage.delete(response.json()["diploma_path"])
+    archive, manifest = open_bundle(client.get(f"/api/applications/{application.id}/bundle", headers=headers))
+    assert sorted(archive.namelist()) == sorted([f"{folder}/cv.pdf", MANIFEST_NAME])
+    assert manifest[0]["documents"] == "cv.pdf"
+    assert manifest[0]["missing"] == "diploma.pdf"
+
+
+def test_listing_bundle(client, app_db, make_user, make_application, upload_documents):
+    first, candidate = make_application()
+    listing = app_db.get(Listing, first.listing_id)
+    created = [(first, candidate), make_application(listing), make_application(listing)]
+    applications = [application for application, _ in created]
+    contents = {application.id: pdf() for application in applications}
+    for application, headers in created:
+        assert upload_documents(application.id, headers, cv=contents[application.id]).status_code == 200
+    jury, jury_headers = make_user(UserRole.JURY)
+    _, manager = make_user(UserRole.MANAGER)
+    app_db.add_all([
+        Evaluation(application_id=application.id, jury_member_id=jury.id, deadline=datetime.now(timezone.utc))
+        for application in applications[:2]
+    ])
+    app_db.commit()
+    url = f"/api/listings/{listing.id}/bundle"
+
+    archive, manifest = open_bundle(client.get(url, headers=manager))
+    assert [int(row["application_id"]) for row in manifest] == [application.id for application in applications]
+    for row in manifest:
+        assert archive.read(f"{row['folder']}/cv.pdf") == contents[int(row["application_id"])]
+
+    # Juries only get the applications they evaluate
+    archive, manifest = open_bundle(client.get(url, headers=jury_headers))
+    assert [int(row["application_id"]) for row in manifest] == [application.id for application in applications[:2]]
+    assert len(archive.namelist()) == 3
+
+    assert client.get(url, headers=candidate).status_code == 403
+    assert client.get(f"/api/listings/{listing.id + 1}/bundle", headers=manager).status_code == 404
@@ -0,0 +1,76 @@
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.models.application import Application
+from app.models.document_blob import DocumentBlob
+from app.models.listing import Listing, PositionType
+from app.models.user import User, UserRole
+from app.storage import storage, TEMP_PREFIX
+from app.utils.file_upload import BLOB_DIR, blob_path
+
+
+def stored_keys():
+    return {stored.key for prefix in (BLOB_DIR, TEMP_PREFIX) for stored in storage.list(prefix)}
+
+
+def ref_counts(db):
+    db.commit()
+    return dict(db.execute(select(DocumentBlob.path, DocumentBlob.ref_count)).all())
+
+
+def test_reupload_of_identical_content_writes_nothing(app_db, make_application, upload_documents):
+    content = b"%PDF-1.4 " + os.urandom(16) * 1000
+    path = blob_path(hashlib.sha256(content).hexdigest())
+    first, first_headers = make_application()
+    second, second_headers = make_application()
+
+    response = upload_documents(first.id, first_headers, cv=content)
+    assert response.status_code == 200, response.text
+    assert response.json()["cv_path"] == path
+    keys = stored_keys()
+    inode = os.stat(storage.path(path)).st_ino
+
+    response = upload_documents(second.id, second_headers, cv=content, diploma=content)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["cv_path"] == response.json()["diploma_path"] == path
+    assert stored_keys() == keys
+    # The blob was reused, not rewritten
+    assert os.stat(storage.path(path)).st_ino == inode
+    assert ref_counts(app_db) == {path: 3}
+
+
+def test_ref_count_follows_applications(db):
+    now = datetime.now(timezone.utc)
+    candidate = User(tc_kimlik="00000000001", name="c", email="c@example.com", password="-", role=UserRole.CANDIDATE)
+    listing = Listing(
+        position=PositionType.DOCENT, department="d", faculty="f", publish_date=now, deadline=now + timedelta(days=5),
+    )
+    shared, other = blob_path("a" * 64), blob_path("b" * 64)
+    db.add_all([
+        candidate, listing,
+        DocumentBlob(sha256="a" * 64, path=shared, size=1),
+        DocumentBlob(sha256="b" * 64, path=other, size=1),
+    ])
+    db.flush()
+
+    # Two columns of one row sharing a blob count twice
+    application = Application(candidate_id=candidate.id, listing_id=listing.id, cv_path=shared, diploma_path=shared)
+    db.add(application)
+    db.commit()
+    assert ref_counts(db) == {shared: 2, other: 0}
+
+    application.diploma_path = other
+    db.commit()
+    assert ref_counts(db) == {shared: 1, other: 1}
+
+    application.cv_path, application.publications_path = other, other
+    db.commit()
+    assert ref_counts(db) == {shared: 0, other: 3}
+
+    db.delete(application)
+    db.commit()
+    assert ref_counts(db) == {shared: 0, other: 0}
@@ -0,0 +1,125 @@
+import os
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from app.models.application import Application
+from app.models.evaluation import Evaluation
+from app.models.user import UserRole
+from app.utils.file_download import parse_range
+
+SIZE = 1000
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=900-", (900, SIZE - 1)),
+    ("bytes=900-5000", (900, SIZE - 1)),
+    ("bytes=-100", (900, SIZE - 1)),
+    ("bytes=-5000", (0, SIZE - 1)),
+    # Sent in full: multiple ranges, malformed or reversed ones
+    ("bytes=0-1,5-6", None),
+    ("bytes=-", None),
+    ("items=0-1", None),
+    ("bytes=5-1", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, SIZE) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0"])
+def test_unsatisfiable_range(header):
+    with pytest.raises(HTTPException) as raised:
+        parse_range(header, SIZE)
+    assert raised.value.status_code == 416
+    assert raised.value.headers["Content-Range"] == f"bytes */{SIZE}"
+
+
+@pytest.fixture
+def document(make_application, upload_documents):
+    """(download URL, content, the owning candidate's headers) of an uploaded cv"""
+    content = b"%PDF-1.4 " + os.urandom(SIZE)
+    application, headers = make_application()
+    response = upload_documents(application.id, headers, cv=content)
+    assert response.status_code == 200, response.text
+    return f"/api/applications/{application.id}/documents/cv", content, headers
+
+
+def test_full_and_partial_downloads(client, document):
+    url, content, headers = document
+
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-type"] == "application/pdf"
+
+    response = client.get(url, headers=dict(headers, Range="bytes=10-19"))
+    assert response.status_code == 206
+    assert response.content == content[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(content)}"
+
+    response = client.get(url, headers=dict(headers, Range="bytes=-5"))
+    assert response.status_code == 206
+    assert response.content == content[-5:]
+
+    response = client.get(url, headers=dict(headers, Range="bytes=0-1,5-6"))
+    assert response.status_code == 200
+    assert response.content == content
+
+    for unsatisfiable in (f"bytes={len(content)}-", "bytes=-0"):
+        response = client.get(url, headers=dict(headers, Range=unsatisfiable))
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(content)}"
+
+
+def test_conditional_downloads(client, document):
+    url, content, headers = document
+    response = client.get(url, headers=headers)
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    assert client.get(url, headers=dict(headers, **{"If-None-Match": etag})).status_code == 304
+    assert client.get(url, headers=dict(headers, **{"If-None-Match": f'W/{etag}, "other"'})).status_code == 304
+    assert client.get(url, headers=dict(headers, **{"If-None-Match": '"other"'})).status_code == 200
+    assert client.get(url, headers=dict(headers, **{"If-Modified-Since": last_modified})).status_code == 304
+    response = client.get(url, headers=dict(headers, **{"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}))
+    assert response.status_code == 200
+
+    # If-Range: the range only applies while the client's copy is current
+    response = client.get(url, headers=dict(headers, Range="bytes=0-9", **{"If-Range": etag}))
+    assert response.status_code == 206
+    response = client.get(url, headers=dict(headers, Range="bytes=0-9", **{"If-Range": '"other"'}))
+    assert response.status_code == 200
+    assert response.content == content
+
+
+def test_document_access(client, app_db, make_user, make_application, document):
+    url, _, owner = document
+    application_id = int(url.split("/")[3])
+    _, other_candidate = make_application()
+    assigned, assigned_headers = make_user(UserRole.JURY)
+    _, unassigned_headers = make_user(UserRole.JURY)
+    _, manager = make_user(UserRole.MANAGER)
+    app_db.add(Evaluation(application_id=application_id, jury_member_id=assigned.id, deadline=datetime.now(timezone.utc)))
+    app_db.commit()
+
+    assert client.get(url, headers=owner).status_code == 200
+    assert client.get(url, headers=other_candidate).status_code == 403
+    assert client.get(url, headers=assigned_headers).status_code == 200
+    assert client.get(url, headers=unassigned_headers).status_code == 403
+    assert client.get(url, headers=manager).status_code == 200
+
+
+def test_unknown_kind_and_paths_outside_the_upload_root(client, app_db, document):
+    url, _, headers = document
+    application_id = int(url.split("/")[3])
+
+    assert client.get(url.replace("/cv", "/photo"), headers=headers).status_code == 404
+    # No document of this kind yet
+    assert client.get(url.replace("/cv", "/diploma"), headers=headers).status_code == 404
+
+    app_db.execute(update(Application).where(Application.id == application_id).values(cv_path="../../../etc/passwd"))
+    app_db.commit()
+    assert client.get(url, headers=headers).status_code == 404
@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import database
+from app.services import document_gc
+from app.services.document_gc import CollectionReport, delete_batch
+from app.storage import storage
+from app.utils.advisory_locks import DOCUMENT_GC_LOCK_KEY, blob_lock, job_lock
+from app.utils.file_upload import DocumentPart
+
+
+@pytest.fixture
+def locks_on(db, monkeypatch):
+    """The advisory locks (and the collector) run against the db fixture's database"""
+    monkeypatch.setattr(database, "engine", db.get_bind())
+    lock_engine = database.create_lock_engine(db.get_bind().url)
+    monkeypatch.setattr(database, "lock_engine", lock_engine)
+    yield db
+    if lock_engine is not None:
+        lock_engine.dispose()
+
+
+def old_blob(name: str, age: int = 3600) -> dict:
+    path = f"blobs/00/00/{name}"
+    storage.put(path, [b"%PDF-1.4 test"])
+    modified = time.time() - age
+    os.utime(storage.path(path), (modified, modified))
+    return {"path": path, "size": 13, "modified": "", "temp": False, "cold": False}
+
+
+def test_job_lock_admits_one_collector(locks_on):
+    with job_lock(DOCUMENT_GC_LOCK_KEY) as first:
+        with job_lock(DOCUMENT_GC_LOCK_KEY) as second:
+            assert first and not second
+            assert document_gc.run_collection() is None
+    with job_lock(DOCUMENT_GC_LOCK_KEY) as again:
+        assert again
+
+
+def test_blob_lock_serializes_the_same_path(locks_on):
+    order = []
+    with blob_lock("blobs/aa/bb/same"):
+        waiter = threading.Thread(target=lambda: blob_lock_and_record("blobs/aa/bb/same", order))
+        waiter.start()
+        time.sleep(0.2)
+        order.append("holder")
+    waiter.join(5)
+    assert order == ["holder", "waiter"]
+
+
+def blob_lock_and_record(path, order):
+    with blob_lock(path):
+        order.append("waiter")
+
+
+async def store_part(data: bytes) -> DocumentPart:
+    part = DocumentPart("cv", "application/pdf")
+    await part.write(data)
+    await part.close()
+    return part
+
+
+def test_blob_locks_dont_wait_on_an_exhausted_pool(locks_on, monkeypatch):
+    # Every upload holds one of the pool's connections while its parts are stored
+    engine = create_engine(locks_on.get_bind().url, pool_size=2, max_overflow=0, pool_timeout=2)
+    monkeypatch.setattr(database, "engine", engine)
+    stored, errors = [], []
+    content = f"%PDF-1.4 {time.time_ns()}"
+    # One upload first, which also imports anyio's backend before the threads race to
+    asyncio.run(store_part(f"{content} first".encode()))
+
+    def upload(number):
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                time.sleep(0.1)
+                stored.append(asyncio.run(store_part(f"{content} {number % 3}".encode())))
+        except Exception as e:
+            errors.append(e)
+
+    uploads = [threading.Thread(target=upload, args=(number,)) for number in range(6)]
+    for thread in uploads:
+        thread.start()
+    for thread in uploads:
+        thread.join(30)
+    engine.dispose()
+
+    assert errors == []
+    assert len(stored) == 6 and all(part.stored for part in stored)
+    assert sum(part.deduplicated for part in stored) == 3
+
+
+def test_collector_keeps_a_blob_touched_by_an_upload(locks_on):
+    cutoff = time.time() - 60
+    touched, orphaned = old_blob("touched"), old_blob("orphaned")
+    # A deduplicating upload reused the blob after the scan listed it
+    storage.touch(touched["path"])
+
+    report = CollectionReport(dry_run=False)
+    delete_batch(locks_on, report, [touched, orphaned], cutoff)
+
+    assert storage.exists(touched["path"])
+    assert not storage.exists(orphaned["path"])
+    assert report.deleted_files == 1
+
+
+def test_job_lock_admits_one_tiering_run(locks_on):
+    from app.services.document_tiering import run_tiering
+    from app.utils.advisory_locks import DOCUMENT_TIERING_LOCK_KEY
+
+    with job_lock(DOCUMENT_TIERING_LOCK_KEY) as acquired:
+        assert acquired
+        assert run_tiering() is None
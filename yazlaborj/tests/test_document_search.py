@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.application import Application
+from app.models.document_text import DocumentText
+from app.models.listing import Listing, PositionType
+from app.models.user import User, UserRole
+from app.routers.applications import document_search_query, document_search_result, split_headline
+from app.schemas.user import CurrentUser
+
+CV_TEXT = 'Published <script>alert("x")</script> work on \x02graph\x03 theory and graph coloring'
+
+
+def add_document(db, text):
+    now = datetime.now(timezone.utc)
+    candidate = User(tc_kimlik="00000000001", name="candidate", email="c@example.com", password="-", role=UserRole.CANDIDATE)
+    listing = Listing(
+        position=PositionType.DOCENT, department="d", faculty="f",
+        publish_date=now, deadline=now + timedelta(days=5),
+    )
+    db.add_all([candidate, listing])
+    db.flush()
+    application = Application(candidate_id=candidate.id, listing_id=listing.id)
+    db.add(application)
+    db.flush()
+    db.add(DocumentText(application_id=application.id, kind="cv", sha256="0" * 64, text=text))
+    db.commit()
+
+
+def test_split_headline():
+    assert split_headline(None) == (None, [])
+    assert split_headline("a \x02<b>\x03 c \x02d\x03") == ("a <b> c d", [(2, 5), (8, 9)])
+
+
+def test_snippet_is_plain_text_with_highlights(db):
+    add_document(db, CV_TEXT)
+    manager = CurrentUser(id=1, role=UserRole.MANAGER, is_active=True)
+    dialect_name = db.get_bind().dialect.name
+
+    rows = db.execute(document_search_query(dialect_name, "graph", None, manager)).all()
+
+    assert len(rows) == 1
+    result = document_search_result(rows[0])
+    if dialect_name != "postgresql":
+        assert result["snippet"] is None and result["highlights"] == []
+        return
+    snippet = result["snippet"]
+    assert "\x02" not in snippet and "\x03" not in snippet
+    assert [snippet[start:end] for start, end in result["highlights"]] == ["graph", "graph"]
+
+
+def test_unknown_kind_is_a_bad_request(client, make_user):
+    _, manager = make_user(UserRole.MANAGER)
+
+    response = client.get("/api/applications/search", headers=manager, params={"q": "graph", "kind": "photo"})
+
+    assert response.status_code == 400, response.text
@@ -0,0 +1,127 @@
+import os
+from contextlib import contextmanager
+
+from sqlalchemy import select, update
+
+from app import database
+from app.models.application import ApplicationStatus
+from app.models.document_blob import DocumentBlob, StorageTier
+from app.models.listing import Listing, ListingStatus
+from app.services import document_tiering
+from app.services.document_tiering import tier_documents
+from app.storage import cold_storage, storage
+from app.storage.tiering import cold_key
+
+
+def pdf() -> bytes:
+    # Content no earlier test stored
+    return b"%PDF-1.4 " + os.urandom(16).hex().encode() + b" text" * 2000
+
+
+def close_listing(db, application):
+    application.status = ApplicationStatus.APPROVED
+    db.get(Listing, application.listing_id).status = ListingStatus.EXPIRED
+    db.commit()
+
+
+def blob_tier(db, path):
+    return db.scalar(select(DocumentBlob.tier).where(DocumentBlob.path == path))
+
+
+def uploaded_cv(make_application, upload_documents, content):
+    application, headers = make_application()
+    response = upload_documents(application.id, headers, cv=content)
+    assert response.status_code == 200, response.text
+    return application, headers, response.json()["cv_path"]
+
+
+def test_recently_touched_hot_copy_is_kept(app_db, make_application, upload_documents):
+    application, _, path = uploaded_cv(make_application, upload_documents, pdf())
+    close_listing(app_db, application)
+
+    report = tier_documents(app_db, pause=0)
+
+    assert report.moved == 1 and not report.errors
+    assert blob_tier(app_db, path) == StorageTier.COLD
+    assert cold_storage.exists(cold_key(path))
+    # Stored within the collector's grace period: a deduplicating upload may still commit
+    assert storage.exists(path)
+
+
+def test_hot_copy_stays_when_an_upload_made_the_blob_hot_again(app_db, make_application, upload_documents, monkeypatch):
+    application, _, path = uploaded_cv(make_application, upload_documents, pdf())
+    close_listing(app_db, application)
+    blob_lock = document_tiering.blob_lock
+
+    @contextmanager
+    def upload_commits_first(locked_path):
+        # A deduplicating upload's ON CONFLICT DO UPDATE lands right after the switch to COLD
+        with database.engine.begin() as connection:
+            connection.execute(
+                update(DocumentBlob).where(DocumentBlob.path == locked_path)
+                .values(tier=StorageTier.HOT, compressed_size=None)
+            )
+        with blob_lock(locked_path):
+            yield
+
+    monkeypatch.setattr(document_tiering, "blob_lock", upload_commits_first)
+    report = tier_documents(app_db, pause=0, grace_minutes=-1)
+
+    assert report.moved == 1
+    assert blob_tier(app_db, path) == StorageTier.HOT
+    assert storage.exists(path)
+
+
+def test_blob_shared_with_an_open_listing_stays_hot(app_db, make_application, upload_documents):
+    content = pdf()
+    closed, _, path = uploaded_cv(make_application, upload_documents, content)
+    still_open, _, shared = uploaded_cv(make_application, upload_documents, content)
+    assert shared == path
+    close_listing(app_db, closed)
+
+    assert tier_documents(app_db, dry_run=True).candidates == []
+    # An undecided application keeps an expired listing open too
+    still_open.status = ApplicationStatus.IN_REVIEW
+    app_db.get(Listing, still_open.listing_id).status = ListingStatus.EXPIRED
+    app_db.commit()
+    assert tier_documents(app_db, dry_run=True).candidates == []
+
+    close_listing(app_db, still_open)
+    assert [candidate["path"] for candidate in tier_documents(app_db, dry_run=True).candidates] == [path]
+
+
+def test_cold_document_download(client, app_db, make_application, upload_documents):
+    content = pdf()
+    application, headers, path = uploaded_cv(make_application, upload_documents, content)
+    close_listing(app_db, application)
+    assert tier_documents(app_db, pause=0, grace_minutes=-1).moved == 1
+    assert not storage.exists(path)
+    url = f"/api/applications/{application.id}/documents/cv"
+
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["content-length"] == str(len(content))
+
+    response = client.get(url, headers=dict(headers, Range="bytes=10000-10009"))
+    assert response.status_code == 206
+    assert response.content == content[10000:10010]
+    assert response.headers["content-range"] == f"bytes 10000-10009/{len(content)}"
+
+    response = client.get(url, headers=dict(headers, **{"If-None-Match": response.headers["etag"]}))
+    assert response.status_code == 304
+
+
+def test_upload_of_cold_content_makes_the_blob_hot(app_db, make_application, upload_documents):
+    content = pdf()
+    application, _, path = uploaded_cv(make_application, upload_documents, content)
+    close_listing(app_db, application)
+    assert tier_documents(app_db, pause=0, grace_minutes=-1).moved == 1
+    assert blob_tier(app_db, path) == StorageTier.COLD
+
+    _, _, uploaded = uploaded_cv(make_application, upload_documents, content)
+
+    assert uploaded == path
+    assert blob_tier(app_db, path) == StorageTier.HOT
+    assert app_db.scalar(select(DocumentBlob.compressed_size).where(DocumentBlob.path == path)) is None
+    assert storage.exists(path)
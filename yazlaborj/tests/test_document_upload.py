@@ -0,0 +1,219 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.storage import storage, TEMP_PREFIX
+from app.storage.local import LocalWriter
+from app.utils.file_upload import DOCUMENT_CATEGORIES, blob_path
+
+PDF = b"%PDF-1.4 test document\n"
+
+
+def test_no_connection_is_held_while_the_body_is_received(app_db, make_application, upload_documents, monkeypatch):
+    from app import database
+    from app.routers import applications
+
+    application, headers = make_application()
+    application_id = application.id
+    app_db.close()
+    checked_out = []
+    receive_documents = applications.receive_documents
+
+    async def receive_and_count(request):
+        checked_out.append(database.engine.pool.checkedout())
+        return await receive_documents(request)
+
+    monkeypatch.setattr(applications, "receive_documents", receive_and_count)
+    response = upload_documents(application_id, headers, cv=PDF)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["cv_path"].startswith("blobs/")
+    assert checked_out == [0]
+
+
+def small_limits(monkeypatch, megabytes=1):
+    from app.config import settings
+    from app.utils import file_upload
+
+    monkeypatch.setattr(settings, "UPLOAD_LIMIT_MB", {name: megabytes for name in file_upload.DOCUMENT_CATEGORIES})
+    # Written in 64 KB batches, spilling to a storage writer under tmp/ after the first
+    monkeypatch.setattr(file_upload, "WRITE_BUFFER_SIZE", 64 * 1024)
+    monkeypatch.setattr(file_upload, "MEMORY_PART_SIZE", 64 * 1024)
+
+
+def temp_objects():
+    return {stored.key for stored in storage.list(TEMP_PREFIX)}
+
+
+def post_streamed(application_id, headers, chunk_size=256 * 1024, **files):
+    """Upload through the ASGI app with the body arriving in chunk_size pieces
+    (TestClient hands the app the whole body at once)"""
+    import main
+
+    boundary = "test-boundary"
+    body = b"".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{name}.pdf"\r\n'
+        f"Content-Type: application/pdf\r\n\r\n".encode() + content + b"\r\n"
+        for name, content in files.items()
+    ) + f"--{boundary}--\r\n".encode()
+
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await async_client.post(
+                f"/api/applications/{application_id}/documents",
+                content=chunks(),
+                headers=dict(headers, **{
+                    "Content-Type": f"multipart/form-data; boundary={boundary}", "Content-Length": str(len(body)),
+                }),
+            )
+
+    return asyncio.run(run())
+
+
+def test_upload_stores_each_category(make_application, upload_documents):
+    application, headers = make_application()
+    files = {name: b"%PDF-1.4 " + name.encode() + os.urandom(8) * 20000 for name in DOCUMENT_CATEGORIES}
+
+    response = upload_documents(application.id, headers, **files)
+
+    assert response.status_code == 200, response.text
+    for name, content in files.items():
+        path = response.json()[f"{name}_path"]
+        assert path == blob_path(hashlib.sha256(content).hexdigest())
+        file, stored = storage.open(path)
+        with file:
+            assert file.read() == content
+        assert stored.size == len(content)
+
+
+def test_part_over_the_limit_is_rejected_at_the_first_byte(make_application, monkeypatch):
+    small_limits(monkeypatch)
+    application, headers = make_application()
+    limit = 1024 * 1024
+    before = temp_objects()
+
+    response = post_streamed(application.id, headers, cv=os.urandom(limit + 1))
+    assert response.status_code == 413, response.text
+    assert "cv exceeds the 1 MB limit" in response.json()["detail"]
+    # The spilled part is removed
+    assert temp_objects() == before
+
+    response = post_streamed(application.id, headers, cv=os.urandom(limit))
+    assert response.status_code == 200, response.text
+    assert temp_objects() == before
+
+
+def test_content_length_over_every_limit_is_rejected_before_the_body(make_application, monkeypatch):
+    import main
+
+    small_limits(monkeypatch)
+    application, headers = make_application()
+    pulled = []
+
+    async def body():
+        pulled.append(True)
+        yield b"--boundary\r\n"
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await async_client.post(
+                f"/api/applications/{application.id}/documents",
+                content=body(),
+                headers=dict(
+                    headers,
+                    **{"Content-Type": "multipart/form-data; boundary=boundary", "Content-Length": str(7 * 1024 * 1024)}
+                ),
+            )
+
+    response = asyncio.run(run())
+    assert response.status_code == 413, response.text
+    assert pulled == []
+
+
+def test_unknown_field_is_a_bad_request(make_application, upload_documents):
+    application, headers = make_application()
+
+    response = upload_documents(application.id, headers, photo=PDF)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid directory"
+
+
+@pytest.fixture
+def slow_writer(monkeypatch):
+    """Slows the local storage writer down and counts its calls still running
+    and the commits that finished"""
+    calls = {"running": 0, "committed": 0}
+    lock = threading.Lock()
+
+    def tracked(method, delay, counter=None):
+        def run(self, *args):
+            with lock:
+                calls["running"] += 1
+            try:
+                time.sleep(delay)
+                return method(self, *args)
+            finally:
+                with lock:
+                    calls["running"] -= 1
+                    if counter:
+                        calls[counter] += 1
+        return run
+
+    monkeypatch.setattr(LocalWriter, "write", tracked(LocalWriter.write, 0.01))
+    monkeypatch.setattr(LocalWriter, "commit", tracked(LocalWriter.commit, 0.2, "committed"))
+    return calls
+
+
+def part_files():
+    return {path for path in Path(storage.root).rglob("*.part")}
+
+
+def test_failed_part_removes_the_spilled_objects_of_every_part(make_application, monkeypatch, slow_writer):
+    small_limits(monkeypatch)
+    application, headers = make_application()
+    before = part_files()
+
+    response = post_streamed(
+        application.id, headers,
+        cv=os.urandom(300 * 1024), diploma=os.urandom(300 * 1024), publications=os.urandom(1024 * 1024 + 1),
+    )
+
+    assert response.status_code == 413, response.text
+    # Nothing of the request is still being written once it has failed
+    assert slow_writer["running"] == 0
+    assert part_files() == before
+
+
+def test_receive_returns_once_every_part_is_stored(make_application, monkeypatch, slow_writer):
+    from app.routers import applications
+
+    small_limits(monkeypatch)
+    application, headers = make_application()
+    set_document_paths = applications.set_document_paths
+    seen = []
+
+    def check_then_set(db, application_id, documents):
+        seen.append(dict(slow_writer))
+        return set_document_paths(db, application_id, documents)
+
+    monkeypatch.setattr(applications, "set_document_paths", check_then_set)
+    files = {name: os.urandom(300 * 1024) for name in ("cv", "diploma", "publications")}
+    response = post_streamed(application.id, headers, **files)
+
+    assert response.status_code == 200, response.text
+    assert seen == [{"running": 0, "committed": 3}]
+    for name, content in files.items():
+        assert storage.exists(response.json()[f"{name}_path"])
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.application import Application
+from app.models.evaluation import Evaluation
+from app.models.listing import Listing, PositionType
+from app.models.user import UserRole
+from app.utils.db_instrumentation import QUERY_COUNT_HEADER
+
+
+def add_evaluations(db, make_user, jury, count):
+    """count evaluations of jury, each of a different candidate's application"""
+    now = datetime.now(timezone.utc)
+    listing = Listing(
+        position=PositionType.DOCENT, department="d", faculty="f",
+        publish_date=now, deadline=now + timedelta(days=5),
+    )
+    db.add(listing)
+    db.commit()
+    for _ in range(count):
+        candidate, _ = make_user(UserRole.CANDIDATE)
+        application = Application(candidate_id=candidate.id, listing_id=listing.id)
+        db.add(application)
+        db.flush()
+        db.add(Evaluation(application_id=application.id, jury_member_id=jury.id, deadline=now))
+    db.commit()
+
+
+def test_evaluation_list_query_count_is_constant(client, app_db, make_user):
+    _, manager = make_user(UserRole.MANAGER)
+    jury, _ = make_user(UserRole.JURY, name="jury")
+
+    counts = {}
+    total = 0
+    for page_size in (1, 5, 25):
+        add_evaluations(app_db, make_user, jury, page_size - total)
+        total = page_size
+        response = client.get("/api/evaluations/", headers=manager, params={"limit": page_size})
+        assert response.status_code == 200, response.text
+        evaluations = response.json()
+        assert len(evaluations) == page_size
+        assert all(e["candidate_name"].startswith("candidate") and e["jury_name"] == "jury" for e in evaluations)
+        counts[page_size] = int(response.headers[QUERY_COUNT_HEADER])
+
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_evaluation_detail_query_count(client, app_db, make_user):
+    _, manager = make_user(UserRole.MANAGER)
+    jury, _ = make_user(UserRole.JURY, name="jury")
+    add_evaluations(app_db, make_user, jury, 3)
+    evaluation_ids = [e.id for e in app_db.query(Evaluation).all()]
+
+    counts = set()
+    for evaluation_id in evaluation_ids:
+        response = client.get(f"/api/evaluations/{evaluation_id}", headers=manager)
+        assert response.status_code == 200, response.text
+        assert response.json()["candidate_name"].startswith("candidate")
+        counts.add(int(response.headers[QUERY_COUNT_HEADER]))
+
+    # The authentication lookup and one SELECT of the evaluation with both users
+    assert counts == {2}
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import Response
+from sqlalchemy import select
+
+from app.models.listing import Listing, PositionType
+from app.utils.pagination import NEXT_CURSOR_HEADER, next_page, paginate
+
+
+def add_listings(db, count, created_at=None):
+    now = datetime.now(timezone.utc)
+    for _ in range(count):
+        db.add(Listing(
+            position=PositionType.DOCENT, department="d", faculty="f",
+            publish_date=now, deadline=now, created_at=created_at,
+        ))
+    db.commit()
+
+
+def page_through(db, limit, use_select):
+    """ids of every listing, following X-Next-Cursor page by page"""
+    ids, cursor = [], None
+    while True:
+        if use_select:
+            query = paginate(select(Listing), Listing.created_at, Listing.id, 0, limit, cursor)
+            rows = db.scalars(query).all()
+        else:
+            query = paginate(db.query(Listing), Listing.created_at, Listing.id, 0, limit, cursor)
+            rows = query.all()
+        response = Response()
+        page = next_page(rows, limit, lambda listing: (listing.created_at, listing.id), response)
+        assert len(page) <= limit
+        ids += [listing.id for listing in page]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("use_select", [False, True], ids=["query", "select"])
+def test_cursor_reaches_every_row(db, use_select):
+    # Inserted within the same second: the cursor has to break ties by id
+    add_listings(db, 7)
+    expected = db.scalars(select(Listing.id).order_by(Listing.id)).all()
+
+    assert page_through(db, 2, use_select) == expected
+    assert page_through(db, 3, use_select) == expected
+
+
+def test_cursor_mixes_default_and_explicit_timestamps(db):
+    # CURRENT_TIMESTAMP and bound datetimes are stored differently on SQLite
+    add_listings(db, 3)
+    created_at = db.scalar(select(Listing.created_at).limit(1))
+    add_listings(db, 3, created_at=created_at)
+    add_listings(db, 2)
+    expected = db.scalars(select(Listing.id).order_by(Listing.created_at, Listing.id)).all()
+
+    ids = page_through(db, 2, False)
+    assert sorted(ids) == sorted(expected)
+    assert len(ids) == len(set(ids)) == 8
@@ -0,0 +1,50 @@
+from app.config import settings
+from app.utils.db_instrumentation import AnalyzeSampler, explain
+
+STATEMENT = "SELECT id FROM listings WHERE department = 'd' ORDER BY id"
+
+
+def test_explain_estimates_by_default(db):
+    connection = db.connection()
+    plan = explain(connection, STATEMENT, ())
+    assert plan
+    assert "actual time" not in plan
+
+    if connection.dialect.name == "postgresql":
+        assert "actual time" in explain(connection, STATEMENT, (), analyze=True)
+
+
+def test_analyze_is_sampled(monkeypatch):
+    sampler = AnalyzeSampler()
+    monkeypatch.setattr(settings, "SLOW_QUERY_ANALYZE_INTERVAL", 0)
+    assert not sampler.allow()
+
+    monkeypatch.setattr(settings, "SLOW_QUERY_ANALYZE_INTERVAL", 60)
+    assert sampler.allow()
+    assert not sampler.allow()
+
+
+def test_failed_statements_leave_no_timing_state(db):
+    from sqlalchemy import text
+    from sqlalchemy.exc import IntegrityError
+
+    from app.utils.db_instrumentation import RequestQueryStats, _request_stats, instrument_engine
+
+    instrument_engine(db.get_bind())
+    stats = RequestQueryStats()
+    token = _request_stats.set(stats)
+    try:
+        connection = db.connection()
+        info_before = dict(connection.info)
+        for _ in range(3):
+            try:
+                with connection.begin_nested():
+                    connection.execute(text("INSERT INTO users (id) VALUES (1)"))
+            except IntegrityError:
+                pass
+        connection.execute(text("SELECT 1"))
+    finally:
+        _request_stats.reset(token)
+
+    assert dict(connection.info) == info_before
+    assert stats.count >= 1
@@ -0,0 +1,189 @@
+import os
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from app.storage import Storage, StorageWriter, TEMP_PREFIX
+from app.storage.local import LocalStorage
+from app.storage.s3 import MIN_PART_SIZE, S3Storage
+
+BUCKET = "documents"
+
+
+def test_incomplete_drivers_fail_at_instantiation():
+    class NoDelete(Storage):
+        exists = stat = touch = put = writer = open = list = lambda self, *args: None
+
+    class NoAbort(StorageWriter):
+        write = commit = lambda self, *args: None
+
+    with pytest.raises(TypeError, match="delete"):
+        NoDelete()
+    with pytest.raises(TypeError, match="abort"):
+        NoAbort()
+
+
+def part_files(root):
+    return list(root.rglob("*.part"))
+
+
+def test_local_put_is_atomic(tmp_path):
+    storage = LocalStorage(tmp_path)
+    storage.put("blobs/a", [b"old"])
+
+    def failing_chunks():
+        yield b"new"
+        raise OSError("connection lost")
+
+    with pytest.raises(OSError):
+        storage.put("blobs/a", failing_chunks())
+
+    with open(storage.path("blobs/a"), "rb") as file:
+        assert file.read() == b"old"
+    assert part_files(tmp_path) == []
+
+
+def test_local_writer_commit_is_atomic(tmp_path):
+    storage = LocalStorage(tmp_path)
+    storage.put("blobs/a", [b"old" * 1000])
+    reader, _ = storage.open("blobs/a")
+
+    writer = storage.writer()
+    writer.write(b"new" * 1000)
+    writer.write(b"tail")
+    # Nothing is visible under the key before the commit
+    with open(storage.path("blobs/a"), "rb") as file:
+        assert file.read() == b"old" * 1000
+    writer.commit("blobs/a")
+
+    with open(storage.path("blobs/a"), "rb") as file:
+        assert file.read() == b"new" * 1000 + b"tail"
+    # The file was replaced, not rewritten: an open reader still sees the old one
+    with reader:
+        assert reader.read() == b"old" * 1000
+    assert part_files(tmp_path) == []
+
+
+def test_local_writer_abort_removes_the_part_file(tmp_path):
+    storage = LocalStorage(tmp_path)
+    writer = storage.writer()
+    writer.write(b"data")
+    assert part_files(tmp_path) == [writer.temp_path]
+
+    writer.abort()
+
+    assert part_files(tmp_path) == []
+    assert list(storage.list(TEMP_PREFIX)) == []
+
+
+@pytest.mark.parametrize("key", ["../outside", "blobs/../../outside", "/etc/passwd", "", "."])
+def test_local_path_stays_under_the_root(tmp_path, key):
+    storage = LocalStorage(tmp_path / "uploads")
+    with pytest.raises(FileNotFoundError):
+        storage.path(key)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    """An S3Storage on a mocked bucket, its keys under "hot/\""""
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN", "AWS_PROFILE"):
+        monkeypatch.delenv(name, raising=False)
+    with mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        storage = S3Storage(
+            BUCKET, prefix="hot", region="us-east-1", access_key_id="test", secret_access_key="test",
+            part_size=0, concurrency=2, presign_seconds=120,
+        )
+        yield storage
+        storage.executor.shutdown()
+
+
+def multipart_uploads(storage):
+    return storage.client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", [])
+
+
+def test_s3_writer_commits_a_multipart_upload(s3):
+    content = os.urandom(1024 * 1024) * 11
+    writer = s3.writer()
+    for offset in range(0, len(content), 1024 * 1024):
+        writer.write(content[offset:offset + 1024 * 1024])
+    # Two full parts sent while writing, the rest on commit
+    assert writer.part_number == len(content) // MIN_PART_SIZE
+
+    writer.commit("blobs/a")
+
+    body, stored = s3.open("blobs/a")
+    assert body.read() == content
+    assert stored.size == len(content)
+    assert s3.client.head_object(Bucket=BUCKET, Key="hot/blobs/a")["ContentLength"] == len(content)
+    assert multipart_uploads(s3) == []
+    assert list(s3.list(TEMP_PREFIX)) == []
+
+
+def test_s3_writer_below_part_size_is_one_put(s3):
+    writer = s3.writer()
+    writer.write(b"small")
+    writer.commit("blobs/a")
+
+    assert writer.upload_id is None and writer.part_number == 0
+    assert s3.open("blobs/a")[0].read() == b"small"
+
+
+def test_s3_writer_abort_leaves_no_upload(s3):
+    writer = s3.writer()
+    writer.write(os.urandom(MIN_PART_SIZE + 1))
+    assert len(multipart_uploads(s3)) == 1
+
+    writer.abort()
+
+    assert multipart_uploads(s3) == []
+    assert list(s3.list(TEMP_PREFIX)) == []
+
+
+def test_s3_objects(s3):
+    s3.put("blobs/a/1", [b"one", b"1"])
+    s3.put("blobs/b/2", [b"two"])
+    s3.put("blobsx/3", [b"three"])
+    # Outside the storage's prefix
+    s3.client.put_object(Bucket=BUCKET, Key="blobs/a/4", Body=b"four")
+
+    assert s3.exists("blobs/a/1")
+    assert not s3.exists("blobs/a/4")
+    assert s3.stat("blobs/a/1").size == 4
+    with pytest.raises(FileNotFoundError):
+        s3.stat("blobs/missing")
+    with pytest.raises(FileNotFoundError):
+        s3.open("blobs/missing")
+    assert sorted(stored.key for stored in s3.list("blobs")) == ["blobs/a/1", "blobs/b/2"]
+    assert [(stored.key, stored.size) for stored in s3.list("blobs/a")] == [("blobs/a/1", 4)]
+
+    modified = s3.stat("blobs/a/1").modified
+    time.sleep(1)
+    s3.touch("blobs/a/1")
+    assert s3.stat("blobs/a/1").modified > modified
+    assert s3.open("blobs/a/1")[0].read() == b"one1"
+
+    s3.delete("blobs/a/1")
+    assert not s3.exists("blobs/a/1")
+    assert sorted(stored.key for stored in s3.list("blobs")) == ["blobs/b/2"]
+
+
+def test_s3_presigned_url(s3):
+    s3.presign_client = S3Storage(
+        BUCKET, public_endpoint_url="https://files.example.com", region="us-east-1",
+        access_key_id="test", secret_access_key="test",
+    ).presign_client
+
+    url = s3.presigned_url("blobs/a", "application/pdf", 'attachment; filename="cv.pdf"')
+
+    parts = urlsplit(url)
+    query = {name: values[0] for name, values in parse_qs(parts.query).items()}
+    assert parts.scheme == "https" and parts.netloc == "files.example.com"
+    assert parts.path == f"/{BUCKET}/hot/blobs/a"
+    assert query["X-Amz-Algorithm"] == "AWS4-HMAC-SHA256"
+    assert query["X-Amz-Expires"] == "120"
+    assert query["response-content-type"] == "application/pdf"
+    assert query["response-content-disposition"] == 'attachment; filename="cv.pdf"'